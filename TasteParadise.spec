@@ -14,6 +14,9 @@ a = Analysis(
         ('mongodb', 'mongodb'),
         ('static', 'static'),
         ('license_system.py', '.'),
+        ('license_repository.py', '.'),
+        ('license_signing.py', '.'),
+        ('license_revocations.py', '.'),
     ],
     hiddenimports=[
         'clr_loader',
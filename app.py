@@ -1,49 +1,313 @@
-# app.py - FastAPI app setup
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.middleware.cors import CORSMiddleware
-from pathlib import Path
+# app.py - FastAPI app factory
+"""
+FastAPI application factory
+
+    app = create_app("desktop")    # or "cloud", see config.APP_PROFILES
+
+Both builds serve the same routers. A profile only switches what differs
+between the till and the cloud deployment: printers, demo middleware, CORS
+origins and the connection pool (the embedded mongod and the desktop window
+are started by main.py). Database-backed services are created per worker
+by the lifespan handler (AppServices).
+"""
+import logging
 import sys
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+
+import config
+from middleware.demo_middleware import DemoModeMiddleware
+from routes import auth, menu, orders, kot, tables, reports
+from routes import analytics_routes, export_routes, health_routes, kitchen_routes, payment_routes, print_routes
+from services.cache_versions import CacheVersions
+from services.demo_overlay import OverlayDatabase, OverlayStore
+from services.kot_router import KotRouter
+from services.leader_lease import LeaderLease
+from services.order_archive import OrderArchiver, TieredOrderStore
+from services.parquet_export import ParquetExporter
+from services.print_spooler import PrintSpooler
+from services.printer_registry import PrinterRegistry
+from services.rate_limiter import rate_limiter
+from services.sales_analytics import RESTAURANT_TZ, SalesAnalytics
+from services.xlsx_export import XlsxReportExporter
+from utils.auth import load_signing_key, require_admin
+from utils.database import connect_database, close_database, stop_mongodb, wrap_database
+from utils.startup_timer import startup_timer
+from utils.static_files import PrecompressedStaticFiles
+
+logger = logging.getLogger(__name__)
+
+if getattr(sys, 'frozen', False):
+    APP_DIR = Path(sys._MEIPASS)
+else:
+    APP_DIR = Path(__file__).parent
+
+STATIC_DIR = APP_DIR / "static"
+FRONTEND_DIR = APP_DIR / "frontend" / "build"
+
+
+class AppServices:
+    """Database-backed services of one worker process"""
+
+    def __init__(self, profile: str):
+        self.profile = profile
+        self.settings = config.APP_PROFILES[profile]
+        # Set once the database is connected and routes are ready
+        self.ready = threading.Event()
+        self.scheduler = AsyncIOScheduler(timezone=RESTAURANT_TZ)
+        self.db = None
+        self.print_spooler = None
+        self.kot_router = None
+        self.sales_analytics = None
+        self.order_archiver = None
+        self.order_store = None
+        self.parquet_exporter = None
+        self.cache_versions = None
+        self.leader_lease = None
+        self.demo_store = None
+
+    async def start(self):
+        """Per-worker startup: every worker connects and serves; only the lease holder runs background jobs"""
+        settings = self.settings
+        # mongod is already accepting connections (main.py waits for it);
+        # pool size and timeouts come from the profile's pool
+        db = self.db = await connect_database(config.MONGODB_URI, settings["db_pool"], **settings["db_options"])
+        if config.RATE_LIMIT_BACKEND == "mongo":
+            rate_limiter.use_database(db)
+            await rate_limiter.ensure_indexes()
+        if settings["demo_sandbox"]:
+            # Demo visitors' writes stay in memory per session; Mongo is only read
+            self.demo_store = OverlayStore(
+                ttl=config.DEMO_SESSION_TTL_MINUTES * 60,
+                max_bytes=config.DEMO_SESSION_MAX_KB * 1024,
+                max_sessions=config.DEMO_MAX_SESSIONS
+            )
+            db = self.db = wrap_database(lambda base: OverlayDatabase(base, self.demo_store))
+        await load_signing_key(db)
+        health_routes.init_health_routes(db.client, settings["demo_mode"], config.APP_NAME, config.APP_VERSION)
+
+        self.sales_analytics = SalesAnalytics(db)
+        payment_routes.init_payment_routes(db, self.sales_analytics)
+        logger.info("Payment routes initialized successfully")
+
+        if settings["printers"]:
+            # Start print spooler (the leader resumes jobs queued before a restart)
+            printer_registry = PrinterRegistry(ttl=config.PRINTER_CACHE_TTL, escpos_mode=config.PRINTER_ESCPOS)
+            self.print_spooler = PrintSpooler(
+                db, max_attempts=config.PRINT_MAX_ATTEMPTS, retry_delay=config.PRINT_RETRY_DELAY,
+                registry=printer_registry, stale_after=config.LEADER_LEASE_TTL
+            )
+            await self.print_spooler.start(resume=False)
+            print_routes.init_print_routes(self.print_spooler, printer_registry, config.DEFAULT_PRINTER)
+            logger.info("Print spooler started")
+
+        self.cache_versions = CacheVersions(db, interval=config.CACHE_VERSION_POLL_SECONDS)
+        # Without a spooler every station ticket goes to the kitchen screens
+        self.kot_router = KotRouter(db, self.print_spooler)
+        self.cache_versions.register("kitchen_stations", self.kot_router.invalidate)
+        kitchen_routes.init_kitchen_routes(db, self.kot_router, self.cache_versions)
+        kot.init_kot_routes(db, self.kot_router)
+
+        await self.sales_analytics.ensure_indexes()
+        analytics_routes.init_analytics_routes(self.sales_analytics)
+
+        self.order_archiver = OrderArchiver(db, after_days=config.ARCHIVE_AFTER_DAYS)
+        await self.order_archiver.ensure_indexes()
+        self.cache_versions.register("archive_watermark", self.order_archiver.invalidate)
+        self.order_store = TieredOrderStore(db, self.order_archiver)
+        self.parquet_exporter = ParquetExporter(self.order_store, config.EXPORT_DIR)
+        export_routes.init_export_routes(self.parquet_exporter, XlsxReportExporter(self.order_store))
+
+        menu.init_menu_routes(db)
+        tables.init_table_routes(db)
+        orders.init_order_routes(db, self.sales_analytics, self.order_store)
+        reports.init_report_routes(db, self.order_store)
+        await reports.ensure_report_indexes()
+
+        self._schedule_jobs()
+        # Jobs stay paused until this worker holds the scheduler lease
+        if not self.scheduler.running:
+            self.scheduler.start(paused=True)
+
+        await self.cache_versions.poll()
+        self.cache_versions.start()
+        self.leader_lease = LeaderLease(
+            db, "scheduler", ttl=config.LEADER_LEASE_TTL, renew_every=config.LEADER_LEASE_TTL / 3,
+            on_acquired=self.on_leadership_acquired, on_lost=self.on_leadership_lost
+        )
+        self.leader_lease.start()
+
+        startup_timer.mark_ready()
+        self.ready.set()
+
+    def _schedule_jobs(self):
+        try:
+            self.scheduler.add_job(
+                self.end_of_day_close,
+                "cron",
+                hour=config.EOD_CLOSE_HOUR,
+                minute=0,
+                second=0,
+                id="end_of_day_close",
+                replace_existing=True
+            )
+            self.scheduler.add_job(
+                self.sales_analytics.refresh_item_reports,
+                "interval",
+                minutes=config.ITEM_PERFORMANCE_REFRESH_MINUTES,
+                id="item_performance",
+                replace_existing=True
+            )
+        except Exception as e:
+            logger.error(f"Scheduler error: {e}")
+
+    async def on_leadership_acquired(self):
+        self.scheduler.resume()
+        logger.info(f"Scheduler started - end-of-day close scheduled for {config.EOD_CLOSE_HOUR:02d}:00 {config.RESTAURANT_TIMEZONE}")
+        if self.print_spooler:
+            await self.print_spooler.resume()
+
+    def on_leadership_lost(self):
+        self.scheduler.pause()
+        logger.info("Scheduler paused - another worker holds the scheduler lease")
+
+    async def stop(self):
+        try:
+            if self.leader_lease:
+                await self.leader_lease.stop()
+            if self.cache_versions:
+                await self.cache_versions.stop()
+            if self.scheduler.running:
+                self.scheduler.shutdown()
+            if self.print_spooler:
+                await self.print_spooler.stop()
+            close_database()
+            if self.settings["embedded_mongod"]:
+                stop_mongodb()
+        except Exception as e:
+            logger.error(f"Error during shutdown: {e}")
+
+    async def end_of_day_close(self):
+        """Freeze the previous business day's report, then archive settled history"""
+        try:
+            today = datetime.now(RESTAURANT_TZ).date()
+            business_day = (today - timedelta(days=1)).isoformat()
+            logger.info(f"Running end-of-day close for {business_day}...")
+            report = await reports.build_daily_report(business_day, freeze=True)
+            logger.info(f"Report for {business_day} frozen. Revenue: ₹{report['revenue']}, Orders: {report['orders']}")
+            if config.EXPORT_PARQUET_ON_CLOSE:
+                closed = today - timedelta(days=1)
+                try:
+                    await self.parquet_exporter.export(closed, closed)
+                except Exception as e:
+                    logger.error(f"Parquet export for {business_day} failed: {str(e)}")
+            await self.order_archiver.archive(today)
+            await self.cache_versions.bump("archive_watermark")
+        except Exception as e:
+            logger.error(f"Error in end-of-day close: {str(e)}")
+
+
+def create_app(profile: str = config.APP_PROFILE) -> FastAPI:
+    """Create and configure the FastAPI application for a profile"""
+    settings = config.APP_PROFILES[profile]
+    services = AppServices(profile)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await services.start()
+        try:
+            yield
+        finally:
+            await services.stop()
 
-# Import route modules
-from routes import auth, orders, menu, reports, tables, kot
-
-def create_app():
-    """Create and configure FastAPI application"""
-    
-    # Determine app directory
-    if getattr(sys, 'frozen', False):
-        APP_DIR = Path(sys._MEIPASS)
-    else:
-        APP_DIR = Path(__file__).parent
-    
-    STATIC_DIR = APP_DIR / "static"
-    
-    # Create FastAPI app
     app = FastAPI(
         title="Taste Paradise API",
         description="Restaurant Management System",
-        version="1.0.0"
+        version=config.APP_VERSION,
+        lifespan=lifespan
     )
-    
-    # CORS middleware
+    app.state.profile = profile
+    app.state.services = services
+
+    # Every API route except auth, health and the soundbox webhook takes a
+    # bearer token (required only with AUTH_REQUIRED)
+    protected = [Depends(require_admin)]
+
+    # Payment routes first: /payments/history etc. must win over /payments/{date}
+    app.include_router(payment_routes.router, dependencies=protected)
+    app.include_router(payment_routes.webhook_router)
+    if settings["printers"]:
+        app.include_router(print_routes.router, dependencies=protected)
+    app.include_router(print_routes.invoice_router, dependencies=protected)
+    app.include_router(kitchen_routes.router, dependencies=protected)
+    app.include_router(analytics_routes.router, dependencies=protected)
+    app.include_router(export_routes.router, dependencies=protected)
+    app.include_router(auth.router)
+    app.include_router(menu.router, dependencies=protected)
+    app.include_router(orders.router, dependencies=protected)
+    app.include_router(kot.router, dependencies=protected)
+    app.include_router(tables.router, dependencies=protected)
+    app.include_router(reports.router, dependencies=protected)
+    app.include_router(health_routes.status_router)
+    app.include_router(orders.maintenance_router, dependencies=protected)
+
+    # Compress JSON lists (orders, reports) for tablets on the restaurant Wi-Fi.
+    # Precompressed static assets already carry Content-Encoding and are passed through.
+    app.add_middleware(GZipMiddleware, minimum_size=config.GZIP_MIN_SIZE, compresslevel=config.GZIP_LEVEL)
+    if settings["demo_mode"]:
+        app.add_middleware(DemoModeMiddleware, demo_mode=True, sandbox=settings["demo_sandbox"])
+        if settings["demo_sandbox"]:
+            logger.info("🎭 DEMO MODE ENABLED - Changes are kept per visitor session, never saved")
+        else:
+            logger.info("🎭 DEMO MODE ENABLED - Read-only mode active")
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
+        allow_origins=settings["cors_origins"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    
-    # Mount static files
-    app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-    
-    # Include routers
-    app.include_router(auth.router)
-    app.include_router(menu.router)
-    app.include_router(orders.router)
-    app.include_router(kot.router)
-    app.include_router(tables.router)
-    app.include_router(reports.router)
-    
+
+    _mount_frontend(app)
     return app
+
+
+def _mount_frontend(app: FastAPI):
+    """React build and auth pages; API-only deployments get the status routes at "/" instead"""
+    if not (FRONTEND_DIR / "index.html").exists():
+        app.include_router(health_routes.router, tags=["Health"])
+        if STATIC_DIR.exists():
+            app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+        return
+
+    # ==================== STATIC FILES (BEFORE CATCH-ALL!) ====================
+    # Mount React build's static files FIRST (most specific)
+    for asset in ("js", "css"):
+        asset_dir = FRONTEND_DIR / "static" / asset
+        if asset_dir.exists():
+            app.mount(f"/static/{asset}", PrecompressedStaticFiles(directory=str(asset_dir)), name=f"react_{asset}")
+
+    # Mount auth static files
+    app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+
+    # ==================== CATCH-ALL FOR REACT ROUTER (AFTER STATIC!) ====================
+    @app.get("/{full_path:path}", include_in_schema=False)
+    async def serve_react_app(full_path: str):
+        """Serve React app for all non-API, non-static routes"""
+        # Serve index.html for all other routes (React Router handles them)
+        index_file = FRONTEND_DIR / "index.html"
+        if index_file.exists():
+            return FileResponse(str(index_file))
+        raise HTTPException(status_code=404, detail="React build not found")
+
+    # Mount React HTML at root (ABSOLUTELY LAST!)
+    app.mount("/", PrecompressedStaticFiles(directory=str(FRONTEND_DIR), html=True), name="frontend")
@@ -0,0 +1,91 @@
+"""
+Load benchmark for the license validation server
+
+    python benchmark_validation_server.py                      # in-process (no network)
+    python benchmark_validation_server.py --url http://127.0.0.1:5000 -c 64 -n 20000
+
+Sends /api/validate requests for the active licenses in licenses.db (each
+key with the machine it is activated on) and prints throughput and
+latency percentiles.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from license_repository import LicenseRepository
+
+
+def load_requests():
+    repository = LicenseRepository()
+    try:
+        licenses = [lic for lic in repository.list(activated=True) if not lic.get('revoked')]
+    finally:
+        repository.close()
+    return [{'license_key': lic['key'], 'machine_id': lic['machine_id']} for lic in licenses]
+
+
+async def run(client, bodies, total, concurrency):
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            response = await client.post('/api/validate', json=bodies[i % len(bodies)])
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, errors
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark /api/validate')
+    parser.add_argument('--url', help='Running server (default: the app in-process)')
+    parser.add_argument('-n', '--requests', type=int, default=5000)
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    bodies = load_requests()
+    if not bodies:
+        print("ERROR: No activated licenses in licenses.db to validate!")
+        return
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30)
+        lifespan = None
+    else:
+        from validation_server import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench')
+        lifespan = app.router.lifespan_context(app)
+
+    async with client:
+        if lifespan:
+            await lifespan.__aenter__()
+        try:
+            await run(client, bodies, min(200, args.requests), args.concurrency)  # warm-up
+            elapsed, latencies, errors = await run(client, bodies, args.requests, args.concurrency)
+        finally:
+            if lifespan:
+                await lifespan.__aexit__(None, None, None)
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(f"\n{'='*60}")
+    print(f"Requests: {len(latencies)} ({errors} errors), concurrency {args.concurrency}")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"Latency ms: mean {statistics.mean(latencies) * 1000:.2f} | "
+          f"p50 {pct(0.50):.2f} | p95 {pct(0.95):.2f} | p99 {pct(0.99):.2f}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -10,19 +10,153 @@ load_dotenv()
 
 # Demo Mode Configuration
 DEMO_MODE = os.getenv("DEMO_MODE", "false").lower() == "true"
+# Sandbox: demo visitors' writes are kept in memory per session (on top of the
+# read-only database) instead of being faked; see services/demo_overlay.py
+DEMO_SANDBOX = os.getenv("DEMO_SANDBOX", "true").lower() == "true"
+DEMO_SESSION_TTL_MINUTES = int(os.getenv("DEMO_SESSION_TTL_MINUTES", 60))
+DEMO_SESSION_MAX_KB = int(os.getenv("DEMO_SESSION_MAX_KB", 2048))
+DEMO_MAX_SESSIONS = int(os.getenv("DEMO_MAX_SESSIONS", 500))
 
 # MongoDB Configuration
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 
+# Embedded mongod (desktop build)
+# MONGOD_PATH overrides the bundled mongodb/bin binary (default: bundled, then PATH)
+MONGOD_PATH = os.getenv("MONGOD_PATH", "")
+MONGOD_PORT = int(os.getenv("MONGOD_PORT", 27017))
+MONGOD_CACHE_GB = float(os.getenv("MONGOD_CACHE_GB", 0.25))
+# Journaling keeps data safe across crashes/power cuts; --nojournal only works on mongod < 6.1
+MONGOD_JOURNAL = os.getenv("MONGOD_JOURNAL", "true").lower() == "true"
+MONGOD_MAX_RESTARTS = int(os.getenv("MONGOD_MAX_RESTARTS", 5))
+
+# Connection Pool Configuration
+# "desktop": one till talking to the local mongod, "cloud": Railway/Atlas with many clients
+DB_PROFILE = os.getenv("DB_PROFILE", "cloud" if os.getenv("RAILWAY_ENVIRONMENT") else "desktop")
+DB_POOL_PROFILES = {
+    "desktop": {
+        "maxPoolSize": 10,
+        "minPoolSize": 2,
+        "maxIdleTimeMS": 300000,
+        "waitQueueTimeoutMS": 5000,
+        "serverSelectionTimeoutMS": 30000,
+        "connectTimeoutMS": 5000,
+        "socketTimeoutMS": 30000,
+        "directConnection": True,
+    },
+    "cloud": {
+        "maxPoolSize": 50,
+        "minPoolSize": 5,
+        "maxIdleTimeMS": 60000,
+        "waitQueueTimeoutMS": 10000,
+        "serverSelectionTimeoutMS": 15000,
+        "connectTimeoutMS": 10000,
+        "socketTimeoutMS": 30000,
+    },
+}
+# Individual overrides on top of the profile, e.g. DB_MAX_POOL_SIZE=20
+DB_POOL_OVERRIDES = {
+    option: int(os.getenv(env))
+    for option, env in (
+        ("maxPoolSize", "DB_MAX_POOL_SIZE"),
+        ("minPoolSize", "DB_MIN_POOL_SIZE"),
+        ("maxIdleTimeMS", "DB_MAX_IDLE_TIME_MS"),
+        ("waitQueueTimeoutMS", "DB_WAIT_QUEUE_TIMEOUT_MS"),
+        ("serverSelectionTimeoutMS", "DB_SERVER_SELECTION_TIMEOUT_MS"),
+    )
+    if os.getenv(env)
+}
+# Write concern / read preference per workload
+DB_KOT_WRITE_CONCERN = os.getenv("DB_KOT_WRITE_CONCERN", "1")
+DB_PAYMENT_WRITE_CONCERN = os.getenv("DB_PAYMENT_WRITE_CONCERN", "majority")
+DB_REPORT_READ_PREFERENCE = os.getenv("DB_REPORT_READ_PREFERENCE", "secondaryPreferred")
+
 # Port Configuration
 PORT = int(os.getenv("PORT", 8002))
 
+# Worker processes (cloud); scheduled jobs run in whichever worker holds the scheduler lease.
+# The demo sandbox keeps visitors' sessions in process memory, so it always runs one worker.
+WORKERS = 1 if DEMO_MODE and DEMO_SANDBOX else int(os.getenv("WEB_CONCURRENCY", 1))
+LEADER_LEASE_TTL = int(os.getenv("LEADER_LEASE_TTL", 30))
+CACHE_VERSION_POLL_SECONDS = int(os.getenv("CACHE_VERSION_POLL_SECONDS", 5))
+
 # CORS Configuration
 ALLOWED_ORIGINS = os.getenv(
     "ALLOWED_ORIGINS",
     "http://localhost:3000,https://tasteparadise-4lvntdxbt-amritgaur2020s-projects.vercel.app"
 ).split(",")
 
+# Compression Configuration
+# Responses smaller than this (in bytes) are sent uncompressed
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+
+# Restaurant Details (printed on invoices and receipts)
+RESTAURANT_NAME = os.getenv("RESTAURANT_NAME", "Taste Paradise")
+RESTAURANT_TAGLINE = os.getenv("RESTAURANT_TAGLINE", "Restaurant & Billing Service")
+RESTAURANT_ADDRESS = os.getenv("RESTAURANT_ADDRESS", "123 Food Street, Flavor City, FC 12345")
+RESTAURANT_PHONE = os.getenv("RESTAURANT_PHONE", "+91 98765 43210")
+RESTAURANT_EMAIL = os.getenv("RESTAURANT_EMAIL", "info@tasteparadise.com")
+RESTAURANT_GSTIN = os.getenv("RESTAURANT_GSTIN", "27AAAAA0000A1Z5")
+RESTAURANT_FSSAI = os.getenv("RESTAURANT_FSSAI", "12345678901234")
+INVOICE_FOOTER = os.getenv("INVOICE_FOOTER", "Thank you for dining with us!")
+
+# Number of rendered invoices kept in memory
+INVOICE_CACHE_SIZE = int(os.getenv("INVOICE_CACHE_SIZE", 256))
+
+# Printing Configuration
+# "" = Windows default printer, "tcp://host:9100" = network ESC/POS printer,
+# "file:///path/to/dir" = write jobs to files (testing without a printer)
+DEFAULT_PRINTER = os.getenv("DEFAULT_PRINTER", "")
+PRINT_MAX_ATTEMPTS = int(os.getenv("PRINT_MAX_ATTEMPTS", 3))
+PRINT_RETRY_DELAY = float(os.getenv("PRINT_RETRY_DELAY", 2))
+# ESC/POS receipts: "auto" (detect from driver name), "on" or "off" (plain text)
+PRINTER_ESCPOS = os.getenv("PRINTER_ESCPOS", "auto").lower()
+PRINTER_CACHE_TTL = float(os.getenv("PRINTER_CACHE_TTL", 30))
+CASH_DRAWER_KICK = os.getenv("CASH_DRAWER_KICK", "true").lower() == "true"
+# Merchant UPI ID for the pay-by-QR code on unpaid receipts (blank = no QR)
+UPI_VPA = os.getenv("UPI_VPA", "")
+
+# Analytics Configuration
+# Sales buckets, reports and the end-of-day close use the restaurant's local day
+RESTAURANT_TIMEZONE = os.getenv("RESTAURANT_TIMEZONE", "Asia/Kolkata")
+# Minutes between scheduled refreshes of the cached item-performance reports
+ITEM_PERFORMANCE_REFRESH_MINUTES = int(os.getenv("ITEM_PERFORMANCE_REFRESH_MINUTES", 15))
+# End-of-day close: local hour it runs (after late-night service) and the
+# age in days after which settled orders/KOTs move to the archive collections
+EOD_CLOSE_HOUR = int(os.getenv("EOD_CLOSE_HOUR", 4))
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 90))
+
+# Export Configuration
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+# Append the closed business day to the Parquet datasets during end-of-day close
+EXPORT_PARQUET_ON_CLOSE = os.getenv("EXPORT_PARQUET_ON_CLOSE", "false").lower() == "true"
+
+# Authentication
+# Tokens are signed with JWT_SECRET; when unset a secret is generated once and
+# kept in the database so every worker (and restart) shares it.
+# AUTH_REQUIRED=false keeps the API open to clients that don't send tokens yet.
+JWT_SECRET = os.getenv("JWT_SECRET", "")
+JWT_ALGORITHM = "HS256"
+ACCESS_TOKEN_MINUTES = int(os.getenv("ACCESS_TOKEN_MINUTES", 15))
+REFRESH_TOKEN_DAYS = int(os.getenv("REFRESH_TOKEN_DAYS", 7))
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "false").lower() == "true"
+
+# Rate Limiting (token buckets): "<burst>/<seconds>" = up to <burst> requests at
+# once, refilled at <burst> per <seconds>. RATE_LIMIT_BACKEND=mongo shares the
+# buckets between workers/instances; "memory" keeps them per process.
+RATE_LIMITS = {
+    "login_ip": os.getenv("RATE_LIMIT_LOGIN_IP", "10/60"),
+    "login_admin": os.getenv("RATE_LIMIT_LOGIN_ADMIN", "5/60"),
+    "signup": os.getenv("RATE_LIMIT_SIGNUP", "5/3600"),
+    "soundbox_webhook": os.getenv("RATE_LIMIT_SOUNDBOX_WEBHOOK", "120/60"),
+}
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+# Behind Railway's proxy the client address comes from X-Forwarded-For. Clients can
+# send that header themselves, so only the entries appended by our own proxies count:
+# the client is the TRUSTED_PROXY_HOPS-th entry from the right.
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "true" if os.getenv("RAILWAY_ENVIRONMENT") else "false").lower() == "true"
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", 1))
+
 # App Configuration
 APP_NAME = "Taste Paradise API"
 APP_VERSION = "1.0.0"
@@ -31,6 +165,35 @@ CONTACT_EMAIL = "amritgaur2020@gmail.com"
 # Railway Detection
 IS_RAILWAY = os.getenv("RAILWAY_ENVIRONMENT") is not None
 
+# App Profiles (app.create_app)
+# "desktop": the till with its bundled mongod, window and printers;
+# "cloud": Railway/Atlas, API + frontend only
+APP_PROFILE = os.getenv("APP_PROFILE", "cloud" if IS_RAILWAY else "desktop")
+MONGODB_TLS = os.getenv("MONGODB_TLS", "true").lower() == "true"
+MONGODB_TLS_ALLOW_INVALID = os.getenv("MONGODB_TLS_ALLOW_INVALID", "true").lower() == "true"
+APP_PROFILES = {
+    "desktop": {
+        "embedded_mongod": True,   # start/stop mongodb/bin/mongod with the app
+        "webview": True,           # desktop window (falls back to the browser)
+        "printers": True,          # print spooler, thermal receipts, KOT printing
+        "demo_mode": False,
+        "demo_sandbox": False,
+        "cors_origins": ["*"],
+        "db_pool": "desktop",
+        "db_options": {},
+    },
+    "cloud": {
+        "embedded_mongod": False,
+        "webview": False,
+        "printers": False,         # KOTs are shown on kitchen screens only
+        "demo_mode": DEMO_MODE,
+        "demo_sandbox": DEMO_MODE and DEMO_SANDBOX,
+        "cors_origins": ALLOWED_ORIGINS,
+        "db_pool": "cloud",
+        "db_options": {"tls": True, "tlsAllowInvalidCertificates": MONGODB_TLS_ALLOW_INVALID} if MONGODB_TLS else {},
+    },
+}
+
 # Print config on startup (only in development)
 if not IS_RAILWAY:
     print(f"🔧 Demo Mode: {DEMO_MODE}")
@@ -2,11 +2,23 @@
 Create custom distribution packages for customers
 Each package contains ONLY that customer's license key
 """
-import json
 import shutil
 from pathlib import Path
 from datetime import datetime
 
+from license_repository import LicenseRepository
+from license_revocations import RevocationList
+
+repository = None
+
+
+def get_repository():
+    """Master license store (imports licenses_db.json on first use)"""
+    global repository
+    if repository is None:
+        repository = LicenseRepository()
+    return repository
+
 def create_customer_package(customer_name, license_key):
     """
     Create a distribution package with ONLY that customer's license
@@ -15,20 +27,8 @@ def create_customer_package(customer_name, license_key):
     print(f"Creating package for: {customer_name}")
     print(f"{'='*70}")
     
-    # Load master database
-    try:
-        with open('licenses_db.json', 'r') as f:
-            all_licenses = json.load(f)
-    except FileNotFoundError:
-        print("ERROR: licenses_db.json not found!")
-        return False
-    
-    # Find this customer's license
-    customer_license = None
-    for lic in all_licenses:
-        if lic['key'] == license_key:
-            customer_license = lic
-            break
+    # Find this customer's license in the master database
+    customer_license = get_repository().get(license_key)
     
     if not customer_license:
         print(f"ERROR: License key {license_key} not found in database!")
@@ -65,11 +65,10 @@ def create_customer_package(customer_name, license_key):
     
     # Create custom licenses_db.json with ONLY this customer's key
     print(f"Creating custom license database...")
-    custom_db = [customer_license]
-    
     db_file = dest / "licenses_db.json"
-    with open(db_file, 'w', encoding='utf-8') as f:
-        json.dump(custom_db, f, indent=2)
+    get_repository().export_json(db_file, keys=[license_key])
+    # Current revocations; the app keeps the list up to date from the server
+    RevocationList.from_repository(get_repository(), dest / "revocations.json").save()
     
     # Create SETUP.bat
     print(f"Creating SETUP.bat...")
@@ -324,13 +323,7 @@ def main():
     print("="*70)
     
     # Load licenses
-    try:
-        with open('licenses_db.json', 'r') as f:
-            licenses = json.load(f)
-    except FileNotFoundError:
-        print("\nERROR: licenses_db.json not found!")
-        print("   Run: python license_generator.py to create licenses first")
-        return
+    licenses = get_repository().list()
     
     if not licenses:
         print("\nERROR: No licenses found in database!")
@@ -11,7 +11,9 @@ import hashlib
 import json
 import secrets
 from datetime import datetime, timedelta
-from pathlib import Path
+
+from license_repository import LicenseRepository
+from license_signing import issue_license_token
 
 SECRET_KEY = "TasteParadise_Secret_2025_UTU_Project"  # Must match license_system.py!
 
@@ -20,14 +22,7 @@ class LicenseGenerator:
     
     def __init__(self):
         self.secret_key = SECRET_KEY
-        self.db_file = Path("licenses_db.json")
-        self._init_database()
-    
-    def _init_database(self):
-        """Create database file if it doesn't exist"""
-        if not self.db_file.exists():
-            with open(self.db_file, 'w') as f:
-                json.dump([], f)
+        self.repository = LicenseRepository()
     
     def generate_license(self, customer_name, email, phone="", plan="basic", duration_days=365):
         """
@@ -85,14 +80,6 @@ class LicenseGenerator:
     
     def _save_to_database(self, key, data):
         """Save license to database"""
-        # Load existing licenses
-        try:
-            with open(self.db_file, 'r') as f:
-                licenses = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            licenses = []
-        
-        # Add new license
         record = {
             'key': key,
             **data,
@@ -101,11 +88,9 @@ class LicenseGenerator:
             'activation_date': None,
             'generated_date': datetime.now().isoformat()
         }
-        licenses.append(record)
-        
-        # Save back
-        with open(self.db_file, 'w') as f:
-            json.dump(licenses, f, indent=2)
+        # Signed terms the app verifies offline on every start
+        record['token'] = issue_license_token(record)
+        self.repository.add(record)
     
     def list_licenses(self, filter_plan=None, filter_activated=None):
         """
@@ -115,48 +100,16 @@ class LicenseGenerator:
             filter_plan: Filter by plan ("basic", "pro", "enterprise")
             filter_activated: Filter by activation status (True/False)
         """
-        try:
-            with open(self.db_file, 'r') as f:
-                licenses = json.load(f)
-            
-            # Apply filters
-            if filter_plan:
-                licenses = [l for l in licenses if l.get('plan') == filter_plan]
-            
-            if filter_activated is not None:
-                licenses = [l for l in licenses if l.get('activated') == filter_activated]
-            
-            return licenses
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return self.repository.list(plan=filter_plan, activated=filter_activated)
     
     def get_license_details(self, license_key):
         """Get details of a specific license"""
-        licenses = self.list_licenses()
-        for lic in licenses:
-            if lic['key'] == license_key:
-                return lic
-        return None
+        return self.repository.get(license_key)
     
     def revoke_license(self, license_key):
         """Revoke/disable a license"""
         try:
-            with open(self.db_file, 'r') as f:
-                licenses = json.load(f)
-            
-            found = False
-            for lic in licenses:
-                if lic['key'] == license_key:
-                    lic['revoked'] = True
-                    lic['revoked_date'] = datetime.now().isoformat()
-                    found = True
-                    break
-            
-            if found:
-                with open(self.db_file, 'w') as f:
-                    json.dump(licenses, f, indent=2)
-                return True
-            return False
+            return self.repository.revoke(license_key)
         except Exception as e:
             print(f"Error revoking license: {e}")
             return False
@@ -303,15 +256,15 @@ def main():
         
         elif choice == "5":
             # Statistics
-            licenses = generator.list_licenses()
-            total = len(licenses)
-            activated = len([l for l in licenses if l.get('activated')])
+            stats = generator.repository.stats()
+            total = stats['total']
+            activated = stats['activated']
             not_activated = total - activated
-            revoked = len([l for l in licenses if l.get('revoked')])
+            revoked = stats['revoked']
             
-            basic = len([l for l in licenses if l.get('plan') == 'basic'])
-            pro = len([l for l in licenses if l.get('plan') == 'pro'])
-            enterprise = len([l for l in licenses if l.get('plan') == 'enterprise'])
+            basic = stats['plans'].get('basic', 0)
+            pro = stats['plans'].get('pro', 0)
+            enterprise = stats['plans'].get('enterprise', 0)
             
             print("\n" + "="*70)
             print("LICENSE STATISTICS")
@@ -0,0 +1,260 @@
+"""
+TasteParadise License Repository
+Indexed license store shared by the generator, the app, the validation
+server and the distribution builder
+
+Licenses live in a SQLite file (licenses.db) with the key as primary key and
+indexes on email, plan and status, so a lookup is a single index probe
+instead of a scan of licenses_db.json. Every change runs in its own
+transaction (BEGIN IMMEDIATE takes SQLite's file lock), so two activations
+at the same time can't overwrite each other or leave a half-written file.
+
+On first use an existing licenses_db.json is imported; the JSON file is
+left in place and can still be exported (customer packages ship one).
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+LICENSE_STORE = Path("licenses.db")
+LEGACY_JSON_DB = Path("licenses_db.json")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS licenses (
+    key TEXT PRIMARY KEY,
+    customer TEXT,
+    email TEXT,
+    plan TEXT,
+    expiry_date TEXT,
+    activated INTEGER NOT NULL DEFAULT 0,
+    machine_id TEXT,
+    revoked INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_licenses_email ON licenses(email);
+CREATE INDEX IF NOT EXISTS idx_licenses_plan ON licenses(plan, activated);
+CREATE INDEX IF NOT EXISTS idx_licenses_revoked ON licenses(revoked, updated_at);
+CREATE INDEX IF NOT EXISTS idx_licenses_updated ON licenses(updated_at);
+CREATE TABLE IF NOT EXISTS activations (
+    key TEXT NOT NULL,
+    machine_id TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    validations INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (key, machine_id)
+);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file next to ``path`` and swap it in"""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent or ".", prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class LicenseRepository:
+    """Licenses by key, with the activation/revocation updates done atomically"""
+
+    def __init__(self, path=LICENSE_STORE, legacy_json=LEGACY_JSON_DB):
+        self.path = Path(path)
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate_json()
+
+    # ==================== STORAGE ====================
+    @contextmanager
+    def _transaction(self):
+        """Exclusive write transaction (also locks out other processes)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _put(conn, record):
+        # An upsert, not INSERT OR REPLACE: updating in place keeps the rowid, i.e. creation order
+        conn.execute(
+            """INSERT INTO licenses
+               (key, customer, email, plan, expiry_date, activated, machine_id, revoked, updated_at, data)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (key) DO UPDATE SET
+                   customer = excluded.customer, email = excluded.email, plan = excluded.plan,
+                   expiry_date = excluded.expiry_date, activated = excluded.activated,
+                   machine_id = excluded.machine_id, revoked = excluded.revoked,
+                   updated_at = excluded.updated_at, data = excluded.data""",
+            (
+                record['key'], record.get('customer'), record.get('email'), record.get('plan'),
+                record.get('expiry_date'), int(bool(record.get('activated'))), record.get('machine_id'),
+                int(bool(record.get('revoked'))), datetime.now().isoformat(timespec='microseconds'), json.dumps(record),
+            ),
+        )
+
+    @staticmethod
+    def _get(conn, key):
+        row = conn.execute("SELECT data FROM licenses WHERE key = ?", (key,)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def _migrate_json(self):
+        """Import licenses_db.json once (records already in the store win)"""
+        if self.legacy_json is None or not self.legacy_json.exists():
+            return
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE name = 'json_migrated'").fetchone():
+                return
+            try:
+                with open(self.legacy_json, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️  Could not import {self.legacy_json}: {e}")
+                records = []
+            imported = 0
+            for record in records:
+                if record.get('key') and self._get(conn, record['key']) is None:
+                    self._put(conn, record)
+                    imported += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('json_migrated', ?)",
+                (datetime.now().isoformat(),),
+            )
+        if imported:
+            print(f"📦 Imported {imported} licenses from {self.legacy_json} into {self.path}")
+
+    # ==================== QUERIES ====================
+    def get(self, key):
+        """License record for a key, or None"""
+        with self._lock:
+            return self._get(self._conn, key)
+
+    def list(self, plan=None, activated=None, email=None):
+        """All licenses (in creation order), optionally filtered"""
+        query, params = "SELECT data FROM licenses WHERE 1=1", []
+        if plan:
+            query += " AND plan = ?"
+            params.append(plan)
+        if activated is not None:
+            query += " AND activated = ?"
+            params.append(int(bool(activated)))
+        if email:
+            query += " AND email = ?"
+            params.append(email)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY rowid", params).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def changed_since(self, since):
+        """Licenses updated after ``since`` (ISO timestamp), for refreshing in-memory copies"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, updated_at FROM licenses WHERE updated_at > ? ORDER BY updated_at", (since,)
+            ).fetchall()
+        return [(json.loads(row['data']), row['updated_at']) for row in rows]
+
+    def revoked_since(self, since):
+        """(key, updated_at) of revoked licenses changed after ``since``, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, updated_at FROM licenses WHERE revoked = 1 AND updated_at > ? ORDER BY updated_at",
+                (since,),
+            ).fetchall()
+        return [(row['key'], row['updated_at']) for row in rows]
+
+    def stats(self):
+        """Counts for the generator's statistics screen"""
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT COUNT(*) AS total, COALESCE(SUM(activated), 0) AS activated,
+                          COALESCE(SUM(revoked), 0) AS revoked FROM licenses"""
+            ).fetchone()
+            plans = dict(self._conn.execute("SELECT plan, COUNT(*) FROM licenses GROUP BY plan").fetchall())
+        return {'total': row['total'], 'activated': row['activated'], 'revoked': row['revoked'], 'plans': plans}
+
+    # ==================== UPDATES ====================
+    def add(self, record):
+        """Store a new license"""
+        with self._transaction() as conn:
+            if self._get(conn, record['key']) is not None:
+                raise ValueError(f"License {record['key']} already exists")
+            self._put(conn, record)
+
+    def activate(self, key, machine_id):
+        """
+        Bind a license to a machine (idempotent for the same machine)
+        Returns {'valid': True} or {'valid': False, 'reason': ...}
+        """
+        with self._transaction() as conn:
+            record = self._get(conn, key)
+            if record is None:
+                return {'valid': False, 'reason': 'License not found'}
+            if record.get('activated') and record.get('machine_id') != machine_id:
+                return {
+                    'valid': False,
+                    'reason': f"License already activated on another computer (Machine ID: {record.get('machine_id')})"
+                }
+            record['activated'] = True
+            record['machine_id'] = machine_id
+            if not record.get('activation_date'):
+                record['activation_date'] = datetime.now().isoformat()
+            self._put(conn, record)
+            return {'valid': True, 'license': record}
+
+    def revoke(self, key):
+        """Revoke a license; False if the key doesn't exist"""
+        with self._transaction() as conn:
+            record = self._get(conn, key)
+            if record is None:
+                return False
+            record['revoked'] = True
+            record['revoked_date'] = datetime.now().isoformat()
+            self._put(conn, record)
+            return True
+
+    def record_validations(self, entries):
+        """
+        Save a batch of validation sightings in one transaction
+        entries: iterable of (key, machine_id, first_seen, last_seen, count)
+        """
+        with self._transaction() as conn:
+            conn.executemany(
+                """INSERT INTO activations (key, machine_id, first_seen, last_seen, validations)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT (key, machine_id) DO UPDATE SET
+                       last_seen = excluded.last_seen,
+                       validations = validations + excluded.validations""",
+                list(entries),
+            )
+
+    def export_json(self, path, keys=None):
+        """Write licenses (all, or just ``keys``) as a licenses_db.json-style file"""
+        records = self.list() if keys is None else [r for r in map(self.get, keys) if r]
+        write_json_atomic(path, records)
+        return records
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,111 @@
+"""
+TasteParadise Revocation List
+Compact local list of revoked licenses, synced incrementally
+
+revocations.json holds a sorted list of key fingerprints (first 16 hex
+digits of SHA-256 of the key - the keys themselves are never shipped) and
+is signed so entries can't be quietly removed. A lookup is a binary search.
+
+sync() asks the validation server only for revocations newer than the last
+one it has seen (GET /api/revocations?since=...) and merges them; the app
+runs it in the background, so startup only ever reads this one small file.
+
+The list ships in the customer package next to the license file. A missing,
+unreadable or tampered list leaves ``loaded`` False and the license check
+fails - deleting the file must not be a way around a revocation.
+"""
+
+import bisect
+import hashlib
+import json
+from pathlib import Path
+
+from license_repository import write_json_atomic
+from license_signing import sign_response, verify_response
+
+REVOCATION_FILE = Path("revocations.json")
+
+
+def key_fingerprint(license_key):
+    return hashlib.sha256(license_key.strip().upper().encode('utf-8')).hexdigest()[:16]
+
+
+class RevocationList:
+    """Sorted revoked-key fingerprints with the sync position"""
+
+    def __init__(self, path=REVOCATION_FILE):
+        self.path = Path(path)
+        self.fingerprints = []
+        self.synced_until = ""
+        self.loaded = False
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            print(f"⚠️  Revocation list not found at {self.path.absolute()}")
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = verify_response(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Could not read revocation list: {e}")
+            return
+        if data is None:
+            print("⚠️  Revocation list signature invalid - ignoring it")
+            return
+        self.fingerprints = sorted(data.get('revoked', []))
+        self.synced_until = data.get('synced_until', "")
+        self.loaded = True
+
+    def save(self):
+        write_json_atomic(self.path, sign_response({
+            'synced_until': self.synced_until,
+            'revoked': self.fingerprints,
+        }))
+
+    def is_revoked(self, license_key):
+        fingerprint = key_fingerprint(license_key)
+        i = bisect.bisect_left(self.fingerprints, fingerprint)
+        return i < len(self.fingerprints) and self.fingerprints[i] == fingerprint
+
+    def merge(self, fingerprints, synced_until):
+        """Add fingerprints (already sorted entries stay sorted); True if anything changed"""
+        changed = False
+        for fingerprint in fingerprints:
+            i = bisect.bisect_left(self.fingerprints, fingerprint)
+            if i == len(self.fingerprints) or self.fingerprints[i] != fingerprint:
+                self.fingerprints.insert(i, fingerprint)
+                changed = True
+        if synced_until and synced_until > self.synced_until:
+            self.synced_until = synced_until
+            changed = True
+        return changed
+
+    def sync(self, server_url, timeout=5):
+        """Fetch revocations newer than ``synced_until`` from the validation server"""
+        import requests
+
+        response = requests.get(
+            f"{server_url.rstrip('/')}/api/revocations",
+            params={'since': self.synced_until},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        delta = verify_response(response.json())
+        if delta is None:
+            raise ValueError("Revocation update signature invalid")
+        if self.merge(delta.get('added', []), delta.get('synced_until', "")):
+            self.save()
+        return len(delta.get('added', []))
+
+    @classmethod
+    def from_repository(cls, repository, path=REVOCATION_FILE):
+        """Full list from the license store (customer packages)"""
+        revocations = cls.__new__(cls)
+        revocations.path = Path(path)
+        revocations.fingerprints = []
+        revocations.synced_until = ""
+        revocations.loaded = True
+        rows = repository.revoked_since("")
+        revocations.merge([key_fingerprint(key) for key, _ in rows], rows[-1][1] if rows else "")
+        return revocations
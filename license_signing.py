@@ -0,0 +1,94 @@
+"""
+TasteParadise License Signing
+HMAC-SHA256 signatures for validation server responses, the revocation
+list and license tokens
+
+The server signs each successful validation with an expiry; the app can
+keep the last signed response and trust it offline until it expires.
+Signatures use the same shared secret as the license keys
+(LICENSE_SIGNING_KEY overrides it on the server and in the app).
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+from datetime import datetime, timezone
+
+SIGNING_KEY = os.getenv("LICENSE_SIGNING_KEY", "TasteParadise_Secret_2025_UTU_Project")
+
+
+def canonical(payload):
+    """Stable byte form of a payload (sorted keys, no whitespace)"""
+    return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def sign_payload(payload, key=SIGNING_KEY):
+    return hmac.new(key.encode('utf-8'), canonical(payload), hashlib.sha256).hexdigest()
+
+
+def sign_response(payload, key=SIGNING_KEY):
+    """Payload plus its signature"""
+    return {**payload, 'signature': sign_payload(payload, key)}
+
+
+def verify_response(response, key=SIGNING_KEY, now=None):
+    """
+    Payload of a signed response if the signature matches and it hasn't expired
+    Returns None otherwise
+    """
+    if not isinstance(response, dict) or not isinstance(response.get('signature'), str):
+        return None
+    payload = {k: v for k, v in response.items() if k != 'signature'}
+    if not hmac.compare_digest(response['signature'], sign_payload(payload, key)):
+        return None
+    expires_at = payload.get('expires_at')
+    if expires_at:
+        try:
+            if datetime.fromisoformat(expires_at) < (now or datetime.now(timezone.utc)):
+                return None
+        except (TypeError, ValueError):
+            return None
+    return payload
+
+
+# ==================== LICENSE TOKENS ====================
+# A license token carries the license terms and their signature, so the app
+# can check a license from its own license file - no database lookup:
+#     TP1.<base64url payload>.<base64url HMAC-SHA256>
+TOKEN_PREFIX = "TP1"
+TOKEN_FIELDS = ('key', 'customer', 'email', 'plan', 'issued_date', 'expiry_date')
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def issue_license_token(record, key=SIGNING_KEY):
+    """Signed token for a license record (generator, or activation of an older key)"""
+    payload = canonical({field: record.get(field) for field in TOKEN_FIELDS})
+    signature = hmac.new(key.encode('utf-8'), payload, hashlib.sha256).digest()
+    return f"{TOKEN_PREFIX}.{_b64encode(payload)}.{_b64encode(signature)}"
+
+
+def verify_license_token(token, key=SIGNING_KEY):
+    """
+    License terms from a token if its signature is genuine (constant-time compare)
+    Returns None for a malformed or forged token; expiry is left to the caller
+    """
+    try:
+        prefix, payload, signature = token.split('.')
+        if prefix != TOKEN_PREFIX:
+            return None
+        payload = _b64decode(payload)
+        expected = hmac.new(key.encode('utf-8'), payload, hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            return None
+        return json.loads(payload)
+    except (AttributeError, ValueError, TypeError):
+        return None
@@ -8,11 +8,17 @@ import json
 import os
 import platform
 import subprocess
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import sys
 
+from license_repository import LICENSE_STORE, LicenseRepository
+from license_revocations import RevocationList
+from license_signing import issue_license_token, verify_license_token
+
 try:
     import requests
     REQUESTS_AVAILABLE = True
@@ -22,8 +28,10 @@ except ImportError:
 
 # Configuration
 LICENSE_FILE = Path("taste_paradise.license")
-LICENSE_DB = Path("licenses_db.json")  # Database of valid licenses
+LICENSE_DB = Path("licenses_db.json")  # Database of valid licenses (imported into LICENSE_STORE)
 SECRET_KEY = "TasteParadise_Secret_2025_UTU_Project"  # Must match generator!
+# Validation server the revocation list is synced from (sync disabled when unset)
+LICENSE_SERVER_URL = os.getenv("TASTEPARADISE_LICENSE_SERVER", "")
 
 class LicenseSystem:
     """Handle all license operations"""
@@ -32,47 +40,108 @@ class LicenseSystem:
         self.license_file = LICENSE_FILE
         self.license_db = LICENSE_DB
         self.secret_key = SECRET_KEY
+        self._machine_id = None
+        self._repository = None
+        self._revocations = None
+        # Set when the background fingerprint check finds another computer
+        self.wrong_machine = threading.Event()
+    
+    def _cpu_id(self):
+        """Processor ID from wmic (Windows only) - can take several seconds"""
+        if platform.system() != "Windows":
+            return ""
+        try:
+            return subprocess.check_output(
+                "wmic cpu get ProcessorId", 
+                shell=True,
+                stderr=subprocess.DEVNULL,
+                timeout=15
+            ).decode().split('\n')[1].strip()
+        except:
+            return ""
+    
+    def _quick_identifiers(self):
+        """MAC address, computer name and platform - instant to read"""
+        # 1. MAC Address (most reliable)
+        mac = ':'.join(['{:02x}'.format((uuid.getnode() >> i) & 0xff) 
+                      for i in range(0, 48, 8)])
+        # 2. Computer name, 3. Platform info
+        return [mac, platform.node(), platform.platform()]
+    
+    def machine_hint(self):
+        """
+        Cheap fingerprint stored next to the machine ID in the license file.
+        While it matches, the saved machine ID is trusted without running wmic.
+        """
+        combined = '|'.join(filter(None, self._quick_identifiers()))
+        return hashlib.sha256(combined.encode()).hexdigest()[:16].upper()
     
     def get_machine_id(self):
         """
         Generate unique hardware fingerprint
         This will be different on every computer
+        (computed once per process; the slow CPU query runs in parallel)
         """
-        identifiers = []
+        if self._machine_id is not None:
+            return self._machine_id
         
         try:
-            # 1. MAC Address (most reliable)
-            mac = ':'.join(['{:02x}'.format((uuid.getnode() >> i) & 0xff) 
-                          for i in range(0, 48, 8)])
-            identifiers.append(mac)
-            
-            # 2. Computer name
-            identifiers.append(platform.node())
-            
-            # 3. Platform info
-            identifiers.append(platform.platform())
-            
-            # 4. CPU info (Windows only)
-            if platform.system() == "Windows":
-                try:
-                    cpu_info = subprocess.check_output(
-                        "wmic cpu get ProcessorId", 
-                        shell=True,
-                        stderr=subprocess.DEVNULL
-                    ).decode().split('\n')[1].strip()
-                    identifiers.append(cpu_info)
-                except:
-                    pass
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                # 4. CPU info (Windows only)
+                cpu_info = pool.submit(self._cpu_id)
+                identifiers = self._quick_identifiers()
+                identifiers.append(cpu_info.result())
             
             # 5. Combine and hash
             combined = '|'.join(filter(None, identifiers))
             machine_hash = hashlib.sha256(combined.encode()).hexdigest()
-            return machine_hash[:16].upper()
+            self._machine_id = machine_hash[:16].upper()
             
         except Exception as e:
             print(f"⚠️  Error generating machine ID: {e}")
             # Fallback to UUID
-            return str(uuid.getnode())[:16].upper()
+            self._machine_id = str(uuid.getnode())[:16].upper()
+        return self._machine_id
+    
+    def current_machine_id(self, license_data):
+        """
+        Machine ID to check a saved license against.
+        Uses the ID cached in the license file while the quick hint still
+        matches this computer (the full fingerprint, CPU included, is then
+        confirmed in the background); otherwise computes the full fingerprint
+        and, if it matches, records the hint for the next start.
+        """
+        hint = self.machine_hint()
+        if license_data.get('machine_hint') == hint:
+            self.confirm_machine_id(license_data)
+            return license_data['machine_id']
+        
+        machine_id = self.get_machine_id()
+        if machine_id == license_data.get('machine_id'):
+            license_data['machine_hint'] = hint
+            self._save_license(license_data)
+        return machine_id
+    
+    def confirm_machine_id(self, license_data):
+        """
+        Recompute the full fingerprint in the background
+        The hint leaves out the CPU ID, so a copied license on a machine with
+        the same MAC and name would pass it. On a mismatch the hint is dropped
+        from the license file (the next start runs the full check) and
+        wrong_machine is set so the running app can stop serving.
+        """
+        def confirm():
+            machine_id = self.get_machine_id()
+            if machine_id == license_data.get('machine_id'):
+                return
+            print("\n❌ LICENSE ERROR: Wrong Computer! This license is registered to another computer.")
+            license_data.pop('machine_hint', None)
+            self._save_license(license_data)
+            self.wrong_machine.set()
+        
+        thread = threading.Thread(target=confirm, name="machine-id-check", daemon=True)
+        thread.start()
+        return thread
     
     def validate_key_format(self, key):
         """Check if license key has correct format"""
@@ -93,17 +162,21 @@ class LicenseSystem:
         
         return True
     
+    def get_repository(self):
+        """Indexed license store (created from licenses_db.json on first use)"""
+        if self._repository is None:
+            if not LICENSE_STORE.exists() and not self.license_db.exists():
+                print(f"❌ License database not found!")
+                print(f"   Expected at: {self.license_db.absolute()}")
+                return None
+            self._repository = LicenseRepository(LICENSE_STORE, self.license_db)
+        return self._repository
+    
     def load_license_database(self):
         """Load the database of valid licenses generated by you"""
         try:
-            if not self.license_db.exists():
-                print(f"❌ License database not found!")
-                print(f"   Expected at: {self.license_db.absolute()}")
-                return []
-            
-            with open(self.license_db, 'r') as f:
-                licenses = json.load(f)
-                return licenses
+            repository = self.get_repository()
+            return repository.list() if repository else []
         except Exception as e:
             print(f"⚠️  Error loading license database: {e}")
             return []
@@ -113,78 +186,115 @@ class LicenseSystem:
         Validate that the license key exists in your database
         This is the KEY security check!
         """
-        licenses = self.load_license_database()
+        try:
+            repository = self.get_repository()
+            lic = repository.get(license_key) if repository else None
+        except Exception as e:
+            print(f"⚠️  Error loading license database: {e}")
+            lic = None
+        
+        if lic is None:
+            # License key not found in database
+            return {
+                'valid': False,
+                'reason': 'License key not found in database'
+            }
+        
+        # Found the license - check if it's valid
+        
+        # Check if revoked
+        if lic.get('revoked'):
+            return {
+                'valid': False,
+                'reason': f"License revoked on {lic.get('revoked_date', 'N/A')[:10]}"
+            }
         
-        for lic in licenses:
-            if lic['key'] == license_key:
-                # Found the license - check if it's valid
-                
-                # Check if revoked
-                if lic.get('revoked'):
-                    return {
-                        'valid': False,
-                        'reason': f"License revoked on {lic.get('revoked_date', 'N/A')[:10]}"
-                    }
-                
-                # Check expiry
-                try:
-                    expiry = datetime.fromisoformat(lic['expiry_date'])
-                    if datetime.now() > expiry:
-                        return {
-                            'valid': False,
-                            'reason': f"License expired on {expiry.date()}"
-                        }
-                except:
-                    pass
-                
-                # License is valid!
+        # Check expiry
+        try:
+            expiry = datetime.fromisoformat(lic['expiry_date'])
+            if datetime.now() > expiry:
                 return {
-                    'valid': True,
-                    'customer': lic.get('customer', 'Licensed User'),
-                    'email': lic.get('email', ''),
-                    'plan': lic.get('plan', 'standard'),
-                    'expiry_date': lic.get('expiry_date'),
-                    'license_data': lic
+                    'valid': False,
+                    'reason': f"License expired on {expiry.date()}"
                 }
+        except:
+            pass
         
-        # License key not found in database
+        # License is valid!
         return {
-            'valid': False,
-            'reason': 'License key not found in database'
+            'valid': True,
+            'customer': lic.get('customer', 'Licensed User'),
+            'email': lic.get('email', ''),
+            'plan': lic.get('plan', 'standard'),
+            'expiry_date': lic.get('expiry_date'),
+            'license_data': lic
         }
     
     def update_license_activation(self, license_key, machine_id):
         """Update the license database to mark as activated"""
         try:
-            licenses = self.load_license_database()
-            
-            for lic in licenses:
-                if lic['key'] == license_key:
-                    # Check if already activated on different machine
-                    if lic.get('activated') and lic.get('machine_id') != machine_id:
-                        return {
-                            'valid': False,
-                            'reason': f"License already activated on another computer (Machine ID: {lic.get('machine_id')})"
-                        }
-                    
-                    # Activate or verify
-                    lic['activated'] = True
-                    lic['machine_id'] = machine_id
-                    if not lic.get('activation_date'):
-                        lic['activation_date'] = datetime.now().isoformat()
-                    
-                    # Save updated database
-                    with open(self.license_db, 'w') as f:
-                        json.dump(licenses, f, indent=2)
-                    
-                    return {'valid': True}
-            
-            return {'valid': False, 'reason': 'License not found'}
+            repository = self.get_repository()
+            if repository is None:
+                return {'valid': False, 'reason': 'License not found'}
+            result = repository.activate(license_key, machine_id)
+            result.pop('license', None)
+            return result
         
         except Exception as e:
             print(f"⚠️  Error updating activation: {e}")
             return {'valid': True}  # Don't block on DB error
     
+    def license_token(self, record):
+        """The record's signed token, or a fresh one for keys issued before tokens"""
+        token = record.get('token')
+        if token and verify_license_token(token) is not None:
+            return token
+        return issue_license_token(record)
+    
+    def get_revocations(self):
+        """Local revocation list (loaded once)"""
+        if self._revocations is None:
+            self._revocations = RevocationList()
+        return self._revocations
+    
+    def sync_revocations(self):
+        """Pull new revocations from the license server in the background"""
+        if not (REQUESTS_AVAILABLE and LICENSE_SERVER_URL):
+            return None
+        
+        def sync():
+            try:
+                self.get_revocations().sync(LICENSE_SERVER_URL)
+            except Exception as e:
+                print(f"⚠️  Revocation list sync failed: {e}")
+        
+        thread = threading.Thread(target=sync, name="revocation-sync", daemon=True)
+        thread.start()
+        return thread
+    
+    def verify_token(self, license_data):
+        """
+        Offline check of the signed license token - no database read
+        Returns the same shape as validate_against_database
+        """
+        terms = verify_license_token(license_data['token'])
+        if terms is None or terms.get('key') != license_data['key']:
+            return {'valid': False, 'reason': 'License token is invalid or has been tampered with'}
+        
+        revocations = self.get_revocations()
+        if not revocations.loaded:
+            return {'valid': False, 'reason': 'Revocation list is missing or invalid - please reinstall TasteParadise'}
+        if revocations.is_revoked(terms['key']):
+            return {'valid': False, 'reason': 'License has been revoked'}
+        
+        return {
+            'valid': True,
+            'customer': terms.get('customer') or 'Licensed User',
+            'email': terms.get('email') or '',
+            'plan': terms.get('plan') or 'standard',
+            'expiry_date': terms.get('expiry_date'),
+        }
+    
     def activate_license(self):
         """
         First-time activation
@@ -237,11 +347,13 @@ class LicenseSystem:
             license_data = {
                 'key': license_key,
                 'machine_id': machine_id,
+                'machine_hint': self.machine_hint(),
                 'activated_date': datetime.now().isoformat(),
                 'customer': validation.get('customer', 'Licensed User'),
                 'email': validation.get('email', ''),
                 'plan': validation.get('plan', 'standard'),
                 'expiry_date': validation.get('expiry_date'),
+                'token': self.license_token(validation['license_data']),
             }
             
             # Encrypt and save
@@ -277,7 +389,7 @@ class LicenseSystem:
             license_data = self._load_license()
             
             # 1. Verify machine ID (prevent copying)
-            current_machine_id = self.get_machine_id()
+            current_machine_id = self.current_machine_id(license_data)
             if license_data['machine_id'] != current_machine_id:
                 print("\n" + "="*70)
                 print("❌ LICENSE ERROR: Wrong Computer!")
@@ -289,8 +401,15 @@ class LicenseSystem:
                 print("="*70)
                 return False
             
-            # 2. Validate against database (prevent fake/revoked licenses)
-            validation = self.validate_against_database(license_data['key'])
+            # 2. Verify the signed token and the revocation list (prevent fake/revoked licenses)
+            if license_data.get('token'):
+                validation = self.verify_token(license_data)
+            else:
+                # Activated before tokens existed - check the database once
+                validation = self.validate_against_database(license_data['key'])
+                if validation['valid']:
+                    license_data['token'] = self.license_token(validation['license_data'])
+                    self._save_license(license_data)
             
             if not validation['valid']:
                 print("\n" + "="*70)
@@ -302,8 +421,8 @@ class LicenseSystem:
                 print("="*70)
                 return False
             
-            # 3. Check expiry date
-            expiry = datetime.fromisoformat(license_data['expiry_date'])
+            # 3. Check expiry date (from the signed terms)
+            expiry = datetime.fromisoformat(validation['expiry_date'])
             if datetime.now() > expiry:
                 print("\n" + "="*70)
                 print("❌ LICENSE EXPIRED!")
@@ -320,6 +439,7 @@ class LicenseSystem:
             print(f"\n✅ License valid - {days_remaining} days remaining")
             print(f"   Licensed to: {license_data['customer']}")
             
+            self.sync_revocations()
             return True
         
         except Exception as e:
@@ -1,4 +1,5 @@
 """Middleware package"""
 from .demo_middleware import DemoModeMiddleware
+from .license_gate import LicenseGateMiddleware
 
-__all__ = ["DemoModeMiddleware"]
+__all__ = ["DemoModeMiddleware", "LicenseGateMiddleware"]
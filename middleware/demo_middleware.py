@@ -1,63 +1,104 @@
 """
 Demo Mode Middleware
 Intercepts write operations in demo mode and returns fake success responses
+
+A plain ASGI middleware: create_app() only installs it when the profile has
+demo mode on, so production requests never pass through it. With
+``sandbox=True`` writes are not faked but handed to the app with the
+visitor's demo session in ``demo_session``, so a per-session store can apply
+them in memory instead of MongoDB.
 """
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi.responses import JSONResponse
-from datetime import datetime, timezone
+import json
 import logging
+import re
+import secrets
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Writes always let through: docs, health checks and signing in/out
+ALLOWED_PATHS = re.compile(
+    r"^(?:/|/(?:docs|redoc|openapi\.json|health|ping|api/health|api/auth/(?:login|logout))(?:/.*)?)$"
+)
+WRITE_METHODS = frozenset({"POST", "PUT", "DELETE", "PATCH"})
+
+SESSION_COOKIE = "demo_session"
+SESSION_COOKIE_RE = re.compile(rb"(?:^|;\s*)" + SESSION_COOKIE.encode() + rb"=([A-Za-z0-9_-]{16,64})")
+SESSION_MAX_AGE = 24 * 60 * 60
 
-class DemoModeMiddleware(BaseHTTPMiddleware):
+# Demo session of the request being handled (None outside a sandboxed demo request)
+demo_session: ContextVar[Optional[str]] = ContextVar("demo_session", default=None)
+
+
+class DemoModeMiddleware:
     """
     Middleware to handle demo mode.
-    Allows GET requests but blocks POST/PUT/DELETE/PATCH operations.
+    Allows GET requests but blocks POST/PUT/DELETE/PATCH operations,
+    or sandboxes them per visitor when ``sandbox`` is set.
     """
-    
-    def __init__(self, app, demo_mode: bool = False):
-        super().__init__(app)
+
+    def __init__(self, app, demo_mode: bool = True, sandbox: bool = False):
+        self.app = app
         self.demo_mode = demo_mode
+        self.sandbox = sandbox
         if self.demo_mode:
-            logger.info("🎭 Demo Mode Middleware activated")
-    
-    async def dispatch(self, request, call_next):
-        # If not in demo mode, allow everything
-        if not self.demo_mode:
-            return await call_next(request)
-        
-        # Allow GET requests (read-only operations)
-        if request.method == "GET":
-            return await call_next(request)
-        
-        # Allow essential endpoints
-        allowed_paths = [
-            "/docs",
-            "/openapi.json",
-            "/health",
-            "/",
-            "/redoc"
-        ]
-        
-        if any(request.url.path.startswith(path) for path in allowed_paths):
-            return await call_next(request)
-        
-        # Block write operations in demo mode
-        if request.method in ["POST", "PUT", "DELETE", "PATCH"]:
-            logger.info(f"🎭 Demo mode: Blocked {request.method} request to {request.url.path}")
-            
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "success": True,
-                    "message": "🎭 Demo Mode: Changes not saved. Full version available for purchase!",
-                    "demo": True,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "contact": "amritgaur2020@gmail.com",
-                    "note": "This is a read-only demo. Your changes appear to work but are not persisted."
-                }
-            )
-        
-        # For any other method, proceed normally
-        return await call_next(request)
+            logger.info(f"🎭 Demo Mode Middleware activated ({'sandboxed writes' if sandbox else 'read-only'})")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.demo_mode:
+            return await self.app(scope, receive, send)
+
+        if self.sandbox:
+            return await self._sandboxed(scope, receive, send)
+
+        method = scope["method"]
+        if method in WRITE_METHODS and not ALLOWED_PATHS.match(scope["path"]):
+            logger.info(f"🎭 Demo mode: Blocked {method} request to {scope['path']}")
+            return await self._fake_success(send)
+        return await self.app(scope, receive, send)
+
+    async def _sandboxed(self, scope, receive, send):
+        session = _session_from_cookie(scope)
+        new_session = session is None
+        if new_session:
+            session = secrets.token_urlsafe(16)
+
+        async def send_with_cookie(message):
+            if new_session and message["type"] == "http.response.start":
+                cookie = f"{SESSION_COOKIE}={session}; Path=/; Max-Age={SESSION_MAX_AGE}; HttpOnly; SameSite=Lax"
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        token = demo_session.set(session)
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            demo_session.reset(token)
+
+    @staticmethod
+    async def _fake_success(send):
+        body = json.dumps({
+            "success": True,
+            "message": "🎭 Demo Mode: Changes not saved. Full version available for purchase!",
+            "demo": True,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "contact": "amritgaur2020@gmail.com",
+            "note": "This is a read-only demo. Your changes appear to work but are not persisted."
+        }, ensure_ascii=False).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _session_from_cookie(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            match = SESSION_COOKIE_RE.search(value)
+            if match:
+                return match.group(1).decode()
+    return None
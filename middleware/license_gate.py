@@ -0,0 +1,55 @@
+"""
+License Gate Middleware
+Holds back requests until the desktop license check has passed
+
+main.py verifies an activated license in the background while mongod and
+the server start. Until ``licensed`` is set every request gets a 503, so an
+invalid or revoked license never serves the API (the server listens on the
+LAN, not just on localhost). Lifespan events pass through, so the database
+still connects in parallel with the check. If ``revoked`` is set later (the
+background fingerprint check found another computer) every request gets a
+403 from then on.
+"""
+import json
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+RETRY_AFTER_SECONDS = 2
+
+
+class LicenseGateMiddleware:
+    """Answer 503 until ``licensed`` is set, then pass everything through until ``revoked`` is set"""
+
+    def __init__(self, app, licensed: threading.Event, revoked: Optional[threading.Event] = None):
+        self.app = app
+        self.licensed = licensed
+        self.revoked = revoked
+
+    async def __call__(self, scope, receive, send):
+        revoked = self.revoked is not None and self.revoked.is_set()
+        if scope["type"] == "lifespan" or (self.licensed.is_set() and not revoked):
+            return await self.app(scope, receive, send)
+
+        if scope["type"] == "websocket":
+            return await send({"type": "websocket.close", "code": 1008 if revoked else 1013})
+
+        if revoked:
+            status, detail = 403, "This license is registered to another computer"
+            headers = []
+        else:
+            status, detail = 503, "Checking license - please wait"
+            headers = [(b"retry-after", str(RETRY_AFTER_SECONDS).encode())]
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
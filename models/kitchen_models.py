@@ -0,0 +1,29 @@
+# models/kitchen_models.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime, timezone
+import uuid
+
+class KitchenStationModel(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    categories: List[str] = []  # menu categories routed to this station
+    printer: str = ""  # printer address; blank = kitchen screen only
+    is_default: bool = False  # receives items whose category matches no station
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class KitchenStationCreate(BaseModel):
+    name: str
+    categories: List[str] = []
+    printer: str = ""
+    is_default: bool = False
+
+class KitchenStationUpdate(BaseModel):
+    name: Optional[str] = None
+    categories: Optional[List[str]] = None
+    printer: Optional[str] = None
+    is_default: Optional[bool] = None
+
+class StationStatusUpdate(BaseModel):
+    status: str  # queued, printing, printed, failed, displayed, cooking, ready
@@ -0,0 +1,24 @@
+# models/menu_models.py
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+import uuid
+
+class MenuItem(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    description: str = ""
+    price: float
+    category: str
+    image_url: Optional[str] = None
+    is_available: bool = True
+    preparation_time: int = 15
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class MenuItemCreate(BaseModel):
+    name: str
+    description: str = ""
+    price: float
+    category: str
+    image_url: Optional[str] = None
+    preparation_time: int = 15
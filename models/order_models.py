@@ -0,0 +1,109 @@
+# models/order_models.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime, timezone
+from enum import Enum
+import secrets
+import uuid
+
+class OrderStatus(str, Enum):
+    PENDING = "pending"
+    COOKING = "cooking"
+    READY = "ready"
+    SERVED = "served"
+    CANCELLED = "cancelled"
+
+class PaymentStatus(str, Enum):
+    PENDING = "pending"
+    PAID = "paid"
+
+class PaymentMethod(str, Enum):
+    CASH = "cash"
+    ONLINE = "online"
+
+class KitchenStatus(str, Enum):
+    ACTIVE = "active"
+    BUSY = "busy"
+    OFFLINE = "offline"
+
+class OrderItem(BaseModel):
+    menu_item_id: str
+    menu_item_name: str
+    quantity: int
+    price: float
+    special_instructions: str = ""
+
+def generate_order_id():
+    """Generate a short 8-character order ID like '68786a3c'"""
+    return secrets.token_hex(4)  # Generates 8 hex characters
+
+class Order(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    order_id: str = Field(default_factory=generate_order_id)
+    customer_name: str = ""
+    table_number: Optional[str] = None
+    items: List[OrderItem]
+    total_amount: float
+    gst_applicable: bool = False  
+    gst_amount: float = 0.0
+    final_amount: float = 0.0 
+    status: OrderStatus = OrderStatus.PENDING
+    payment_status: PaymentStatus = PaymentStatus.PENDING
+    payment_method: Optional[PaymentMethod] = None
+    covers: int = 1
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    estimated_completion: Optional[datetime] = None
+    kot_generated: bool = False
+
+class OrderCreate(BaseModel):
+    customer_name: str = ""
+    table_number: Optional[str] = None
+    items: List[OrderItem]
+    gst_applicable: bool = False 
+    covers: int = 1
+
+class OrderUpdate(BaseModel):
+    customer_name: Optional[str] = None
+    table_number: Optional[str] = None
+    items: Optional[List[OrderItem]] = None
+    total_amount: Optional[float] = None
+    gst_applicable: Optional[bool] = None
+    status: Optional[OrderStatus] = None
+    payment_status: Optional[PaymentStatus] = Field(default=None, alias="paymentStatus")
+    payment_method: Optional[PaymentMethod] = Field(default=None, alias="paymentMethod")
+    estimated_completion: Optional[datetime] = None
+    kot_generated: Optional[bool] = None
+    covers: Optional[int] = None
+    
+    class Config:
+        allow_population_by_field_name = True
+        allow_population_by_alias = True
+
+class StationTicket(BaseModel):
+    station: str
+    printer: str = ""
+    items: List[OrderItem]
+    status: str = "pending"
+    job_id: Optional[str] = None
+    error: Optional[str] = None
+
+class KOT(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    order_id: str
+    order_number: str
+    table_number: Optional[str] = None
+    items: List[OrderItem]
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    status: OrderStatus = OrderStatus.PENDING
+    station_tickets: List[StationTicket] = []
+
+class DashboardStats(BaseModel):
+    today_orders: int
+    today_revenue: float
+    pending_orders: int
+    cooking_orders: int
+    ready_orders: int
+    served_orders: int
+    kitchen_status: KitchenStatus
+    pending_payments: int
@@ -0,0 +1,23 @@
+# models/report_models.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime, timezone
+import uuid
+
+from models.order_models import Order, KOT
+
+class DailyReport(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    date: str
+    revenue: float = 0.0
+    orders: int = 0
+    kots: int = 0
+    bills: int = 0
+    invoices: int = 0
+    orders_list: List[Order] = []
+    kots_list: List[KOT] = []
+    bills_list: List[Order] = []
+    frozen: bool = False
+    frozen_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
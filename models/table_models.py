@@ -0,0 +1,32 @@
+# models/table_models.py
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+from enum import Enum
+import uuid
+
+class TableStatus(str, Enum):
+    AVAILABLE = "available"
+    OCCUPIED = "occupied"
+    RESERVED = "reserved"
+    CLEANING = "cleaning"
+
+class RestaurantTable(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    table_number: str
+    capacity: int = 4
+    status: TableStatus = TableStatus.AVAILABLE
+    current_order_id: Optional[str] = None
+    position_x: int = 0
+    position_y: int = 0
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class TableCreate(BaseModel):
+    table_number: str
+    capacity: int = 4
+    position_x: int = 0
+    position_y: int = 0
+
+class TableUpdate(BaseModel):
+    status: Optional[TableStatus] = None
+    current_order_id: Optional[str] = None
@@ -0,0 +1,102 @@
+# routes/analytics_routes.py
+
+from fastapi import APIRouter, HTTPException
+from datetime import date, datetime, timedelta
+from typing import Optional
+import logging
+
+from config import ITEM_PERFORMANCE_REFRESH_MINUTES
+from services.sales_analytics import GRANULARITIES, RESTAURANT_TZ
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+# This will be injected at startup (app.py)
+analytics = None
+
+MAX_RANGE_DAYS = 400
+
+
+def init_analytics_routes(sales_analytics):
+    """Initialize routes with the sales analytics service"""
+    global analytics
+    analytics = sales_analytics
+
+
+def _date_range(start: Optional[str], end: Optional[str], default_days: int):
+    """Parse YYYY-MM-DD bounds, defaulting to the last default_days local days"""
+    try:
+        end_date = date.fromisoformat(end) if end else datetime.now(RESTAURANT_TZ).date()
+        start_date = date.fromisoformat(start) if start else end_date - timedelta(days=default_days - 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+    if (end_date - start_date).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+    return start_date, end_date
+
+
+# ============================================================================
+# SALES ANALYTICS ENDPOINTS
+# ============================================================================
+
+@router.get("/sales")
+async def get_sales(start: Optional[str] = None, end: Optional[str] = None, granularity: str = "day"):
+    """Revenue, orders, covers, average ticket, GST and payment split per period"""
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of {', '.join(GRANULARITIES)}")
+    start_date, end_date = _date_range(start, end, default_days=30)
+
+    try:
+        periods = await analytics.sales(start_date, end_date, granularity)
+    except Exception as e:
+        logger.error(f"Error fetching sales analytics: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    revenue = round(sum(p["revenue"] for p in periods), 2)
+    orders = sum(p["orders"] for p in periods)
+    return {
+        "start": start_date.isoformat(),
+        "end": end_date.isoformat(),
+        "granularity": granularity,
+        "periods": periods,
+        "totals": {
+            "orders": orders,
+            "covers": sum(p["covers"] for p in periods),
+            "revenue": revenue,
+            "gst_collected": round(sum(p["gst_collected"] for p in periods), 2),
+            "average_ticket": round(revenue / orders, 2) if orders else 0.0,
+        },
+    }
+
+
+@router.get("/items")
+async def get_item_performance(start: Optional[str] = None, end: Optional[str] = None, refresh: bool = False):
+    """Per-dish quantity, revenue, attach rate, menu class and hour-of-day heat map"""
+    start_date, end_date = _date_range(start, end, default_days=30)
+    try:
+        if refresh:
+            return await analytics.refresh_item_performance(start_date, end_date)
+        return await analytics.cached_item_performance(start_date, end_date, ITEM_PERFORMANCE_REFRESH_MINUTES)
+    except Exception as e:
+        logger.error(f"Error fetching item performance: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/rebuild")
+async def rebuild_sales(start: Optional[str] = None, end: Optional[str] = None):
+    """Recompute sales buckets from orders (backfill or repair)"""
+    start_date, end_date = _date_range(start, end, default_days=MAX_RANGE_DAYS)
+    try:
+        buckets = await analytics.rebuild(start_date, end_date)
+    except Exception as e:
+        logger.error(f"Error rebuilding sales buckets: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "status": "success",
+        "start": start_date.isoformat(),
+        "end": end_date.isoformat(),
+        "buckets": buckets,
+    }
@@ -1,60 +1,105 @@
 # routes/auth.py
-from fastapi import APIRouter, HTTPException, Form
+from fastapi import APIRouter, Depends, HTTPException, Form, Request
 from datetime import datetime
+import logging
+
 from models.admin import Admin
-from utils.auth import hash_password, verify_password
+from services.rate_limiter import client_ip, rate_limiter
+from utils.auth import decode_token, hash_password_async, issue_tokens, require_admin, verify_password_async
 from utils.database import get_database
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 @router.get("/check-admin")
 async def check_admin_exists():
     """Check if admin account exists"""
-    db = await get_database()
-    admin = await db.admins.find_one({})
-    return {"exists": admin is not None}
+    try:
+        db = await get_database()
+        admin = await db.admins.find_one({})
+        return {"exists": admin is not None}
+    except Exception as e:
+        logger.error(f"Error checking admin: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/signup")
-async def signup(admin: Admin):
+async def signup(admin: Admin, request: Request):
     """Create admin account (first-time only)"""
-    db = await get_database()
-    
-    # Check if admin already exists
-    existing_admin = await db.admins.find_one({})
-    if existing_admin:
-        raise HTTPException(status_code=400, detail="Admin already exists. Signup is disabled.")
-    
-    # Hash password
-    hashed_password = hash_password(admin.password)
-    
-    # Save to database
-    admin_data = {
-        "admin_id": admin.admin_id,
-        "password": hashed_password,
-        "created_at": datetime.now()
-    }
-    
-    result = await db.admins.insert_one(admin_data)
-    return {"message": "Admin created successfully", "admin_id": admin.admin_id}
+    try:
+        await rate_limiter.check("signup", client_ip(request))
+        db = await get_database()
+
+        # Check if admin already exists
+        existing_admin = await db.admins.find_one({})
+        if existing_admin:
+            raise HTTPException(status_code=400, detail="Admin already exists. Signup is disabled.")
+
+        # Hash password
+        hashed_password = await hash_password_async(admin.password)
+
+        # Save to database
+        admin_data = {
+            "admin_id": admin.admin_id,
+            "password": hashed_password,
+            "created_at": datetime.now()
+        }
+
+        await db.admins.insert_one(admin_data)
+        logger.info(f"Admin account created: {admin.admin_id}")
+        return {"message": "Admin created successfully", "admin_id": admin.admin_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Signup error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/login")
-async def login(admin_id: str = Form(...), password: str = Form(...)):
+async def login(request: Request, admin_id: str = Form(...), password: str = Form(...)):
     """Login with credentials"""
+    try:
+        # Per address and per account, so neither many guesses from one client
+        # nor a distributed guess at one account get through
+        await rate_limiter.check("login_ip", client_ip(request))
+        await rate_limiter.check("login_admin", admin_id)
+        db = await get_database()
+
+        # Find admin
+        admin = await db.admins.find_one({"admin_id": admin_id})
+
+        if not admin:
+            raise HTTPException(status_code=401, detail="Invalid admin ID or password")
+
+        # Verify password (bcrypt runs in the threadpool)
+        if not await verify_password_async(password, admin["password"]):
+            raise HTTPException(status_code=401, detail="Invalid admin ID or password")
+
+        logger.info(f"Admin logged in: {admin_id}")
+        return {"message": "Login successful", "admin_id": admin_id, **issue_tokens(admin_id)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Login error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/refresh")
+async def refresh(refresh_token: str = Form(...)):
+    """Exchange a refresh token for a new token pair"""
+    claims = decode_token(refresh_token, "refresh")
     db = await get_database()
-    
-    # Find admin
-    admin = await db.admins.find_one({"admin_id": admin_id})
-    
-    if not admin:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    
-    # Verify password
-    if not verify_password(password, admin["password"]):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    
-    return {"message": "Login successful", "admin_id": admin_id}
+    # The account may have been removed since the token was issued
+    if not await db.admins.find_one({"admin_id": claims["sub"]}, {"_id": 1}):
+        raise HTTPException(status_code=401, detail="Admin no longer exists")
+    return {"admin_id": claims["sub"], **issue_tokens(claims["sub"])}
+
+@router.get("/me")
+async def me(admin_id: str = Depends(require_admin)):
+    """Admin the presented access token belongs to"""
+    if admin_id is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return {"admin_id": admin_id}
 
 @router.post("/logout")
 async def logout():
-    """Logout"""
+    """Logout (tokens are stateless: the client discards them)"""
     return {"message": "Logged out successfully"}
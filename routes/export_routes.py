@@ -0,0 +1,71 @@
+# routes/export_routes.py
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from datetime import date
+import logging
+import os
+
+from services.parquet_export import ParquetUnavailable
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+# These will be injected at startup (app.py)
+parquet_exporter = None
+xlsx_exporter = None
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def init_export_routes(exporter, report_exporter):
+    """Initialize routes with the Parquet and Excel exporters"""
+    global parquet_exporter, xlsx_exporter
+    parquet_exporter = exporter
+    xlsx_exporter = report_exporter
+
+
+def _parse_dates(start: str, end: str):
+    try:
+        start_date, end_date = date.fromisoformat(start), date.fromisoformat(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+    return start_date, end_date
+
+
+# ============================================================================
+# EXPORT ENDPOINTS
+# ============================================================================
+
+@router.post("/parquet")
+async def export_parquet(start: str, end: str):
+    """Write orders, items and payments for a date range to month-partitioned Parquet files"""
+    start_date, end_date = _parse_dates(start, end)
+    try:
+        return await parquet_exporter.export(start_date, end_date)
+    except ParquetUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting Parquet: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/xlsx")
+async def export_xlsx(start: str, end: str):
+    """Download a Summary/Orders/Items/Payments workbook for a date range"""
+    start_date, end_date = _parse_dates(start, end)
+    try:
+        path = await xlsx_exporter.export(start_date, end_date)
+    except Exception as e:
+        logger.error(f"Error exporting Excel report: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=f"report_{start_date.isoformat()}_{end_date.isoformat()}.xlsx",
+        background=BackgroundTask(os.unlink, path),
+    )
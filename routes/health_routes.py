@@ -5,9 +5,14 @@ from fastapi import APIRouter
 from datetime import datetime, timezone
 import logging
 
+from services.rate_limiter import rate_limiter
+from utils.database import pool_metrics
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
+# Under /api so the desktop build can keep "/" for the React app
+status_router = APIRouter(prefix="/api", tags=["Health"])
 
 # Global variables (will be set by main.py)
 mongo_client = None
@@ -70,3 +75,20 @@ async def health_check():
 async def ping():
     """Simple ping endpoint"""
     return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
+
+
+@status_router.get("/health")
+async def api_health_check():
+    return {"status": "ok", "message": "API is running"}
+
+
+@status_router.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Connection pool usage and check-out wait times"""
+    return pool_metrics.snapshot()
+
+
+@status_router.get("/metrics/rate-limits")
+async def rate_limit_metrics():
+    """Requests allowed/rejected per rate-limit rule"""
+    return rate_limiter.snapshot()
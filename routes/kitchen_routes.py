@@ -0,0 +1,127 @@
+# routes/kitchen_routes.py
+
+from fastapi import APIRouter, HTTPException
+from datetime import datetime, timezone
+import logging
+
+from models.kitchen_models import (
+    KitchenStationModel,
+    KitchenStationCreate,
+    KitchenStationUpdate,
+    StationStatusUpdate
+)
+from utils.database import workload_collection
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["kitchen"])
+
+# These will be injected at startup (app.py)
+db = None
+kot_router = None
+cache_versions = None
+
+
+def init_kitchen_routes(database, router_service, versions=None):
+    """Initialize routes with database connection, KOT router and cross-worker cache versions"""
+    global db, kot_router, cache_versions
+    db = database
+    kot_router = router_service
+    cache_versions = versions
+
+
+async def _stations_changed():
+    """Drop cached station rules in this and every other worker"""
+    if cache_versions:
+        await cache_versions.bump("kitchen_stations")
+    else:
+        kot_router.invalidate()
+
+
+# ============================================================================
+# KITCHEN STATION ENDPOINTS
+# ============================================================================
+
+@router.get("/kitchen-stations")
+async def get_kitchen_stations():
+    """List kitchen stations and their category rules"""
+    return await kot_router.stations()
+
+
+@router.post("/kitchen-stations", response_model=KitchenStationModel)
+async def create_kitchen_station(station_data: KitchenStationCreate):
+    """Create a kitchen station"""
+    try:
+        station = KitchenStationModel(**station_data.model_dump())
+        station_dict = station.model_dump()
+        for key, value in station_dict.items():
+            if isinstance(value, datetime):
+                station_dict[key] = value.isoformat()
+
+        if station.is_default:
+            await db.kitchen_stations.update_many({}, {"$set": {"is_default": False}})
+        await db.kitchen_stations.insert_one(station_dict)
+        await _stations_changed()
+
+        logger.info(f"✅ Kitchen station created: {station.name}")
+        return station
+    except Exception as e:
+        logger.error(f"Error creating kitchen station: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.put("/kitchen-stations/{station_id}")
+async def update_kitchen_station(station_id: str, station_data: KitchenStationUpdate):
+    """Update a kitchen station"""
+    update_data = station_data.model_dump(exclude_unset=True)
+    update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+    if update_data.get("is_default"):
+        await db.kitchen_stations.update_many({"id": {"$ne": station_id}}, {"$set": {"is_default": False}})
+
+    updated = await db.kitchen_stations.find_one_and_update(
+        {"id": station_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=True
+    )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Kitchen station not found")
+
+    await _stations_changed()
+    return updated
+
+
+@router.delete("/kitchen-stations/{station_id}")
+async def delete_kitchen_station(station_id: str):
+    """Delete a kitchen station"""
+    result = await db.kitchen_stations.delete_one({"id": station_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Kitchen station not found")
+    await _stations_changed()
+    return {"message": "Kitchen station deleted successfully"}
+
+
+# ============================================================================
+# PER-STATION KOT STATUS
+# ============================================================================
+
+@router.get("/kot/{kot_id}/stations")
+async def get_kot_stations(kot_id: str):
+    """Per-station ticket status for a KOT"""
+    kot = await db.kots.find_one({"id": kot_id}, {"_id": 0})
+    if not kot:
+        raise HTTPException(status_code=404, detail="KOT not found")
+    return await kot_router.refresh_status(kot)
+
+
+@router.put("/kot/{kot_id}/stations/{station}")
+async def update_kot_station_status(kot_id: str, station: str, status_data: StationStatusUpdate):
+    """Update one station's ticket (e.g. bumped as ready on a kitchen screen)"""
+    result = await workload_collection(db, "kots", "kot").update_one(
+        {"id": kot_id, "station_tickets.station": station},
+        {"$set": {"station_tickets.$.status": status_data.status}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="KOT station ticket not found")
+    return {"message": "Station status updated", "kot_id": kot_id, "station": station, "status": status_data.status}
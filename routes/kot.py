@@ -0,0 +1,63 @@
+# routes/kot.py
+
+from fastapi import APIRouter, HTTPException
+from typing import List
+import logging
+
+from models.order_models import Order, KOT, StationTicket
+from utils.database import prepare_for_mongo, parse_from_mongo, workload_collection
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["kot"])
+
+# These will be injected at startup (app.py)
+db = None
+kot_router = None
+
+
+def init_kot_routes(database, router_service):
+    """Initialize routes with database connection and KOT router"""
+    global db, kot_router
+    db = database
+    kot_router = router_service
+
+
+# ==================== KOT ENDPOINTS ====================
+@router.post("/kot/{order_id}", response_model=KOT)
+async def generate_kot(order_id: str):
+    order = await db.orders.find_one({"id": order_id})
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    order_obj = Order(**parse_from_mongo(order))
+    kot_count = await db.kots.count_documents({}) + 1
+    order_number = f"ORD-{kot_count:04d}"
+    
+    # Split into per-station tickets (bar, tandoor, kitchen...) by menu category
+    tickets = await kot_router.split([item.model_dump() for item in order_obj.items])
+    
+    kot = KOT(
+        order_id=order_id,
+        order_number=order_number,
+        table_number=order_obj.table_number,
+        items=order_obj.items,
+        station_tickets=tickets,
+    )
+    
+    kot_dict = prepare_for_mongo(kot.model_dump())
+    await workload_collection(db, "kots", "kot").insert_one(kot_dict)
+    await db.orders.update_one({"id": order_id}, {"$set": {"kot_generated": True}})
+    
+    # Print every station's ticket in parallel
+    dispatched = await kot_router.dispatch(kot_dict, kot_dict["station_tickets"])
+    kot.station_tickets = [StationTicket(**ticket) for ticket in dispatched]
+    return kot
+
+@router.get("/kot", response_model=List[KOT])
+async def get_kots():
+    kots_cursor = db.kots.find().sort("created_at", -1)
+    kots = []
+    async for kot in kots_cursor:
+        kots.append(KOT(**parse_from_mongo(kot)))
+    return kots
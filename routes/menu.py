@@ -0,0 +1,196 @@
+# routes/menu.py
+
+from fastapi import APIRouter, HTTPException, Body, UploadFile, File
+from fastapi.responses import Response
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import List
+import logging
+import uuid
+
+from models.menu_models import MenuItem, MenuItemCreate
+from utils.database import prepare_for_mongo, parse_from_mongo
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["menu"])
+
+# This will be injected at startup (app.py)
+db = None
+
+
+def init_menu_routes(database):
+    """Initialize routes with database connection"""
+    global db
+    db = database
+
+
+# ==================== MENU ENDPOINTS ====================
+@router.post("/menu", response_model=MenuItem)
+async def create_menu_item(item: MenuItemCreate):
+    menu_item = MenuItem(**item.model_dump())
+    item_dict = prepare_for_mongo(menu_item.model_dump())
+    await db.menu_items.insert_one(item_dict)
+    return menu_item
+
+@router.get("/menu", response_model=List[MenuItem])
+async def get_menu():
+    items_cursor = db.menu_items.find({})
+    menu_items = []
+    async for item in items_cursor:
+        menu_items.append(MenuItem(**parse_from_mongo(item)))
+    return menu_items
+
+@router.put("/menu/{menu_item_id}", response_model=MenuItem)
+async def update_menu_item(menu_item_id: str, item: MenuItemCreate = Body(...)):
+    updated = await db.menu_items.find_one_and_update(
+        {"id": menu_item_id},
+        {"$set": item.model_dump()},
+        return_document=True
+    )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Menu item not found")
+    return MenuItem(**parse_from_mongo(updated))
+
+# ============== EXCEL IMPORT/EXPORT ENDPOINTS ==============
+
+@router.get("/menu/template")
+async def download_template():
+    """Download Excel template for bulk menu import"""
+    import pandas as pd
+    try:
+        # Create sample data
+        data = {
+            'name': ['Paneer Tikka', 'Butter Chicken', 'Dal Makhani', 'Naan', 'Gulab Jamun'],
+            'description': [
+                'Cottage cheese marinated in spices',
+                'Chicken in rich tomato gravy',
+                'Black lentils in creamy sauce',
+                'Indian flatbread',
+                'Sweet milk-solid dumplings'
+            ],
+            'price': [250.00, 350.00, 180.00, 40.00, 80.00],
+            'category': ['Starters', 'Main Course', 'Main Course', 'Breads', 'Desserts'],
+            'preparationtime': [20, 30, 25, 10, 15]
+        }
+        
+        # Create DataFrame
+        df = pd.DataFrame(data)
+        
+        # Create Excel file in memory
+        output = BytesIO()
+        
+        # Use openpyxl engine
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            df.to_excel(writer, sheet_name='Menu Items', index=False)
+        
+        output.seek(0)
+        
+        # Return as response
+        return Response(
+            content=output.read(),
+            media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            headers={
+                'Content-Disposition': 'attachment; filename=menu_template.xlsx',
+                'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Error creating template: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error creating template: {str(e)}")
+@router.post("/menu/import")
+async def import_menu(file: UploadFile = File(...)):
+    """Import menu items from Excel file"""
+    import pandas as pd
+    try:
+        logger.info(f"Received file upload: {file.filename}")
+        
+        # Validate file type
+        if not file.filename.endswith(('.xlsx', '.xls')):
+            raise HTTPException(
+                status_code=400, 
+                detail="Only Excel files (.xlsx, .xls) are allowed"
+            )
+        
+        # Read Excel file
+        contents = await file.read()
+        logger.info(f"File size: {len(contents)} bytes")
+        
+        df = pd.read_excel(BytesIO(contents))
+        logger.info(f"Excel read successfully. Rows: {len(df)}")
+        
+        # Validate required columns
+        required_columns = ['name', 'category', 'price']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Missing required columns: {', '.join(missing_columns)}"
+            )
+        
+        # Process each row
+        imported_count = 0
+        skipped_count = 0
+        errors = []
+        
+        for index, row in df.iterrows():
+            try:
+                # Check if item already exists
+                existing_item = await db.menu_items.find_one({"name": row['name']})
+                if existing_item:
+                    skipped_count += 1
+                    logger.info(f"Skipping duplicate: {row['name']}")
+                    continue
+                
+                # Create menu item
+                menu_item = {
+                    "id": str(uuid.uuid4()),
+                    "name": str(row['name']),
+                    "description": str(row.get('description', '')),
+                    "price": float(row['price']),
+                    "category": str(row['category']),
+                    "imageurl": str(row.get('imageurl', '')) if pd.notna(row.get('imageurl')) else None,
+                    "isavailable": True,
+                    "preparationtime": int(row.get('preparationtime', 15)),
+                    "createdat": datetime.now(timezone.utc)
+                }
+                
+                # Insert into database
+                await db.menu_items.insert_one(prepare_for_mongo(menu_item))
+                imported_count += 1
+                logger.info(f"Imported: {row['name']}")
+                
+            except Exception as e:
+                error_msg = f"Row {index + 2}: {str(e)}"
+                errors.append(error_msg)
+                logger.error(error_msg)
+                continue
+        
+        result = {
+            "imported": imported_count,
+            "skipped": skipped_count,
+            "total_rows": len(df),
+            "errors": errors[:10]
+        }
+        
+        logger.info(f"Import complete: {result}")
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error importing menu: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
+@router.delete("/menu/{menu_item_id}")
+async def delete_menu_item(menu_item_id: str):
+    result = await db.menu_items.delete_one({"id": menu_item_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Menu item not found")
+    return {"message": "Menu item deleted successfully"}
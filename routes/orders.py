@@ -0,0 +1,344 @@
+# routes/orders.py
+
+from fastapi import APIRouter, HTTPException, Body
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Optional
+import logging
+
+import pytz
+from pymongo import ReturnDocument
+
+from models.order_models import Order, OrderCreate, OrderUpdate, OrderStatus
+from utils.database import prepare_for_mongo, parse_from_mongo, workload_collection
+
+logger = logging.getLogger(__name__)
+
+IST = pytz.timezone('Asia/Kolkata')
+
+router = APIRouter(prefix="/api", tags=["orders"])
+# One-off data fixes, served outside /api like the original desktop build
+maintenance_router = APIRouter(tags=["maintenance"])
+
+# These will be injected at startup (app.py)
+db = None
+sales_analytics = None
+order_store = None
+
+
+def init_order_routes(database, analytics, store):
+    """Initialize routes with database connection, sales analytics and the tiered order store"""
+    global db, sales_analytics, order_store
+    db = database
+    sales_analytics = analytics
+    order_store = store
+
+
+# ==================== ORDER ENDPOINTS ====================
+async def set_order_fields(
+    order_id: str, fields: Dict[str, Any], workload: Optional[str] = None, key: str = "id"
+) -> Optional[Dict[str, Any]]:
+    """$set fields on an order (looked up by ``key``) and apply the change to the sales buckets"""
+    orders = workload_collection(db, "orders", workload) if workload else db.orders
+    before = await orders.find_one_and_update(
+        {key: order_id},
+        {"$set": fields},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        return None
+    updated = {**before, **fields}
+    await sales_analytics.record_order_change(before, updated)
+    return updated
+
+@router.post("/orders", response_model=Order)
+async def create_order(order_data: OrderCreate):
+    # Calculate subtotal
+    total_amount = sum(i.quantity * i.price for i in order_data.items)
+    
+    # Calculate GST if applicable
+    gst_amount = 0.0
+    final_amount = total_amount
+    
+    if order_data.gst_applicable:
+        gst_amount = round(total_amount * 0.05, 2)  # 5% GST
+        final_amount = round(total_amount + gst_amount, 2)
+    
+    # Calculate preparation time
+    max_prep_time = 30
+    for i in order_data.items:
+        menu_item = await db.menu_items.find_one({"id": i.menu_item_id})
+        if menu_item:
+            max_prep_time = max(max_prep_time, menu_item.get('preparation_time', 15))
+    
+    estimated_completion = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(minutes=max_prep_time)
+    
+    # Create order with GST fields
+    # Get current time in IST
+    now_ist = datetime.now(IST)
+
+    order = Order(
+        **order_data.model_dump(),
+        total_amount=total_amount,
+        gst_amount=gst_amount,
+        final_amount=final_amount,
+        estimated_completion=estimated_completion,
+        created_at=now_ist,
+        updated_at=now_ist
+    )
+
+    
+    order_dict = prepare_for_mongo(order.model_dump())
+    await db.orders.insert_one(order_dict)
+    await sales_analytics.record_order_change(None, order_dict)
+    
+    if order.table_number:
+        await db.tables.update_one(
+            {"table_number": order.table_number},
+            {"$set": {"status": "occupied", "current_order_id": order.id}},
+        )
+    
+    return order
+
+
+@router.get("/orders", response_model=List[Order])
+async def get_orders():
+    orders_cursor = db.orders.find().sort("_id", -1)
+    orders = []
+    async for order in orders_cursor:
+        orders.append(Order(**parse_from_mongo(order)))
+    return orders
+@maintenance_router.get("/fix-order-dates")
+async def fix_order_dates():
+    """Add createdat to orders that don't have it"""
+    try:
+        # Find all orders
+        orders_cursor = db.orders.find()
+        
+        updated_count = 0
+        async for order in orders_cursor:
+            # Check if createdat exists and is not None
+            if "createdat" not in order or order["createdat"] is None:
+                # Set createdat to current time
+                await db.orders.update_one(
+                    {"_id": order["_id"]},
+                    {"$set": {"createdat": datetime.now(timezone.utc).isoformat()}}
+                )
+                updated_count += 1
+        
+        return {"message": f"Updated {updated_count} orders with createdat field"}
+    except Exception as e:
+        logger.error(f"Error fixing order dates: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+@router.put("/orders/{order_id}", response_model=Order)
+async def update_order(order_id: str, order_data: OrderUpdate = Body(...)):
+    try:
+        logger.info(f"DEBUG update_order {order_id} payload: {order_data}")
+        
+        order_dict = order_data.model_dump(exclude_unset=True)
+        
+        # Recalculate amounts if items or gst_applicable changed
+        if "items" in order_dict or "gst_applicable" in order_dict:
+            # Get current order
+            current_order = await db.orders.find_one({"id": order_id})
+            if not current_order:
+                raise HTTPException(status_code=404, detail="Order not found")
+            
+            # Use updated items or keep current
+            items = order_dict.get("items", current_order.get("items", []))
+            gst_applicable = order_dict.get("gst_applicable", current_order.get("gst_applicable", False))
+            
+            # Calculate subtotal
+            total_amount = sum(item.get("quantity", 0) * item.get("price", 0) for item in items)
+            
+            # Calculate GST
+            gst_amount = 0.0
+            final_amount = total_amount
+            
+            if gst_applicable:
+                gst_amount = round(total_amount * 0.05, 2)
+                final_amount = round(total_amount + gst_amount, 2)
+            
+            order_dict["total_amount"] = total_amount
+            order_dict["gst_amount"] = gst_amount
+            order_dict["final_amount"] = final_amount
+            order_dict["estimated_completion"] = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(minutes=30)
+        
+        logger.info(f"Calculated amounts: {order_dict}")
+        order_dict["updated_at"] = datetime.now(timezone.utc)
+        
+        updated = await set_order_fields(order_id, order_dict)
+        
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Order not found")
+        
+        logger.info(f"Order {order_id} updated successfully")
+        return Order(**parse_from_mongo(updated))
+        
+    except Exception as e:
+        logger.error(f"Error updating order {order_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error updating order: {str(e)}")
+
+
+@router.delete("/orders/{order_id}")
+async def delete_order(order_id: str):
+    deleted = await db.orders.find_one_and_delete({"id": order_id})
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    await sales_analytics.record_order_change(deleted, None)
+    return {"message": "Order deleted successfully"}
+
+@router.put("/orders/{order_id}/pay")
+async def pay_order(order_id: str, payment_data: dict = Body(...)):
+    logger.info(f"Payment request for order {order_id}: {payment_data}")
+    payment_status = payment_data.get('payment_status', 'paid')
+    payment_method = payment_data.get('payment_method')
+    
+    update_data = {
+        "payment_status": payment_status,
+        "payment_method": payment_method,
+        "status": OrderStatus.SERVED.value,
+        "updated_at": datetime.now(timezone.utc)
+    }
+    
+    updated = await set_order_fields(order_id, update_data, workload="payment")
+    
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    logger.info(f"Order {order_id} payment updated successfully")
+    return {"message": "Payment processed and order marked as served", "order": parse_from_mongo(updated)}
+
+@router.put("/orders/{order_id}/cancel")
+async def cancel_order(order_id: str):
+    updated = await set_order_fields(order_id, {"status": "cancelled", "updated_at": datetime.now(timezone.utc)})
+    
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return {"message": "Order cancelled", "order": parse_from_mongo(updated)}
+
+# ==================== PAYMENTS SCREEN ====================
+@router.post("/payments/{order_id}/mark-cash")
+async def mark_order_as_cash(order_id: str):
+    """Mark an order as paid with cash"""
+    updated = await set_order_fields(
+        order_id,
+        {
+            "payment_method": "cash",
+            "payment_status": "paid",
+            "status": "paid",
+            "paid_at": datetime.now(timezone.utc).isoformat()
+        },
+        workload="payment",
+        key="order_id"
+    )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return {
+        "success": True,
+        "message": "Order marked as cash payment",
+        "order_id": order_id
+    }
+
+@router.delete("/payments/{order_id}")
+async def delete_order_from_payments(order_id: str):
+    """Cancel/delete an order"""
+    deleted = await db.orders.find_one_and_delete({"order_id": order_id})
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    await sales_analytics.record_order_change(deleted, None)
+    return {
+        "success": True,
+        "message": "Order cancelled successfully",
+        "order_id": order_id
+    }
+
+# ==================== PAYMENTS BY DATE ====================
+@router.get("/payments/{date}")
+async def get_payments_by_date(date: str):
+    """Get all paid orders for a specific date with order_id"""
+    try:
+        # Parse the date
+        target_date = datetime.fromisoformat(date).date()
+        start_datetime = datetime.combine(target_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+        end_datetime = datetime.combine(target_date, datetime.max.time()).replace(tzinfo=timezone.utc)
+        
+        logger.info(f"Fetching payments for {date}")
+        
+        # Query for paid orders
+        payments_query = {
+            "created_at": {
+                "$gte": start_datetime.isoformat(),
+                "$lt": end_datetime.isoformat()
+            },
+            "payment_status": "paid"
+        }
+        
+        payments = await order_store.find_all("orders", payments_query, start=date, sort=("created_at", -1))
+        payments_list = []
+        
+        for payment in payments:
+            payments_list.append({
+                "order_id": payment.get("order_id", "N/A"),  # ⭐ KEY FIX
+                "_id": str(payment["_id"]),
+                "final_amount": payment.get("finalamount") or payment.get("final_amount") or payment.get("totalamount") or payment.get("total_amount") or 0,
+                "payment_method": payment.get("payment_method", "N/A"),
+                "payment_status": payment.get("payment_status", "N/A"),
+                "created_at": payment.get("created_at"),
+                "customer_name": payment.get("customer_name", "Walk-in"),
+                "table_number": payment.get("table_number"),
+                "items": payment.get("items", []),  # Include order items
+                "total_amount": payment.get("totalamount") or payment.get("total_amount") or 0,
+                "gst_amount": payment.get("gstamount") or payment.get("gst_amount") or 0,
+                "gst_applicable": payment.get("gst_applicable", False)
+                
+            })
+        
+        logger.info(f"Found {len(payments_list)} payments for {date}")
+        return payments_list
+        
+    except Exception as e:
+        logger.error(f"Error fetching payments for {date}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+@router.get("/payments/pending/{date}")
+async def get_pending_orders(date: str):
+    """Get all pending payment orders for a specific date"""
+    try:
+        # Parse the date
+        target_date = datetime.fromisoformat(date).date()
+        start_datetime = datetime.combine(target_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+        end_datetime = datetime.combine(target_date, datetime.max.time()).replace(tzinfo=timezone.utc)
+        
+        logger.info(f"Fetching pending orders for {date}")
+        
+        # Query for pending payment orders
+        pending_query = {
+            "created_at": {
+                "$gte": start_datetime.isoformat(),
+                "$lt": end_datetime.isoformat()
+            },
+            "payment_status": "pending"
+        }
+        
+        pending_cursor = db.orders.find(pending_query).sort("created_at", -1)
+        pending_list = []
+        
+        async for order in pending_cursor:
+            pending_list.append({
+                "order_id": order.get("order_id", "N/A"),
+                "id": str(order["_id"]),
+                "total_amount": order.get("totalamount") or order.get("total_amount") or 0,
+                "final_amount": order.get("finalamount") or order.get("final_amount") or order.get("totalamount") or 0,
+                "payment_method": "pending",
+                "payment_status": "pending",
+                "created_at": order.get("created_at"),
+                "customer_name": order.get("customer_name", "Walk-in"),
+                "table_number": order.get("table_number"),
+                "items": order.get("items", [])
+            })
+        
+        logger.info(f"Found {len(pending_list)} pending orders for {date}")
+        return pending_list
+        
+    except Exception as e:
+        logger.error(f"Error fetching pending orders for {date}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,10 +1,12 @@
 # routes/payment_routes.py
 
-from fastapi import APIRouter, HTTPException, Body
+from fastapi import APIRouter, HTTPException, Body, Request
 from typing import List, Optional
 from datetime import datetime, timezone
 import logging
 
+from pymongo import ReturnDocument
+
 from models.soundbox_models import (
     SoundboxConfigModel,
     SoundboxConfigCreate,
@@ -15,18 +17,36 @@ from models.soundbox_models import (
 )
 
 from services.payment_matcher import PaymentMatcher
+from services.rate_limiter import client_ip, rate_limiter
+from utils.database import workload_collection
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["payments"])
+# Called by the soundbox provider, never by a logged-in admin
+webhook_router = APIRouter(prefix="/api", tags=["payments"])
 
-# This will be injected from main.py
+# These will be injected at startup (app.py)
 db = None
+analytics = None
 
-def init_payment_routes(database):
-    """Initialize routes with database connection"""
-    global db
+def init_payment_routes(database, sales_analytics=None):
+    """Initialize routes with database connection and sales analytics"""
+    global db, analytics
     db = database
+    analytics = sales_analytics
+
+
+async def _mark_order_paid(order_id: str, fields: dict) -> Optional[dict]:
+    """Set payment fields on an order and apply the change to the sales buckets"""
+    before = await workload_collection(db, "orders", "payment").find_one_and_update(
+        {"order_id": order_id},
+        {"$set": fields},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is not None and analytics:
+        await analytics.record_order_change(before, {**before, **fields})
+    return before
 
 
 # ============================================================================
@@ -202,14 +222,19 @@ async def test_soundbox_connection():
 # PAYMENT WEBHOOK ENDPOINTS (NEW - SIMPLIFIED VERSION)
 # ============================================================================
 
-@router.post("/webhook/soundbox")
-async def soundbox_webhook_simple(payload: dict):
+@webhook_router.post("/webhook/soundbox")
+async def soundbox_webhook_simple(payload: dict, request: Request):
     """
     Receive payment notifications from Paytm/PhonePe Soundbox
     
     Simplified version that works with basic payload structure
     """
     try:
+        # Stops a provider stuck in a retry loop from starving the till. Keyed
+        # on the sender's address - the payload is client controlled, so a
+        # "provider" field in it could pick a fresh bucket for every request
+        await rate_limiter.check("soundbox_webhook", client_ip(request))
+
         logger.info(f"📥 Payment webhook received: {payload}")
         
         # Extract payment details
@@ -242,7 +267,7 @@ async def soundbox_webhook_simple(payload: dict):
         }
         
         # Save to database
-        result = await db.payments.insert_one(payment_record)
+        result = await workload_collection(db, "payments", "payment").insert_one(payment_record)
         logger.info(f"💾 Payment saved: {transaction_id}")
         
         # Try to match with pending orders
@@ -293,19 +318,19 @@ async def auto_match_payment(amount: float, transaction_id: str):
         logger.info(f"🎯 Matching to order: {order_id}")
         
         # ✅ FIXED: Update order with correct field name
-        update_result = await db.orders.update_one(
-            {"order_id": order_id},  # ← FIXED: Changed from "id" to "order_id"
-            {"$set": {
+        updated = await _mark_order_paid(
+            order_id,  # ← FIXED: Changed from "id" to "order_id"
+            {
                 "payment_status": "paid",
                 "payment_method": "online",  # ✅ This sets it to "online"
                 "transaction_id": transaction_id,
                 "paid_at": datetime.now(timezone.utc).isoformat(),
                 "status": "served",
                 "updated_at": datetime.now(timezone.utc).isoformat()
-            }}
+            }
         )
         
-        if update_result.modified_count == 0:
+        if updated is None:
             logger.error(f"❌ Failed to update order {order_id}")
             return None
         
@@ -423,13 +448,13 @@ async def manual_match_payment(payment_id: str, order_id: str):
             raise HTTPException(status_code=404, detail="Order not found")
         
         # Update order
-        await db.orders.update_one(
-            {"order_id": order_id},
-            {"$set": {
+        await _mark_order_paid(
+            order_id,
+            {
                 "payment_status": "paid",
                 "transaction_id": payment_id,
                 "paid_at": datetime.now(timezone.utc).isoformat()
-            }}
+            }
         )
         
         # Update payment
@@ -0,0 +1,122 @@
+# routes/print_routes.py
+
+from fastapi import APIRouter, HTTPException, Body
+from fastapi.responses import HTMLResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, Optional
+import logging
+
+from services.escpos import build_receipt
+from services.invoice_renderer import invoice_renderer
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["printing"])
+# Invoice HTML needs no printer, so it is served by every profile
+invoice_router = APIRouter(prefix="/api", tags=["invoices"])
+
+# These will be injected at startup (app.py)
+spooler = None
+registry = None
+default_printer = ""
+
+
+def init_print_routes(print_spooler, printer_registry, printer: str = ""):
+    """Initialize routes with the print spooler and printer registry"""
+    global spooler, registry, default_printer
+    spooler = print_spooler
+    registry = printer_registry
+    default_printer = printer
+
+
+# ==================== PRINT INVOICE ENDPOINT ====================
+@invoice_router.post("/print-invoice")
+async def print_invoice(invoice_data: Dict[str, Any] = Body(...)):
+    """Generate printable invoice HTML"""
+    try:
+        return HTMLResponse(content=invoice_renderer.render_a4(invoice_data))
+    except Exception as e:
+        logger.error(f"Error generating print invoice: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ==================== THERMAL PRINTER ENDPOINT ====================
+@router.post("/print-thermal")
+async def print_thermal(invoice_data: Dict[str, Any] = Body(...)):
+    """Queue a thermal receipt; poll /api/print-jobs/{job_id} for the result"""
+    try:
+        invoice_no = invoice_data.get('invoiceNo', 'N/A')
+        capabilities = await run_in_threadpool(registry.capabilities, default_printer)
+        if capabilities["escpos"]:
+            receipt = build_receipt(invoice_data)
+        else:
+            receipt = invoice_renderer.render_thermal(invoice_data).encode('utf-8')
+        job = await spooler.submit(
+            default_printer,
+            receipt,
+            invoice_no=invoice_no,
+            job_type="receipt"
+        )
+        return {
+            "status": job["status"],
+            "message": "Receipt already in the print queue" if job.get("duplicate") else "Receipt queued for printing",
+            "job_id": job["id"],
+            "printer": job["printer"] or "default",
+            "invoice": invoice_no
+        }
+    except Exception as e:
+        logger.error(f" Error queueing receipt: {e}")
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+@router.get("/print-jobs")
+async def list_print_jobs(status: Optional[str] = None, limit: int = 50):
+    """Recent print jobs, optionally filtered by status"""
+    jobs = await spooler.list_jobs(status=status, limit=limit)
+    return {"jobs": jobs, "count": len(jobs)}
+
+
+@router.get("/print-jobs/{job_id}")
+async def get_print_job(job_id: str):
+    """Poll the status of a print job"""
+    job = await spooler.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Print job not found")
+    return job
+
+
+@router.get("/check-printer")
+async def check_printer(refresh: bool = False):
+    """Check printer status and availability"""
+    try:
+        printers = await run_in_threadpool(registry.printers, refresh)
+        state = await run_in_threadpool(registry.status, default_printer, refresh)
+        capabilities = await run_in_threadpool(registry.capabilities, default_printer)
+
+        return {
+            "status": "success",
+            "printers": printers,
+            "default_printer": state.get("printer") or default_printer or None,
+            "printer_status": state.get("message", "Unknown"),
+            "ready": state.get("ready", False),
+            "escpos": capabilities["escpos"],
+            "total_printers": len(printers)
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+@router.get("/list-printers")
+async def list_printers(refresh: bool = False):
+    """List all Windows printers"""
+    try:
+        printers = await run_in_threadpool(registry.printers, refresh)
+        return {"printers": printers}
+    except Exception as e:
+        return {"error": str(e), "printers": []}
@@ -0,0 +1,237 @@
+# routes/reports.py
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import json
+import logging
+
+from pymongo.errors import OperationFailure
+
+from models.order_models import DashboardStats, KitchenStatus, OrderStatus, PaymentStatus
+from models.report_models import DailyReport
+from services.sales_analytics import local_date, local_range_match
+from utils.database import prepare_for_mongo, parse_from_mongo, workload_collection
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["reports"])
+
+# These will be injected at startup (app.py)
+db = None
+order_store = None
+
+
+def init_report_routes(database, store):
+    """Initialize routes with database connection and the tiered order store"""
+    global db, order_store
+    db = database
+    order_store = store
+
+
+# ==================== DASHBOARD ENDPOINT ====================
+@router.get("/dashboard", response_model=DashboardStats)
+async def get_dashboard():
+    today = datetime.now(timezone.utc).date()
+    orders_today = await db.orders.count_documents({"created_at": {"$gte": today.isoformat()}})
+    
+    pipeline = [
+        {"$match": {"created_at": {"$gte": today.isoformat()}}},
+        {"$group": {"_id": None, "total_revenue": {"$sum": "$final_amount"}}}
+    ]
+    revenue_result = await db.orders.aggregate(pipeline).to_list(length=1)
+    total_revenue = revenue_result[0]["total_revenue"] if revenue_result else 0.0
+    
+    pending_orders = await db.orders.count_documents({"status": OrderStatus.PENDING.value})
+    cooking_orders = await db.orders.count_documents({"status": OrderStatus.COOKING.value})
+    ready_orders = await db.orders.count_documents({"status": OrderStatus.READY.value})
+    served_orders = await db.orders.count_documents({"status": OrderStatus.SERVED.value})
+    pending_payments = await db.orders.count_documents({"payment_status": PaymentStatus.PENDING.value})
+    
+    kitchen_status = KitchenStatus.ACTIVE
+    
+    return DashboardStats(
+        today_orders=orders_today,
+        today_revenue=total_revenue,
+        pending_orders=pending_orders,
+        cooking_orders=cooking_orders,
+        ready_orders=ready_orders,
+        served_orders=served_orders,
+        kitchen_status=kitchen_status,
+        pending_payments=pending_payments,
+    )
+
+
+# ==================== REPORT ENDPOINTS ====================
+async def build_daily_report(date: str, freeze: bool = False) -> Dict[str, Any]:
+    """Roll up one day's orders, KOTs and bills into daily_reports (frozen reports are returned as stored)"""
+    stored = await db.daily_reports.find_one({"date": date, "frozen": True}, {"_id": 0})
+    if stored:
+        return stored
+
+    # The business day is the restaurant-local date (config.RESTAURANT_TIMEZONE). created_at is
+    # stored as ISO strings with mixed offsets, so a widened string range is fetched and each
+    # document is kept only if its own timestamp falls on this local date.
+    target_date = datetime.fromisoformat(date).date()
+    day = target_date.isoformat()
+    day_query = local_range_match(target_date, target_date)
+    window_start = day_query["created_at"]["$gte"]
+    
+    logger.info(f"Generating report for date: {date}, prefilter: {day_query['created_at']}")
+    
+    # Get ALL orders for this date (hot collection, plus the archive for old dates)
+    orders_cursor = order_store.find("orders", day_query, start=window_start)
+    orders_list = []
+    total_revenue = 0.0  # ✅ Calculate revenue from ALL orders
+    
+    async for order in orders_cursor:
+        if local_date(order.get("created_at")) != day:
+            continue
+        parsed_order = parse_from_mongo(order)
+        orders_list.append(parsed_order)
+        
+        # Sum revenue from ALL orders (not just paid)
+        if parsed_order.get("final_amount"):
+            total_revenue += float(parsed_order.get("final_amount", 0))
+    
+    logger.info(f"Found {len(orders_list)} orders with total revenue: ₹{total_revenue}")
+    
+    # Get KOTs
+    kots_cursor = order_store.find("kots", day_query, start=window_start)
+    kots_list = []
+    async for kot in kots_cursor:
+        if local_date(kot.get("created_at")) != day:
+            continue
+        kots_list.append(parse_from_mongo(kot))
+    
+    # Bills are the PAID orders - already loaded above
+    bills_list = [order for order in orders_list if order.get("payment_status") == PaymentStatus.PAID.value]
+    
+    daily_report = DailyReport(
+        date=date,
+        revenue=total_revenue,  # ✅ Revenue from ALL orders
+        orders=len(orders_list),
+        kots=len(kots_list),
+        bills=len(bills_list),
+        invoices=len(bills_list),
+        orders_list=orders_list,
+        kots_list=kots_list,
+        bills_list=bills_list,
+        frozen=freeze,
+        frozen_at=datetime.now(timezone.utc) if freeze else None
+    )
+    
+    report_dict = prepare_for_mongo(daily_report.model_dump())
+    report_dict["updated_at"] = datetime.now(timezone.utc)
+    
+    await db.daily_reports.replace_one(
+        {"date": date},
+        report_dict,
+        upsert=True
+    )
+    
+    logger.info(f"Daily report saved for {date}. Revenue: ₹{total_revenue}, Orders: {len(orders_list)}")
+    return daily_report.model_dump()
+
+
+@router.get("/report")
+async def get_daily_report(date: str):
+    try:
+        return await build_daily_report(date)
+    except Exception as e:
+        logger.error(f"Error generating daily report for {date}: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error generating daily report: {str(e)}")
+
+
+REPORT_SUMMARY_FIELDS = {
+    "_id": 0, "id": 1, "date": 1, "revenue": 1, "orders": 1, "kots": 1,
+    "bills": 1, "invoices": 1, "frozen": 1, "created_at": 1, "updated_at": 1,
+}
+REPORT_SECTIONS = ("orders", "kots", "bills")
+
+
+async def dedupe_daily_reports() -> int:
+    """Keep only the latest report per date (older builds upserted without an index)"""
+    pipeline = [
+        {"$sort": {"date": 1, "updated_at": -1}},
+        {"$group": {"_id": "$date", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    removed = 0
+    async for group in db.daily_reports.aggregate(pipeline, allowDiskUse=True):
+        result = await db.daily_reports.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+    return removed
+
+
+async def ensure_report_indexes():
+    """One report document per date"""
+    try:
+        await db.daily_reports.create_index("date", unique=True)
+    except OperationFailure:
+        removed = await dedupe_daily_reports()
+        logger.info(f"Removed {removed} duplicate daily reports")
+        await db.daily_reports.create_index("date", unique=True)
+
+
+@router.get("/reports")
+async def get_all_reports(response: Response, skip: int = 0, limit: Optional[int] = None):
+    """Report history, newest first - summary fields only (lists via /reports/{date})
+
+    The whole history unless ``limit`` is given (pages of at most 1000, total in X-Total-Count)
+    """
+    try:
+        daily_reports = workload_collection(db, "daily_reports", "report")
+        reports_cursor = daily_reports.find({}, REPORT_SUMMARY_FIELDS).sort("date", -1).skip(max(skip, 0))
+        if limit is not None:
+            reports_cursor = reports_cursor.limit(max(1, min(limit, 1000)))
+        reports = []
+        async for report in reports_cursor:
+            reports.append(parse_from_mongo(report))
+        response.headers["X-Total-Count"] = str(await daily_reports.estimated_document_count())
+        return reports
+    except Exception as e:
+        logger.error(f"Error fetching all reports: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching reports: {str(e)}")
+
+
+@router.post("/reports/cleanup-duplicates")
+async def cleanup_duplicate_reports():
+    removed = await dedupe_daily_reports()
+    return {"status": "success", "removed_count": removed}
+
+
+@router.get("/reports/{date}")
+async def get_report_detail(date: str, section: Optional[str] = None):
+    """Summary for one day, or stream one of its orders/kots/bills lists as a JSON array"""
+    if section is None:
+        report = await db.daily_reports.find_one({"date": date}, REPORT_SUMMARY_FIELDS)
+        if not report:
+            raise HTTPException(status_code=404, detail="Report not found")
+        return parse_from_mongo(report)
+
+    if section not in REPORT_SECTIONS:
+        raise HTTPException(status_code=400, detail=f"section must be one of {', '.join(REPORT_SECTIONS)}")
+    if not await db.daily_reports.count_documents({"date": date}, limit=1):
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    pipeline = [
+        {"$match": {"date": date}},
+        {"$project": {"_id": 0, "entry": f"${section}_list"}},
+        {"$unwind": "$entry"},
+        {"$replaceRoot": {"newRoot": "$entry"}},
+    ]
+
+    async def stream_section():
+        yield "["
+        first = True
+        async for entry in workload_collection(db, "daily_reports", "report").aggregate(pipeline):
+            entry.pop("_id", None)
+            yield ("" if first else ",") + json.dumps(entry, default=str)
+            first = False
+        yield "]"
+
+    return StreamingResponse(stream_section(), media_type="application/json")
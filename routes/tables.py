@@ -0,0 +1,57 @@
+# routes/tables.py
+
+from fastapi import APIRouter, HTTPException, Body
+from typing import List
+import logging
+
+from models.table_models import RestaurantTable, TableCreate, TableUpdate
+from utils.database import prepare_for_mongo, parse_from_mongo
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["tables"])
+
+# This will be injected at startup (app.py)
+db = None
+
+
+def init_table_routes(database):
+    """Initialize routes with database connection"""
+    global db
+    db = database
+
+
+# ==================== TABLE ENDPOINTS ====================
+@router.post("/tables", response_model=RestaurantTable)
+async def create_table(table_data: TableCreate):
+    table = RestaurantTable(**table_data.model_dump())
+    table_dict = prepare_for_mongo(table.model_dump())
+    await db.tables.insert_one(table_dict)
+    return table
+
+@router.get("/tables", response_model=List[RestaurantTable])
+async def get_tables():
+    tables_cursor = db.tables.find({})
+    tables = []
+    async for table in tables_cursor:
+        tables.append(RestaurantTable(**parse_from_mongo(table)))
+    return tables
+
+@router.put("/tables/{table_id}", response_model=RestaurantTable)
+async def update_table(table_id: str, table_data: TableUpdate = Body(...)):
+    updated = await db.tables.find_one_and_update(
+        {"id": table_id},
+        {"$set": table_data.model_dump(exclude_unset=True)},
+        return_document=True
+    )
+    
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Table not found")
+    return RestaurantTable(**parse_from_mongo(updated))
+
+@router.delete("/tables/{table_id}")
+async def delete_table(table_id: str):
+    result = await db.tables.delete_one({"id": table_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Table not found")
+    return {"message": "Table deleted successfully"}
@@ -0,0 +1,77 @@
+# services/cache_versions.py
+"""
+Cross-process cache invalidation
+
+In-process caches (kitchen station rules, the archive watermark) go stale
+when another worker changes the underlying data. Every cache has a counter
+in one ``cache_versions`` document; the worker that changes the data bumps
+the counter and every worker polls the document, dropping its local copy
+when a counter moves. One small read per poll interval, and it works on the
+standalone desktop mongod, where change streams are unavailable.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_ID = "caches"
+
+
+class CacheVersions:
+    """Version counters for named caches, shared through Mongo"""
+
+    def __init__(self, db, interval: float = 5):
+        self.db = db
+        self.interval = interval
+        self._callbacks: Dict[str, List[Callable[[], None]]] = defaultdict(list)
+        self._seen: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, invalidate: Callable[[], None]):
+        """Call ``invalidate`` whenever cache ``name`` changes in any worker"""
+        self._callbacks[name].append(invalidate)
+
+    async def bump(self, name: str):
+        """The data behind ``name`` changed: invalidate here now, elsewhere on their next poll"""
+        doc = await self.db.cache_versions.find_one_and_update(
+            {"_id": VERSIONS_ID}, {"$inc": {name: 1}}, upsert=True, return_document=True
+        )
+        self._seen[name] = doc[name]
+        self._invalidate(name)
+
+    async def poll(self):
+        doc = await self.db.cache_versions.find_one({"_id": VERSIONS_ID}) or {}
+        for name in self._callbacks:
+            version = doc.get(name, 0)
+            previous = self._seen.get(name)
+            self._seen[name] = version
+            if previous is not None and previous != version:
+                logger.debug(f"Cache '{name}' changed in another worker (v{version})")
+                self._invalidate(name)
+
+    def _invalidate(self, name: str):
+        for invalidate in self._callbacks.get(name, []):
+            invalidate()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="cache-versions")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.warning(f"Cache version poll failed: {e}")
+            await asyncio.sleep(self.interval)
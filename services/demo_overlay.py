@@ -0,0 +1,720 @@
+# services/demo_overlay.py
+"""
+Session-scoped in-memory overlay for the demo
+
+Demo visitors share one read-only database. Wrapping it in an
+``OverlayDatabase`` lets each visitor (the ``demo_session`` set by
+DemoModeMiddleware) create orders, edit the menu or settle bills without a
+single write reaching MongoDB:
+
+- reads go to Mongo, skipping documents the session changed, and the
+  session's own copies are merged in (filtered, sorted and projected in
+  memory);
+- the first write to a stored document copies it into the session, later
+  writes change only that copy; deletes leave a tombstone;
+- aggregations run on the server with the session's documents supplied
+  through ``$unionWith``/``$documents`` (MongoDB 6.0+);
+- sessions idle for ``ttl`` seconds are dropped, each one is capped at
+  ``max_bytes`` of BSON and at most ``max_sessions`` are kept.
+
+Outside a demo session (startup, scheduled jobs) the real collections are
+used unchanged. Only the query and update operators the app uses are
+understood in memory (including the positional ``$`` of an update); anything
+else is refused with a 501 rather than applied wrongly.
+
+Sessions live in the memory of one process: a sandboxed deployment must run
+a single worker (config.WORKERS is forced to 1), otherwise a visitor's
+requests land in workers that don't have their session.
+"""
+import copy
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import bson
+from bson import ObjectId
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import WriteError
+from pymongo.results import DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+from middleware.demo_middleware import demo_session
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+TOMBSTONE_BYTES = 32
+
+
+def _unsupported(what: str) -> HTTPException:
+    """Refuse an operation the overlay can't evaluate (instead of applying it wrongly)"""
+    logger.warning(f"Demo sandbox: {what} is not supported")
+    return HTTPException(status_code=501, detail=f"{what} is not supported in the demo sandbox")
+
+
+# ==================== IN-MEMORY QUERY/UPDATE ====================
+def _values(doc: Any, path: str) -> List[Any]:
+    """Values at a dotted path, descending into arrays like Mongo does"""
+    current = [doc]
+    for part in path.split("."):
+        found = []
+        for value in current:
+            if isinstance(value, dict):
+                if part in value:
+                    found.append(value[part])
+            elif isinstance(value, list):
+                if part.isdigit() and int(part) < len(value):
+                    found.append(value[int(part)])
+                else:
+                    found.extend(v[part] for v in value if isinstance(v, dict) and part in v)
+        current = found
+    return current
+
+
+def _candidates(values: List[Any]) -> List[Any]:
+    """Each value plus the elements of array values"""
+    out = []
+    for value in values:
+        out.append(value)
+        if isinstance(value, list):
+            out.extend(value)
+    return out
+
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    try:
+        if op == "$gt":
+            return value is not None and value > operand
+        if op == "$gte":
+            return value is not None and value >= operand
+        if op == "$lt":
+            return value is not None and value < operand
+        if op == "$lte":
+            return value is not None and value <= operand
+    except TypeError:
+        return False  # Mongo never matches across types
+    raise _unsupported(f"Query operator {op}")
+
+
+def _match_condition(values: List[Any], condition: Any) -> bool:
+    if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+        return all(_match_operator(values, op, operand, condition) for op, operand in condition.items())
+    return _equals(values, condition)
+
+
+def _equals(values: List[Any], operand: Any) -> bool:
+    if operand is None and not values:
+        return True
+    return any(v == operand for v in _candidates(values))
+
+
+def _match_operator(values: List[Any], op: str, operand: Any, condition: Dict[str, Any]) -> bool:
+    if op == "$eq":
+        return _equals(values, operand)
+    if op == "$ne":
+        return not _equals(values, operand)
+    if op == "$in":
+        return any(_equals(values, o) for o in operand)
+    if op == "$nin":
+        return not any(_equals(values, o) for o in operand)
+    if op == "$exists":
+        return bool(values) == bool(operand)
+    if op == "$regex":
+        pattern = re.compile(operand, re.IGNORECASE if "i" in condition.get("$options", "") else 0)
+        return any(isinstance(v, str) and pattern.search(v) for v in _candidates(values))
+    if op == "$options":
+        return True
+    if op == "$not":
+        return not _match_condition(values, operand)
+    if op == "$size":
+        return any(isinstance(v, list) and len(v) == operand for v in values)
+    return any(_compare(v, op, operand) for v in _candidates(values))
+
+
+def matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a find() filter against one document"""
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            if not all(matches(doc, q) for q in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(doc, q) for q in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(doc, q) for q in condition):
+                return False
+        elif key.startswith("$"):
+            raise _unsupported(f"Query operator {key}")
+        elif not _match_condition(_values(doc, key), condition):
+            return False
+    return True
+
+
+def _parent(doc: Dict[str, Any], path: str, create: bool) -> Tuple[Optional[Any], str]:
+    parts = path.split(".")
+    current = doc
+    for part in parts[:-1]:
+        if isinstance(current, list) and part.isdigit():
+            current = current[int(part)]
+            continue
+        if part not in current:
+            if not create:
+                return None, parts[-1]
+            current[part] = {}
+        current = current[part]
+    return current, parts[-1]
+
+
+def _set(doc: Dict[str, Any], path: str, value: Any):
+    parent, key = _parent(doc, path, create=True)
+    if isinstance(parent, list):
+        parent[int(key)] = value
+    else:
+        parent[key] = value
+
+
+def _get(doc: Dict[str, Any], path: str, default: Any = None) -> Any:
+    parent, key = _parent(doc, path, create=False)
+    if isinstance(parent, dict):
+        return parent.get(key, default)
+    if isinstance(parent, list) and key.isdigit() and int(key) < len(parent):
+        return parent[int(key)]
+    return default
+
+
+def _each(value: Any) -> List[Any]:
+    if isinstance(value, dict) and "$each" in value:
+        return list(value["$each"])
+    return [value]
+
+
+def _array_conditions(query: Optional[Dict[str, Any]], array_path: str) -> List[Tuple[Optional[str], Any]]:
+    """Filter conditions on the elements of the array at ``array_path`` (as (sub-path, condition))"""
+    conditions = []
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            for part in condition:
+                conditions.extend(_array_conditions(part, array_path))
+        elif key == array_path:
+            conditions.append((None, condition))
+        elif key.startswith(array_path + "."):
+            conditions.append((key[len(array_path) + 1:], condition))
+    return conditions
+
+
+def _positional(doc: Dict[str, Any], path: str, query: Optional[Dict[str, Any]]) -> str:
+    """Resolve the positional ``$`` in an update path to the first array element the filter matched"""
+    parts = path.split(".")
+    if "$" not in parts:
+        if any(part.startswith("$[") for part in parts):
+            raise _unsupported(f"Array update operator in {path}")
+        return path
+    i = parts.index("$")
+    array_path = ".".join(parts[:i])
+    array = _get(doc, array_path)
+    conditions = _array_conditions(query, array_path)
+    if isinstance(array, list) and conditions:
+        for index, element in enumerate(array):
+            if all(
+                _match_condition([element] if sub is None else _values(element, sub), condition)
+                for sub, condition in conditions
+            ):
+                parts[i] = str(index)
+                return ".".join(parts)
+    raise WriteError("The positional operator did not find the match needed from the query.", code=2)
+
+
+def apply_update(
+    doc: Dict[str, Any], update: Dict[str, Any], inserting: bool = False, query: Optional[Dict[str, Any]] = None
+):
+    """Apply update operators (or a replacement document) in place; ``query`` resolves positional ``$``"""
+    if isinstance(update, list):
+        raise _unsupported("Pipeline update")
+    if not any(k.startswith("$") for k in update):
+        keep = doc.get("_id")
+        doc.clear()
+        doc.update(copy.deepcopy(update))
+        if keep is not None:
+            doc["_id"] = keep
+        return
+    for op, fields in update.items():
+        for path, value in fields.items():
+            path = _positional(doc, path, query)
+            value = copy.deepcopy(value)
+            if op == "$set" or (op == "$setOnInsert" and inserting):
+                _set(doc, path, value)
+            elif op == "$setOnInsert":
+                continue
+            elif op == "$unset":
+                parent, key = _parent(doc, path, create=False)
+                if isinstance(parent, dict):
+                    parent.pop(key, None)
+            elif op == "$inc":
+                _set(doc, path, _get(doc, path, 0) + value)
+            elif op == "$mul":
+                _set(doc, path, _get(doc, path, 0) * value)
+            elif op == "$min":
+                current = _get(doc, path, _MISSING)
+                if current is _MISSING or value < current:
+                    _set(doc, path, value)
+            elif op == "$max":
+                current = _get(doc, path, _MISSING)
+                if current is _MISSING or value > current:
+                    _set(doc, path, value)
+            elif op == "$push":
+                _set(doc, path, list(_get(doc, path, None) or []) + _each(value))
+            elif op == "$addToSet":
+                items = list(_get(doc, path, None) or [])
+                items.extend(v for v in _each(value) if v not in items)
+                _set(doc, path, items)
+            elif op == "$pull":
+                items = _get(doc, path, None) or []
+                if isinstance(value, dict):
+                    kept = [v for v in items if not (isinstance(v, dict) and matches(v, value))]
+                else:
+                    kept = [v for v in items if v != value]
+                _set(doc, path, kept)
+            else:
+                raise _unsupported(f"Update operator {op}")
+
+
+def _upsert_seed(query: Dict[str, Any]) -> Dict[str, Any]:
+    """Equality fields of a filter, the starting document of an upsert"""
+    doc: Dict[str, Any] = {}
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            for part in condition:
+                doc.update(_upsert_seed(part))
+        elif not key.startswith("$"):
+            if isinstance(condition, dict) and any(k.startswith("$") for k in condition):
+                if "$eq" in condition:
+                    _set(doc, key, copy.deepcopy(condition["$eq"]))
+            else:
+                _set(doc, key, copy.deepcopy(condition))
+    return doc
+
+
+def project(doc: Dict[str, Any], projection: Optional[Any]) -> Dict[str, Any]:
+    if not projection:
+        return doc
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    include = {k for k, v in projection.items() if v and k != "_id"}
+    if include:
+        out = {k: v for k, v in doc.items() if k in include}
+        if projection.get("_id", 1) and "_id" in doc:
+            out["_id"] = doc["_id"]
+        return out
+    return {k: v for k, v in doc.items() if k not in projection}
+
+
+def _sort_key(value: Any):
+    # Missing/None sort first, then numbers, strings and everything else
+    if value is None or value is _MISSING:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (3, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (4, str(value))
+
+
+def sort_documents(docs: List[Dict[str, Any]], sort: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    for field, direction in reversed(sort):
+        docs.sort(key=lambda d: _sort_key(_get(d, field, None)), reverse=direction < 0)
+    return docs
+
+
+def _sort_spec(key_or_list: Any, direction: Optional[int] = None) -> List[Tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return [tuple(item) for item in key_or_list]
+
+
+# ==================== SESSION STORE ====================
+class CollectionOverlay:
+    """One session's copies of the documents it changed in one collection"""
+
+    def __init__(self):
+        # _id -> document, or None when the session deleted it
+        self.docs: Dict[Any, Optional[Dict[str, Any]]] = {}
+        self.created: set = set()
+        self.sizes: Dict[Any, int] = {}
+
+    def live(self) -> Iterable[Dict[str, Any]]:
+        return (doc for doc in self.docs.values() if doc is not None)
+
+
+class SessionOverlay:
+    def __init__(self, session_id: str, max_bytes: int):
+        self.session_id = session_id
+        self.max_bytes = max_bytes
+        self.collections: Dict[str, CollectionOverlay] = {}
+        self.size = 0
+        self.last_used = time.monotonic()
+
+    def collection(self, name: str) -> CollectionOverlay:
+        if name not in self.collections:
+            self.collections[name] = CollectionOverlay()
+        return self.collections[name]
+
+    def store(self, name: str, key: Any, doc: Optional[Dict[str, Any]], created: bool = False):
+        overlay = self.collection(name)
+        size = len(bson.encode(doc)) if doc is not None else TOMBSTONE_BYTES
+        growth = size - overlay.sizes.get(key, 0)
+        if growth > 0 and self.size + growth > self.max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail="🎭 Demo Mode: this demo session has reached its storage limit. Start a new session to keep exploring."
+            )
+        self.size += growth
+        overlay.sizes[key] = size
+        if doc is None and key in overlay.created:
+            # Deleting something the session created: forget it entirely
+            overlay.created.discard(key)
+            overlay.docs.pop(key, None)
+            self.size -= overlay.sizes.pop(key)
+            return
+        overlay.docs[key] = doc
+        if created:
+            overlay.created.add(key)
+
+
+class OverlayStore:
+    """Demo sessions kept in memory, least recently used first"""
+
+    def __init__(self, ttl: float = 3600, max_bytes: int = 2 * 1024 * 1024, max_sessions: int = 500):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, SessionOverlay]" = OrderedDict()
+
+    def get(self, session_id: str) -> SessionOverlay:
+        self.evict()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = SessionOverlay(session_id, self.max_bytes)
+            while len(self._sessions) > self.max_sessions:
+                dropped, _ = self._sessions.popitem(last=False)
+                logger.info(f"🎭 Demo session {dropped[:6]}… dropped (session limit)")
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_used = time.monotonic()
+        return session
+
+    def peek(self, session_id: str) -> Optional[SessionOverlay]:
+        """The session's overlay if it has one, without creating it"""
+        self.evict()
+        return self._sessions.get(session_id)
+
+    def evict(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_used >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "bytes": sum(s.size for s in self._sessions.values()),
+        }
+
+
+# ==================== MOTOR WRAPPERS ====================
+class OverlayCursor:
+    """find() over Mongo plus the session's documents; mirrors the Motor cursor calls the app makes"""
+
+    def __init__(self, collection: "OverlayCollection", query, projection, overlay: CollectionOverlay):
+        self.collection = collection
+        self.query = query or {}
+        self.projection = projection
+        self.overlay = overlay
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+        self._results: Optional[List[Dict[str, Any]]] = None
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = _sort_spec(key_or_list, direction)
+        return self
+
+    def skip(self, skip: int):
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int):
+        self._limit = limit
+        return self
+
+    async def _load(self) -> List[Dict[str, Any]]:
+        if self._results is None:
+            base = self.collection.base.find(self.collection.exclude(self.query, self.overlay))
+            if self._sort:
+                base = base.sort(self._sort)
+            if self._limit:
+                base = base.limit(self._skip + self._limit)
+            docs = await base.to_list(length=None)
+            docs.extend(copy.deepcopy(d) for d in self.overlay.live() if matches(d, self.query))
+            if self._sort:
+                sort_documents(docs, self._sort)
+            docs = docs[self._skip:]
+            if self._limit:
+                docs = docs[:self._limit]
+            self._results = [project(d, self.projection) for d in docs]
+        return self._results
+
+    async def to_list(self, length: Optional[int] = None):
+        docs = await self._load()
+        return docs[:length] if length else list(docs)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in await self._load():
+            yield doc
+
+
+class OverlayCollection:
+    """A collection handle that routes demo sessions' reads and writes through their overlay"""
+
+    def __init__(self, base: AsyncIOMotorCollection, store: OverlayStore):
+        self.base = base
+        self.store = store
+        self.name = base.name
+
+    def __getattr__(self, name):
+        # create_index, with_options' plain attributes etc. go to the real collection
+        return getattr(self.base, name)
+
+    def with_options(self, **options):
+        return OverlayCollection(self.base.with_options(**options), self.store)
+
+    # -------- helpers --------
+    def _session(self, create: bool = False) -> Optional[SessionOverlay]:
+        session_id = demo_session.get()
+        if session_id is None:
+            return None
+        return self.store.get(session_id) if create else self.store.peek(session_id)
+
+    def _overlay(self) -> Optional[CollectionOverlay]:
+        session = self._session()
+        if session is None:
+            return None
+        overlay = session.collections.get(self.name)
+        return overlay if overlay and overlay.docs else None
+
+    @staticmethod
+    def exclude(query, overlay: CollectionOverlay) -> Dict[str, Any]:
+        """The filter minus documents the session has its own copy (or tombstone) of"""
+        hidden = {"_id": {"$nin": list(overlay.docs)}}
+        return {"$and": [query, hidden]} if query else hidden
+
+    async def _matching(self, session: SessionOverlay, query, limit: int = 0) -> List[Dict[str, Any]]:
+        """Documents matching ``query`` as this session sees them (overlay copies are live objects)"""
+        overlay = session.collection(self.name)
+        docs = [d for d in overlay.live() if matches(d, query)]
+        if limit and len(docs) >= limit:
+            return docs[:limit]
+        base = self.base.find(self.exclude(query, overlay) if overlay.docs else query or {})
+        if limit:
+            base = base.limit(limit - len(docs))
+        docs.extend(await base.to_list(length=None))
+        return docs
+
+    def _write(self, session: SessionOverlay, doc: Dict[str, Any], created: bool = False):
+        session.store(self.name, doc["_id"], doc, created)
+
+    # -------- reads --------
+    def find(self, filter=None, projection=None, *args, **kwargs):
+        overlay = self._overlay()
+        if overlay is None:
+            return self.base.find(filter, projection, *args, **kwargs)
+        cursor = OverlayCursor(self, filter, projection, overlay)
+        if kwargs.get("sort"):
+            cursor.sort(kwargs["sort"])
+        return cursor.skip(kwargs.get("skip", 0)).limit(kwargs.get("limit", 0))
+
+    async def find_one(self, filter=None, projection=None, *args, **kwargs):
+        overlay = self._overlay()
+        if overlay is None:
+            return await self.base.find_one(filter, projection, *args, **kwargs)
+        if filter is not None and not isinstance(filter, dict):
+            filter = {"_id": filter}
+        docs = await OverlayCursor(self, filter, projection, overlay).limit(1).to_list(1)
+        return docs[0] if docs else None
+
+    async def count_documents(self, filter, **kwargs):
+        overlay = self._overlay()
+        if overlay is None:
+            return await self.base.count_documents(filter, **kwargs)
+        count = await self.base.count_documents(self.exclude(filter, overlay))
+        return count + sum(1 for d in overlay.live() if matches(d, filter))
+
+    async def estimated_document_count(self, **kwargs):
+        count = await self.base.estimated_document_count(**kwargs)
+        overlay = self._overlay()
+        if overlay is None:
+            return count
+        deleted = sum(1 for key, doc in overlay.docs.items() if doc is None and key not in overlay.created)
+        return count + len(overlay.created) - deleted
+
+    def aggregate(self, pipeline, *args, **kwargs):
+        overlay = self._overlay()
+        if overlay is None:
+            return self.base.aggregate(pipeline, *args, **kwargs)
+        merged = [
+            {"$match": {"_id": {"$nin": list(overlay.docs)}}},
+            {"$unionWith": {"pipeline": [{"$documents": list(overlay.live())}]}},
+        ]
+        return self.base.aggregate(merged + list(pipeline), *args, **kwargs)
+
+    # -------- writes --------
+    async def insert_one(self, document, *args, **kwargs):
+        session = self._session(create=True)
+        if session is None:
+            return await self.base.insert_one(document, *args, **kwargs)
+        document.setdefault("_id", ObjectId())
+        self._write(session, copy.deepcopy(document), created=True)
+        return InsertOneResult(document["_id"], True)
+
+    async def insert_many(self, documents, *args, **kwargs):
+        session = self._session(create=True)
+        if session is None:
+            return await self.base.insert_many(documents, *args, **kwargs)
+        ids = []
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+            self._write(session, copy.deepcopy(document), created=True)
+            ids.append(document["_id"])
+        return InsertManyResult(ids, True)
+
+    async def _update(self, session, filter, update, upsert: bool, multi: bool):
+        """Copy-on-write update; returns (before, after, upserted) pairs"""
+        changed = []
+        for doc in await self._matching(session, filter, limit=0 if multi else 1):
+            before = copy.deepcopy(doc)
+            after = copy.deepcopy(doc)
+            apply_update(after, update, query=filter)
+            self._write(session, after)
+            changed.append((before, after))
+        if not changed and upsert:
+            after = _upsert_seed(filter)
+            apply_update(after, update, inserting=True)
+            after.setdefault("_id", ObjectId())
+            self._write(session, after, created=True)
+            return [(None, after)], after["_id"]
+        return changed, None
+
+    async def update_one(self, filter, update, upsert=False, *args, **kwargs):
+        session = self._session(create=True)
+        if session is None:
+            return await self.base.update_one(filter, update, upsert, *args, **kwargs)
+        changed, upserted_id = await self._update(session, filter, update, upsert, multi=False)
+        return _update_result(changed, upserted_id)
+
+    async def update_many(self, filter, update, upsert=False, *args, **kwargs):
+        session = self._session(create=True)
+        if session is None:
+            return await self.base.update_many(filter, update, upsert, *args, **kwargs)
+        changed, upserted_id = await self._update(session, filter, update, upsert, multi=True)
+        return _update_result(changed, upserted_id)
+
+    async def replace_one(self, filter, replacement, upsert=False, *args, **kwargs):
+        session = self._session(create=True)
+        if session is None:
+            return await self.base.replace_one(filter, replacement, upsert, *args, **kwargs)
+        changed, upserted_id = await self._update(session, filter, replacement, upsert, multi=False)
+        return _update_result(changed, upserted_id)
+
+    async def find_one_and_update(self, filter, update, projection=None, sort=None, upsert=False,
+                                  return_document=False, *args, **kwargs):
+        session = self._session(create=True)
+        if session is None:
+            return await self.base.find_one_and_update(
+                filter, update, projection, sort, upsert, return_document, *args, **kwargs
+            )
+        if sort:
+            filter = await self._first_id(session, filter, sort)
+        changed, _ = await self._update(session, filter, update, upsert, multi=False)
+        if not changed:
+            return None
+        before, after = changed[0]
+        result = after if return_document else before
+        return project(copy.deepcopy(result), projection) if result is not None else None
+
+    async def find_one_and_delete(self, filter, projection=None, sort=None, *args, **kwargs):
+        session = self._session(create=True)
+        if session is None:
+            return await self.base.find_one_and_delete(filter, projection, sort, *args, **kwargs)
+        if sort:
+            filter = await self._first_id(session, filter, sort)
+        docs = await self._matching(session, filter, limit=1)
+        if not docs:
+            return None
+        deleted = copy.deepcopy(docs[0])
+        session.store(self.name, deleted["_id"], None)
+        return project(deleted, projection)
+
+    async def delete_one(self, filter, *args, **kwargs):
+        return await self._delete(filter, False, *args, **kwargs)
+
+    async def delete_many(self, filter, *args, **kwargs):
+        return await self._delete(filter, True, *args, **kwargs)
+
+    async def _delete(self, filter, multi: bool, *args, **kwargs):
+        session = self._session(create=True)
+        if session is None:
+            method = self.base.delete_many if multi else self.base.delete_one
+            return await method(filter, *args, **kwargs)
+        docs = await self._matching(session, filter, limit=0 if multi else 1)
+        for doc in docs:
+            session.store(self.name, doc["_id"], None)
+        return DeleteResult({"n": len(docs)}, True)
+
+    async def _first_id(self, session, filter, sort) -> Dict[str, Any]:
+        docs = sort_documents(await self._matching(session, filter), _sort_spec(sort))
+        return {"_id": docs[0]["_id"]} if docs else {"_id": {"$in": []}}
+
+
+def _update_result(changed, upserted_id) -> UpdateResult:
+    raw = {"n": len(changed), "nModified": 0 if upserted_id else sum(1 for b, a in changed if b != a)}
+    if upserted_id is not None:
+        raw["upserted"] = upserted_id
+    return UpdateResult(raw, True)
+
+
+class OverlayDatabase:
+    """Database handle whose collections are OverlayCollections"""
+
+    def __init__(self, db, store: OverlayStore):
+        self.db = db
+        self.store = store
+
+    @property
+    def client(self):
+        return self.db.client
+
+    @property
+    def name(self):
+        return self.db.name
+
+    def get_collection(self, name: str, **options) -> OverlayCollection:
+        return OverlayCollection(self.db.get_collection(name, **options), self.store)
+
+    def __getitem__(self, name: str) -> OverlayCollection:
+        return OverlayCollection(self.db[name], self.store)
+
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if isinstance(attr, AsyncIOMotorCollection):
+            return OverlayCollection(attr, self.store)
+        return attr
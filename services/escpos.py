@@ -0,0 +1,181 @@
+# services/escpos.py
+"""
+ESC/POS receipt generation
+
+Builds native ESC/POS byte streams for 80mm thermal printers (48 columns).
+Output is accumulated in a single bytearray; lines are encoded once as
+they are appended.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import config
+from services.invoice_renderer import (
+    THERMAL_ITEM_HEADER,
+    THERMAL_ROW,
+    THERMAL_TOTAL,
+    THERMAL_WIDTH,
+    invoice_time,
+    item_name,
+)
+
+# ==================== COMMANDS ====================
+INIT = b"\x1b@"
+BOLD_ON = b"\x1bE\x01"
+BOLD_OFF = b"\x1bE\x00"
+ALIGN_LEFT = b"\x1ba\x00"
+ALIGN_CENTER = b"\x1ba\x01"
+ALIGN_RIGHT = b"\x1ba\x02"
+SIZE_NORMAL = b"\x1d!\x00"
+SIZE_DOUBLE = b"\x1d!\x11"
+CUT_PARTIAL = b"\x1dVB\x03"  # feed 3 lines, then partial cut
+DRAWER_KICK = b"\x1bp\x00\x19\xfa"  # pin 2, 50ms on / 500ms off
+
+ALIGNMENTS = {"left": ALIGN_LEFT, "center": ALIGN_CENTER, "right": ALIGN_RIGHT}
+NEWLINE = b"\n"
+ENCODING = "cp437"
+
+
+class EscPosBuilder:
+    """Fluent builder for an ESC/POS byte stream"""
+
+    def __init__(self, width: int = THERMAL_WIDTH):
+        self.width = width
+        self._buffer = bytearray(INIT)
+
+    def raw(self, data: bytes) -> "EscPosBuilder":
+        self._buffer += data
+        return self
+
+    def text(self, value: str) -> "EscPosBuilder":
+        self._buffer += value.encode(ENCODING, errors="replace")
+        return self
+
+    def line(self, value: str = "") -> "EscPosBuilder":
+        self._buffer += value.encode(ENCODING, errors="replace")
+        self._buffer += NEWLINE
+        return self
+
+    def rule(self, char: str = "-") -> "EscPosBuilder":
+        return self.line(char * self.width)
+
+    def bold(self, on: bool = True) -> "EscPosBuilder":
+        self._buffer += BOLD_ON if on else BOLD_OFF
+        return self
+
+    def align(self, alignment: str) -> "EscPosBuilder":
+        self._buffer += ALIGNMENTS[alignment]
+        return self
+
+    def double_size(self, on: bool = True) -> "EscPosBuilder":
+        self._buffer += SIZE_DOUBLE if on else SIZE_NORMAL
+        return self
+
+    def feed(self, lines: int = 1) -> "EscPosBuilder":
+        self._buffer += b"\x1bd" + bytes([max(0, min(lines, 255))])
+        return self
+
+    def qr(self, data: str, module_size: int = 6) -> "EscPosBuilder":
+        """Print a QR code (model 2, error correction M)"""
+        payload = data.encode("utf-8")
+        store_len = len(payload) + 3
+        self._buffer += b"\x1d(k\x04\x001A2\x00"  # model 2
+        self._buffer += b"\x1d(k\x03\x001C" + bytes([max(1, min(module_size, 16))])
+        self._buffer += b"\x1d(k\x03\x001E1"  # error correction M
+        self._buffer += b"\x1d(k" + bytes([store_len & 0xFF, store_len >> 8]) + b"1P0" + payload
+        self._buffer += b"\x1d(k\x03\x001Q0"  # print stored symbol
+        return self
+
+    def kick_drawer(self) -> "EscPosBuilder":
+        self._buffer += DRAWER_KICK
+        return self
+
+    def cut(self) -> "EscPosBuilder":
+        self._buffer += CUT_PARTIAL
+        return self
+
+    def build(self) -> bytes:
+        return bytes(self._buffer)
+
+
+def upi_payment_uri(amount: float, invoice_no: str, vpa: Optional[str] = None) -> Optional[str]:
+    """upi://pay deep link for the bill amount, or None without a merchant VPA"""
+    vpa = vpa or config.UPI_VPA
+    if not vpa:
+        return None
+    return (
+        f"upi://pay?pa={quote(vpa)}&pn={quote(config.RESTAURANT_NAME)}"
+        f"&am={amount:.2f}&cu=INR&tn={quote(f'Invoice {invoice_no}')}"
+    )
+
+
+def build_receipt(invoice_data: Dict[str, Any], upi_vpa: Optional[str] = None) -> bytes:
+    """Customer receipt with UPI QR (unpaid bills) and drawer kick (cash payments)"""
+    invoice_no = str(invoice_data.get("invoiceNo", "N/A"))
+    total = float(invoice_data.get("total", 0) or 0)
+    payment_method = str(invoice_data.get("paymentMethod") or invoice_data.get("payment_method") or "").lower()
+
+    receipt = EscPosBuilder()
+    receipt.align("center").bold().double_size().line(config.RESTAURANT_NAME.upper()).double_size(False).bold(False)
+    receipt.line(config.RESTAURANT_TAGLINE).line(config.RESTAURANT_ADDRESS).line(f"Ph: {config.RESTAURANT_PHONE}")
+    receipt.align("left").rule("=")
+    receipt.line(f"Invoice: {invoice_no}")
+    receipt.line(f"Date: {invoice_time(invoice_data).strftime('%d/%m/%Y %I:%M %p')}")
+    receipt.line(f"Customer: {invoice_data.get('customerName', 'Walk-in')}")
+    receipt.line(f"Table: {invoice_data.get('tableNo', 'N/A')}")
+    receipt.rule().bold().line(THERMAL_ITEM_HEADER).bold(False).rule()
+
+    for item in invoice_data.get("items", []):
+        qty = item.get("quantity", 0)
+        price = item.get("price", 0)
+        receipt.line(THERMAL_ROW.format(name=item_name(item)[:23], qty=qty, price=price, amount=qty * price))
+
+    receipt.rule()
+    receipt.line(THERMAL_TOTAL.format(label="Subtotal:", amount=invoice_data.get("subtotal", 0)))
+    receipt.line(THERMAL_TOTAL.format(label="GST (5%):", amount=invoice_data.get("gst", 0)))
+    receipt.rule("=").bold().line(THERMAL_TOTAL.format(label="TOTAL:", amount=total)).bold(False).rule("=")
+
+    receipt.align("center")
+    if payment_method not in ("cash", "online"):
+        upi_uri = upi_payment_uri(total, invoice_no, upi_vpa)
+        if upi_uri:
+            receipt.line("Scan to pay with any UPI app").qr(upi_uri).line()
+
+    receipt.line(config.INVOICE_FOOTER).line("Visit again soon!").line(f"GST No: {config.RESTAURANT_GSTIN}")
+    receipt.align("left").feed(2)
+
+    # Open the drawer before the cut, so it is open by the time the receipt is torn off
+    if payment_method == "cash" and config.CASH_DRAWER_KICK:
+        receipt.kick_drawer()
+
+    receipt.cut()
+    return receipt.build()
+
+
+def build_kot(
+    order_number: str,
+    station: str,
+    items: List[Dict[str, Any]],
+    table_number: Optional[str] = None,
+    created_at: Optional[datetime] = None,
+) -> bytes:
+    """Kitchen order ticket for one station - large item lines, no prices"""
+    created_at = created_at or datetime.now()
+
+    ticket = EscPosBuilder()
+    ticket.align("center").bold().double_size().line(station.upper()).double_size(False)
+    ticket.line(f"KOT {order_number}").bold(False)
+    ticket.align("left").rule("=")
+    ticket.line(f"Table: {table_number or 'Takeaway'}")
+    ticket.line(f"Time: {created_at.strftime('%d/%m/%Y %I:%M %p')}")
+    ticket.rule()
+
+    for item in items:
+        ticket.bold().double_size().line(f"{item.get('quantity', 0)} x {item_name(item)}"[:THERMAL_WIDTH // 2])
+        ticket.double_size(False).bold(False)
+        if item.get("special_instructions"):
+            ticket.line(f"  >> {item['special_instructions']}")
+
+    ticket.rule().feed(2).cut()
+    return ticket.build()
@@ -0,0 +1,246 @@
+# services/invoice_renderer.py
+"""
+Invoice rendering for A4 (browser print) and 48-column thermal receipts.
+
+Templates are compiled once at import time and restaurant details are read
+from config once, so a render is a handful of substitutions. Rendered output
+is cached per invoice number + version (payloads without a version are
+rendered fresh); the invoice date is filled in after the cache lookup, in
+restaurant time, so a cached copy never carries another render's time.
+
+Benchmark: python -m services.invoice_renderer
+"""
+import html
+import logging
+from datetime import datetime
+from string import Template
+from typing import Any, Dict, List, Optional
+
+import config
+from services.sales_analytics import RESTAURANT_TZ
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+THERMAL_WIDTH = 48
+
+# ==================== A4 TEMPLATE ====================
+INVOICE_CSS = (
+    "@page{size:A4;margin:15mm}*{margin:0;padding:0;box-sizing:border-box}body{font-family:Arial,sans-serif;padding:20px}"
+    ".header{text-align:center;margin-bottom:30px;border-bottom:3px solid #ea580c;padding-bottom:15px}"
+    ".header h1{color:#ea580c;font-size:36px;margin-bottom:8px}.header p{font-size:13px;color:#555;margin:3px 0}"
+    ".invoice-info{display:flex;justify-content:space-between;margin:30px 0}.invoice-info h3{font-size:14px;margin-bottom:10px}"
+    ".invoice-info p{font-size:13px;margin:5px 0;color:#555}table{width:100%;border-collapse:collapse;margin:25px 0}"
+    "th,td{border:1px solid #ddd;padding:12px;text-align:left}th{background-color:#f5f5f5;font-weight:bold}"
+    ".text-center{text-align:center}.text-right{text-align:right}.totals{margin-top:30px;text-align:right}"
+    ".totals div{padding:8px 0;font-size:14px}.totals .total-line{border-top:2px solid #ea580c;margin-top:10px;"
+    "padding-top:10px;font-size:18px;font-weight:bold;color:#ea580c}.footer{margin-top:40px;text-align:center;"
+    "font-size:12px;color:#666;border-top:1px solid #ddd;padding-top:15px}"
+)
+
+A4_TEMPLATE = Template("""<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>Invoice ${invoice_no}</title>
+<style>
+${css}
+</style>
+<script>window.onload=function(){window.print();setTimeout(function(){window.close()},500)};</script>
+</head><body>
+${header}
+<div class="invoice-info"><div><h3>Invoice #${invoice_no}</h3><p>Date: ${date}</p><p>Time: ${time}</p></div><div><h3>Bill To</h3><p>${customer_name}</p><p>Table: ${table_no}</p></div></div>
+<table><thead><tr><th>Item</th><th class="text-center">Qty</th><th class="text-right">Rate (₹)</th><th class="text-right">Amount (₹)</th></tr></thead><tbody>
+${rows}
+</tbody></table>
+<div class="totals"><div><strong>Subtotal:</strong> ₹${subtotal}</div><div><strong>GST (5%):</strong> ₹${gst}</div><div class="total-line">Total Amount: ₹${total}</div></div>
+${footer}
+</body></html>""")
+
+A4_ROW = '<tr><td>{name}</td><td class="text-center">{qty}</td><td class="text-right">₹{price:.2f}</td><td class="text-right">₹{amount:.2f}</td></tr>'
+
+# ==================== THERMAL TEMPLATE ====================
+THERMAL_ITEM_HEADER = f"{'Item':<25}{'Qty':>5}{'Price':>8}{'Amount':>10}"
+THERMAL_ROW = "{name:<25}{qty:>5}{price:>8.2f}{amount:>10.2f}"
+THERMAL_TOTAL = "{label:<38}Rs.{amount:>8.2f}"
+
+
+# Stand-ins for the invoice date in cached output (see InvoiceRenderer._cached)
+DATE_MARK = "\x00date\x00"
+TIME_MARK = "\x00time\x00"
+STAMP_MARK = "\x00stamp\x00"
+
+
+def invoice_time(invoice_data: Dict[str, Any]) -> datetime:
+    """The invoice's own timestamp (paid, else created) in restaurant time - now if the payload has none"""
+    for field in ("paidAt", "paid_at", "createdAt", "created_at"):
+        value = invoice_data.get(field)
+        if value and not isinstance(value, datetime):
+            try:
+                value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            except ValueError:
+                continue
+        if isinstance(value, datetime):
+            # Naive timestamps are already local; aware ones (UTC from the API) are converted
+            return value.astimezone(RESTAURANT_TZ) if value.tzinfo else value
+    return datetime.now(RESTAURANT_TZ)
+
+
+def item_name(item: Dict[str, Any]) -> str:
+    """Item name across the field spellings sent by the frontend"""
+    return str(item.get("menuitemname") or item.get("menu_item_name") or item.get("name") or "")
+
+
+class InvoiceRenderer:
+    """Render invoices from the payload sent by the billing screen"""
+
+    def __init__(self, cache_size: int = config.INVOICE_CACHE_SIZE):
+        self.cache = LRUCache(cache_size)
+        self._load_profile()
+
+    def _load_profile(self):
+        """Pre-render the static header/footer blocks from config"""
+        name = html.escape(config.RESTAURANT_NAME)
+        self._a4_header = (
+            f'<div class="header"><h1>{name}</h1><p>{html.escape(config.RESTAURANT_TAGLINE)}</p>'
+            f'<p>{html.escape(config.RESTAURANT_ADDRESS)}</p>'
+            f'<p>Phone: {html.escape(config.RESTAURANT_PHONE)} | Email: {html.escape(config.RESTAURANT_EMAIL)}</p></div>'
+        )
+        self._a4_footer = (
+            f'<div class="footer"><p><strong>{html.escape(config.INVOICE_FOOTER)}</strong></p>'
+            f'<p>GST No: {html.escape(config.RESTAURANT_GSTIN)} | FSSAI Lic: {html.escape(config.RESTAURANT_FSSAI)}</p>'
+            f'<p>This is a computer generated invoice.</p></div>'
+        )
+
+        rule = "=" * THERMAL_WIDTH
+        self._thermal_header = [
+            rule,
+            config.RESTAURANT_NAME.upper().center(THERMAL_WIDTH).rstrip(),
+            config.RESTAURANT_TAGLINE.center(THERMAL_WIDTH).rstrip(),
+            rule,
+        ]
+        self._thermal_footer = [
+            config.INVOICE_FOOTER.center(THERMAL_WIDTH).rstrip(),
+            "Visit again soon!".center(THERMAL_WIDTH).rstrip(),
+            f"GST No: {config.RESTAURANT_GSTIN}".center(THERMAL_WIDTH).rstrip(),
+            "",
+            "",
+            "",
+        ]
+
+    # ==================== CACHE ====================
+    @staticmethod
+    def cache_key(layout: str, invoice_data: Dict[str, Any]) -> Optional[tuple]:
+        """(layout, invoice number, version); None if the payload carries no version to key on"""
+        version = invoice_data.get("version") or invoice_data.get("updatedAt") or invoice_data.get("updated_at")
+        if not version:
+            return None
+        return layout, invoice_data.get("invoiceNo", "N/A"), str(version)
+
+    def _cached(self, layout: str, invoice_data: Dict[str, Any], render):
+        """Cached render with the date marks replaced by this invoice's time"""
+        key = self.cache_key(layout, invoice_data)
+        rendered = self.cache.get(key) if key else None
+        if rendered is None:
+            rendered = render(invoice_data)
+            if key:
+                self.cache.set(key, rendered)
+        when = invoice_time(invoice_data)
+        return (
+            rendered.replace(DATE_MARK, when.strftime("%d/%m/%Y"))
+            .replace(TIME_MARK, when.strftime("%H:%M:%S"))
+            .replace(STAMP_MARK, when.strftime("%d/%m/%Y %I:%M %p"))
+        )
+
+    # ==================== A4 ====================
+    def render_a4(self, invoice_data: Dict[str, Any]) -> str:
+        """Printable A4 HTML invoice"""
+        return self._cached("a4", invoice_data, self._render_a4)
+
+    def _render_a4(self, invoice_data: Dict[str, Any]) -> str:
+        rows = "".join(
+            A4_ROW.format(
+                name=html.escape(item_name(item)),
+                qty=item.get("quantity", 0),
+                price=item.get("price", 0),
+                amount=item.get("quantity", 0) * item.get("price", 0),
+            )
+            for item in invoice_data.get("items", [])
+        )
+        return A4_TEMPLATE.substitute(
+            css=INVOICE_CSS,
+            header=self._a4_header,
+            footer=self._a4_footer,
+            invoice_no=html.escape(str(invoice_data.get("invoiceNo", "N/A"))),
+            date=DATE_MARK,
+            time=TIME_MARK,
+            customer_name=html.escape(str(invoice_data.get("customerName", "Walk-in Customer"))),
+            table_no=html.escape(str(invoice_data.get("tableNo", "N/A"))),
+            rows=rows,
+            subtotal=f"{invoice_data.get('subtotal', 0):.2f}",
+            gst=f"{invoice_data.get('gst', 0):.2f}",
+            total=f"{invoice_data.get('total', 0):.2f}",
+        )
+
+    # ==================== THERMAL ====================
+    def thermal_lines(self, invoice_data: Dict[str, Any], stamp: Optional[str] = None) -> List[str]:
+        """48-column receipt body as a list of lines (``stamp`` overrides the printed date)"""
+        thin = "-" * THERMAL_WIDTH
+        rule = "=" * THERMAL_WIDTH
+        lines = list(self._thermal_header)
+        lines.append(f"Invoice: {invoice_data.get('invoiceNo', 'N/A')}")
+        lines.append(f"Date: {stamp or invoice_time(invoice_data).strftime('%d/%m/%Y %I:%M %p')}")
+        lines.append(f"Customer: {invoice_data.get('customerName', 'Walk-in')}")
+        lines.append(f"Table: {invoice_data.get('tableNo', 'N/A')}")
+        lines.append(thin)
+        lines.append(THERMAL_ITEM_HEADER)
+        lines.append(thin)
+        for item in invoice_data.get("items", []):
+            qty = item.get("quantity", 0)
+            price = item.get("price", 0)
+            lines.append(THERMAL_ROW.format(name=item_name(item)[:23], qty=qty, price=price, amount=qty * price))
+        lines.append(thin)
+        lines.append(THERMAL_TOTAL.format(label="Subtotal:", amount=invoice_data.get("subtotal", 0)))
+        lines.append(THERMAL_TOTAL.format(label="GST (5%):", amount=invoice_data.get("gst", 0)))
+        lines.append(rule)
+        lines.append(THERMAL_TOTAL.format(label="TOTAL:", amount=invoice_data.get("total", 0)))
+        lines.append(rule)
+        lines.append("")
+        lines.extend(self._thermal_footer)
+        return lines
+
+    def render_thermal(self, invoice_data: Dict[str, Any]) -> str:
+        """Plain-text 48-column receipt"""
+        return self._cached("thermal", invoice_data, lambda data: "\n".join(self.thermal_lines(data, STAMP_MARK)) + "\n")
+
+
+# Global instance
+invoice_renderer = InvoiceRenderer()
+
+
+def benchmark(iterations: int = 2000) -> Dict[str, float]:
+    """Average render time in microseconds, cold (cache cleared) and warm"""
+    import timeit
+
+    sample = {
+        "invoiceNo": "INV-0001",
+        "version": 1,
+        "customerName": "Walk-in Customer",
+        "tableNo": "5",
+        "items": [{"menuitemname": f"Dish {i}", "quantity": 2, "price": 150.0} for i in range(12)],
+        "subtotal": 3600.0,
+        "gst": 180.0,
+        "total": 3780.0,
+    }
+    renderer = InvoiceRenderer(cache_size=16)
+    results = {}
+    for layout, render in (("a4", renderer.render_a4), ("thermal", renderer.render_thermal)):
+        def cold():
+            renderer.cache.clear()
+            render(sample)
+
+        results[f"{layout}_cold_us"] = timeit.timeit(cold, number=iterations) / iterations * 1e6
+        results[f"{layout}_warm_us"] = timeit.timeit(lambda: render(sample), number=iterations) / iterations * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in benchmark().items():
+        print(f"{name:<18}{value:>10.1f} µs")
@@ -0,0 +1,122 @@
+# services/kot_router.py
+"""
+KOT station routing
+
+Splits a KOT into per-station tickets by menu category (bar, tandoor,
+kitchen...) and dispatches every ticket concurrently - each station's
+printer has its own spooler worker, so stations print in parallel.
+Stations without a printer are kitchen screens and only get the ticket
+recorded on the KOT.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from services.escpos import build_kot
+from utils.database import workload_collection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATION = "Kitchen"
+
+
+class KotRouter:
+    """Route KOT items to kitchen stations"""
+
+    def __init__(self, db, spooler=None):
+        self.db = db
+        self.kots = workload_collection(db, "kots", "kot")
+        self.spooler = spooler
+        self._stations: Optional[List[Dict[str, Any]]] = None
+
+    def invalidate(self):
+        """Drop cached station rules (call after station changes)"""
+        self._stations = None
+
+    async def stations(self) -> List[Dict[str, Any]]:
+        if self._stations is None:
+            self._stations = await self.db.kitchen_stations.find({}, {"_id": 0}).to_list(length=100)
+        return self._stations
+
+    async def split(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Group items into one ticket per station, keeping menu order"""
+        stations = await self.stations()
+        by_category = {}
+        default_station = {"name": DEFAULT_STATION, "printer": ""}
+        for station in stations:
+            for category in station.get("categories", []):
+                by_category[category.strip().lower()] = station
+            if station.get("is_default"):
+                default_station = station
+
+        # One round trip for every item's category
+        item_ids = list({item["menu_item_id"] for item in items})
+        categories = {}
+        async for menu_item in self.db.menu_items.find({"id": {"$in": item_ids}}, {"id": 1, "category": 1}):
+            categories[menu_item["id"]] = str(menu_item.get("category", "")).strip().lower()
+
+        tickets: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            station = by_category.get(categories.get(item["menu_item_id"], ""), default_station)
+            ticket = tickets.get(station["name"])
+            if ticket is None:
+                ticket = tickets[station["name"]] = {
+                    "station": station["name"],
+                    "printer": station.get("printer", ""),
+                    "items": [],
+                    "status": "pending",
+                    "job_id": None,
+                    "error": None,
+                }
+            ticket["items"].append(item)
+        return list(tickets.values())
+
+    async def dispatch(self, kot: Dict[str, Any], tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send every station ticket at once and return the per-station status"""
+        results = await asyncio.gather(
+            *(self._send(kot, ticket) for ticket in tickets),
+            return_exceptions=True,
+        )
+        for ticket, result in zip(tickets, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error dispatching KOT {kot['order_number']} to {ticket['station']}: {result}")
+                ticket["status"] = "failed"
+                ticket["error"] = str(result)
+
+        await self.kots.update_one({"id": kot["id"]}, {"$set": {"station_tickets": tickets}})
+        return tickets
+
+    async def _send(self, kot: Dict[str, Any], ticket: Dict[str, Any]):
+        if not ticket["printer"] or self.spooler is None:
+            ticket["status"] = "displayed"
+            return
+
+        data = build_kot(kot["order_number"], ticket["station"], ticket["items"], kot.get("table_number"))
+        job = await self.spooler.submit(
+            ticket["printer"],
+            data,
+            invoice_no=f"{kot['id']}:{ticket['station']}",
+            job_type="kot",
+        )
+        ticket["job_id"] = job["id"]
+        ticket["status"] = job["status"]
+
+    async def refresh_status(self, kot: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Pull the latest print job state into a KOT's station tickets"""
+        tickets = kot.get("station_tickets", [])
+        pending = {t["job_id"]: t for t in tickets if t.get("job_id") and t.get("status") in ("queued", "printing")}
+        if not pending:
+            return tickets
+
+        changed = False
+        async for job in self.db.print_jobs.find({"id": {"$in": list(pending)}}, {"id": 1, "status": 1, "last_error": 1}):
+            ticket = pending[job["id"]]
+            status = "printed" if job["status"] == "done" else job["status"]
+            if status != ticket["status"]:
+                ticket["status"] = status
+                ticket["error"] = job.get("last_error")
+                changed = True
+
+        if changed:
+            await self.kots.update_one({"id": kot["id"]}, {"$set": {"station_tickets": tickets}})
+        return tickets
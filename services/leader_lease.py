@@ -0,0 +1,111 @@
+# services/leader_lease.py
+"""
+Leader election between workers
+
+When uvicorn/gunicorn runs several worker processes against one database,
+background duties (the scheduler, resuming print jobs) must run in exactly
+one of them. Each worker competes for a lease document in ``leases``:
+
+    {"_id": "scheduler", "owner": "<host>:<pid>:<id>", "expires_at": <date>}
+
+The holder renews the lease every ``renew_every`` seconds; if it dies the
+lease expires after ``ttl`` seconds and another worker takes over. Taking the
+lease is a single conditional upsert, so two workers can never both win.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[], Optional[Awaitable[None]]]
+
+
+class LeaderLease:
+    """Hold a named lease in Mongo while this process is alive"""
+
+    def __init__(
+        self,
+        db,
+        name: str,
+        ttl: float = 30,
+        renew_every: float = 10,
+        on_acquired: Optional[Callback] = None,
+        on_lost: Optional[Callback] = None,
+    ):
+        self.db = db
+        self.name = name
+        self.ttl = ttl
+        self.renew_every = renew_every
+        self.on_acquired = on_acquired
+        self.on_lost = on_lost
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def try_acquire(self) -> bool:
+        """Take or renew the lease; False while another live worker holds it"""
+        now = datetime.now(timezone.utc)
+        try:
+            lease = await self.db.leases.find_one_and_update(
+                {"_id": self.name, "$or": [{"owner": self.owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.ttl), "renewed_at": now}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            return False  # the document exists and belongs to a live leader
+        return lease is not None and lease.get("owner") == self.owner
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"lease-{self.name}")
+
+    async def stop(self):
+        """Stop renewing and hand the lease over immediately"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            try:
+                await self.db.leases.delete_one({"_id": self.name, "owner": self.owner})
+            except Exception as e:
+                logger.warning(f"Could not release lease '{self.name}': {e}")
+            await self._set_leader(False)
+
+    async def _run(self):
+        while True:
+            try:
+                held = await self.try_acquire()
+            except Exception as e:
+                # Can't reach the database: assume the lease is lost rather than risk two leaders
+                logger.warning(f"Lease '{self.name}' renewal failed: {e}")
+                held = False
+            await self._set_leader(held)
+            await asyncio.sleep(self.renew_every)
+
+    async def _set_leader(self, held: bool):
+        if held == self.is_leader:
+            return
+        self.is_leader = held
+        logger.info(f"👑 {'Acquired' if held else 'Lost'} lease '{self.name}' ({self.owner})")
+        callback = self.on_acquired if held else self.on_lost
+        if callback is None:
+            return
+        try:
+            result = callback()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.error(f"Lease '{self.name}' callback failed: {e}")
@@ -0,0 +1,237 @@
+# services/mongod_supervisor.py
+"""
+Embedded mongod supervisor
+
+Launches the bundled mongod (or the one on PATH on Linux/macOS), reads its
+log output from stdout and reports ready the moment mongod logs "Waiting
+for connections" - no connect/sleep polling. The output is appended to
+mongodb.log. If mongod exits unexpectedly it is restarted with backoff;
+the restart count (and with it the backoff) starts over once mongod has
+stayed up for STABLE_AFTER_SECONDS, so max_restarts limits crash loops
+rather than crashes over the lifetime of the app.
+stop() asks it to shut down cleanly before falling back to terminate/kill.
+
+    supervisor = MongodSupervisor.for_app_dir(base_dir)
+    supervisor.start()      # True once mongod accepts connections
+    supervisor.stop()
+"""
+import logging
+import platform
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+READY_MARKER = "waiting for connections"
+RESTART_BACKOFF = (1, 2, 5, 10, 30)
+STABLE_AFTER_SECONDS = 300
+
+
+def port_open(host: str, port: int, timeout: float = 0.5) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        return sock.connect_ex((host, port)) == 0
+
+
+def find_mongod(base_dir: Path, override: str = "") -> Optional[Path]:
+    """Explicit path, then the bundled binary, then mongod on PATH"""
+    candidates = [Path(override)] if override else []
+    executable = "mongod.exe" if platform.system() == "Windows" else "mongod"
+    candidates.append(base_dir / "mongodb" / "bin" / executable)
+    on_path = shutil.which("mongod")
+    if on_path:
+        candidates.append(Path(on_path))
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+class MongodSupervisor:
+    """Own the lifecycle of one local mongod process"""
+
+    def __init__(
+        self,
+        binary: Optional[Path],
+        dbpath: Path,
+        logpath: Path,
+        port: int = 27017,
+        bind_ip: str = "127.0.0.1",
+        cache_size_gb: float = 0.25,
+        journal: bool = True,
+        max_restarts: int = 5,
+        extra_args: Optional[List[str]] = None,
+    ):
+        self.binary = binary
+        self.dbpath = Path(dbpath)
+        self.logpath = Path(logpath)
+        self.port = port
+        self.bind_ip = bind_ip
+        self.cache_size_gb = cache_size_gb
+        self.journal = journal
+        self.max_restarts = max_restarts
+        self.extra_args = extra_args or []
+
+        self.process: Optional[subprocess.Popen] = None
+        self.external = False
+        self.restarts = 0
+        self._ready = threading.Event()
+        self._ready_since = 0.0
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._tail = deque(maxlen=20)
+
+    @classmethod
+    def for_app_dir(cls, base_dir: Path) -> "MongodSupervisor":
+        """Supervisor for the bundled mongodb/ directory, tuned from config"""
+        import config
+
+        return cls(
+            binary=find_mongod(base_dir, config.MONGOD_PATH),
+            dbpath=base_dir / "mongodb" / "data",
+            logpath=base_dir / "mongodb" / "mongodb.log",
+            port=config.MONGOD_PORT,
+            cache_size_gb=config.MONGOD_CACHE_GB,
+            journal=config.MONGOD_JOURNAL,
+            max_restarts=config.MONGOD_MAX_RESTARTS,
+        )
+
+    def command(self) -> List[str]:
+        cmd = [
+            str(self.binary),
+            "--dbpath", str(self.dbpath),
+            "--port", str(self.port),
+            "--bind_ip", self.bind_ip,
+            "--wiredTigerCacheSizeGB", str(self.cache_size_gb),
+        ]
+        if not self.journal:
+            cmd.append("--nojournal")  # mongod < 6.1 only
+        return cmd + self.extra_args
+
+    @property
+    def running(self) -> bool:
+        return self.external or (self.process is not None and self.process.poll() is None)
+
+    def start(self, timeout: float = 30) -> bool:
+        """Start mongod and block until it accepts connections (or fails/times out)"""
+        with self._lock:
+            if self.running:
+                return True
+            if port_open(self.bind_ip, self.port):
+                logger.info(f"✅ MongoDB already running on port {self.port}")
+                self.external = True
+                return True
+            if self.binary is None:
+                logger.error("❌ mongod not found (bundled mongodb/bin or PATH)")
+                return False
+
+            self.dbpath.mkdir(parents=True, exist_ok=True)
+            self.logpath.parent.mkdir(parents=True, exist_ok=True)
+            self._stopping.clear()
+            self._spawn()
+
+        started = time.monotonic()
+        if not self._wait_ready(timeout):
+            logger.error(f"❌ MongoDB did not become ready within {timeout:.0f}s. Last output:\n" + "\n".join(self._tail))
+            self.stop()
+            return False
+        logger.info(f"✅ MongoDB ready in {time.monotonic() - started:.2f}s (pid {self.process.pid})")
+        return True
+
+    def _spawn(self):
+        self._ready.clear()
+        creationflags = subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+        self.process = subprocess.Popen(
+            self.command(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            creationflags=creationflags,
+        )
+        threading.Thread(
+            target=self._read_output, args=(self.process,), name="mongod-output", daemon=True
+        ).start()
+
+    def _wait_ready(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while not self._ready.wait(0.1):
+            if self.process is None or self.process.poll() is not None or time.monotonic() > deadline:
+                return False
+        return True
+
+    def _read_output(self, process: subprocess.Popen):
+        """Copy mongod output to the log file, watch for readiness, restart on crash"""
+        with open(self.logpath, "ab") as log:
+            for raw in iter(process.stdout.readline, b""):
+                log.write(raw)
+                line = raw.decode("utf-8", errors="replace").rstrip()
+                self._tail.append(line)
+                if not self._ready.is_set() and READY_MARKER in line.lower():
+                    log.flush()
+                    self._ready_since = time.monotonic()
+                    self._ready.set()
+        exit_code = process.wait()
+
+        was_ready = self._ready.is_set()
+        self._ready.clear()
+        if self._stopping.is_set() or process is not self.process:
+            return
+        logger.error(f"❌ MongoDB exited unexpectedly (code {exit_code}). Last output:\n" + "\n".join(self._tail))
+        if was_ready:
+            if time.monotonic() - self._ready_since >= STABLE_AFTER_SECONDS:
+                self.restarts = 0  # a crash after a long healthy run is not a crash loop
+            self._restart()
+
+    def _restart(self):
+        if self.restarts >= self.max_restarts:
+            logger.error(f"❌ MongoDB crashed {self.restarts} times - giving up")
+            return
+        delay = RESTART_BACKOFF[min(self.restarts, len(RESTART_BACKOFF) - 1)]
+        self.restarts += 1
+        logger.warning(f"🔁 Restarting MongoDB in {delay}s (restart {self.restarts}/{self.max_restarts})")
+        if self._stopping.wait(delay):
+            return
+        with self._lock:
+            if self._stopping.is_set():
+                return
+            self._spawn()
+        if self._wait_ready(30):
+            logger.info("✅ MongoDB restarted")
+
+    def stop(self, timeout: float = 15):
+        """Clean shutdown: shutdown command, then terminate, then kill"""
+        self._stopping.set()
+        with self._lock:
+            process, self.process = self.process, None
+            self.external = False
+        if process is None or process.poll() is not None:
+            return
+
+        try:
+            from pymongo import MongoClient
+
+            client = MongoClient(self.bind_ip, self.port, serverSelectionTimeoutMS=2000, directConnection=True)
+            try:
+                client.admin.command("shutdown")
+            except Exception:
+                pass  # the connection drops as mongod exits
+            finally:
+                client.close()
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            try:
+                process.wait(5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        except Exception as e:
+            logger.warning(f"MongoDB shutdown command failed ({e}), terminating")
+            process.terminate()
+            process.wait(5)
+        logger.info("MongoDB stopped")
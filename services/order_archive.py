@@ -0,0 +1,158 @@
+# services/order_archive.py
+"""
+Order archiving
+
+Settled orders (paid or cancelled) and KOTs older than the archive horizon
+are moved in batches from the hot ``orders``/``kots`` collections into
+``orders_archive``/``kots_archive``. The cutoff of the last completed run is
+kept in ``archive_state`` as the archive watermark.
+
+``TieredOrderStore`` reads a date range from whichever tiers cover it:
+ranges starting after the watermark touch only the hot collection, older
+ranges read the archive too (unsettled orders never leave the hot tier).
+"""
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 500
+
+# Hot collection -> (archive collection, extra filter for documents that may move)
+ARCHIVED_COLLECTIONS = {
+    "orders": ("orders_archive", {"$or": [{"payment_status": "paid"}, {"status": "cancelled"}]}),
+    "kots": ("kots_archive", {}),
+}
+
+
+class OrderArchiver:
+    """Move settled history out of the hot collections"""
+
+    def __init__(self, db, after_days: int = 90, batch_size: int = ARCHIVE_BATCH_SIZE):
+        self.db = db
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self._watermark: Optional[str] = None
+        self._watermark_loaded = False
+
+    async def ensure_indexes(self):
+        for hot, (archive, _) in ARCHIVED_COLLECTIONS.items():
+            await self.db[hot].create_index("created_at")
+            await self.db[archive].create_index("id", unique=True)
+            await self.db[archive].create_index("created_at")
+
+    async def watermark(self) -> Optional[str]:
+        """Local date (YYYY-MM-DD) before which settled orders live in the archive"""
+        if not self._watermark_loaded:
+            state = await self.db.archive_state.find_one({"_id": "orders"})
+            self._watermark = state.get("archived_before") if state else None
+            self._watermark_loaded = True
+        return self._watermark
+
+    def invalidate(self):
+        """Re-read the watermark on next use (another worker archived)"""
+        self._watermark_loaded = False
+
+    async def archive(self, today: date) -> Dict[str, Any]:
+        """Archive everything created before today - after_days"""
+        cutoff = (today - timedelta(days=self.after_days)).isoformat()
+        moved = {}
+        for hot, (archive, extra) in ARCHIVED_COLLECTIONS.items():
+            moved[hot] = await self._move(hot, archive, {"created_at": {"$lt": cutoff}, **extra})
+
+        await self.db.archive_state.update_one(
+            {"_id": "orders"},
+            {"$set": {"archived_before": cutoff, "updated_at": datetime.now(timezone.utc).isoformat()}},
+            upsert=True
+        )
+        self._watermark, self._watermark_loaded = cutoff, True
+        logger.info(f"🗄️ Archived before {cutoff}: {moved}")
+        return {"archived_before": cutoff, "moved": moved}
+
+    async def _move(self, hot: str, archive: str, query: Dict[str, Any]) -> int:
+        """Copy a batch to the archive, then delete it from the hot collection (safe to re-run)"""
+        moved = 0
+        while True:
+            batch = await self.db[hot].find(query).limit(self.batch_size).to_list(length=self.batch_size)
+            if not batch:
+                return moved
+            try:
+                await self.db[archive].insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                # Already archived by an interrupted run - anything else is a real failure
+                if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                    raise
+            await self.db[hot].delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+            moved += len(batch)
+
+
+class TieredOrderStore:
+    """Read orders/KOTs across the hot and archive collections"""
+
+    def __init__(self, db, archiver: OrderArchiver):
+        self.db = db
+        self.archiver = archiver
+
+    async def tiers(self, hot: str, start: Optional[str]) -> List[str]:
+        """Collections covering a range that starts at ``start`` (ISO date/datetime, None = all time)"""
+        watermark = await self.archiver.watermark()
+        if watermark and (start is None or start < watermark):
+            return [ARCHIVED_COLLECTIONS[hot][0], hot]
+        return [hot]
+
+    @staticmethod
+    def _keep_id(projection: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Projection that still returns _id (needed to drop duplicates across tiers)"""
+        if not projection or projection.get("_id", 1):
+            return projection
+        return {k: v for k, v in projection.items() if k != "_id"} or None
+
+    async def find(
+        self, hot: str, query: Dict[str, Any], start: Optional[str], projection: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream matching documents, archive tier first
+
+        A document caught between the archive insert and the hot delete (or left
+        in both by an interrupted run) is returned once, from the archive.
+        """
+        tiers = await self.tiers(hot, start)
+        if len(tiers) == 1:
+            async for doc in self.db[hot].find(query, projection):
+                yield doc
+            return
+
+        drop_id = projection is not None and not projection.get("_id", 1)
+        seen = set()
+        for collection in tiers:
+            async for doc in self.db[collection].find(query, self._keep_id(projection)):
+                if doc["_id"] in seen:
+                    continue
+                seen.add(doc["_id"])
+                if drop_id:
+                    del doc["_id"]
+                yield doc
+
+    async def find_all(
+        self,
+        hot: str,
+        query: Dict[str, Any],
+        start: Optional[str],
+        sort: Optional[Tuple[str, int]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Matching documents from every tier as one list (each document once), optionally sorted by one field"""
+        tiers = await self.tiers(hot, start)
+        if len(tiers) == 1:
+            cursor = self.db[hot].find(query, projection)
+            if sort:
+                cursor = cursor.sort(*sort)
+            return await cursor.to_list(length=None)
+
+        docs = [doc async for doc in self.find(hot, query, start, projection)]
+        if sort:
+            field, direction = sort
+            docs.sort(key=lambda doc: doc.get(field) or "", reverse=direction < 0)
+        return docs
@@ -0,0 +1,231 @@
+# services/parquet_export.py
+"""
+Columnar export of orders for offline analytics
+
+Orders, line items and payments are written as Parquet datasets partitioned
+by month, one file per day (``<dir>/<table>/month=YYYY-MM/day-YYYY-MM-DD.parquet``).
+Orders are read through the tiered order store in batches and each batch is
+appended to the open day writers, so memory stays flat however long the
+range is. Schemas are fixed, so every file of a table is compatible.
+
+An export replaces the files of every day in its range, so overlapping
+exports (the nightly one-day export and a manual month export) never hold
+the same order twice. Files are written under a hidden temporary name and
+swapped in only once the whole range has been written.
+
+pyarrow is optional: without it exports raise ParquetUnavailable.
+"""
+import logging
+import os
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from services.sales_analytics import parse_created_at
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+TABLES = ("orders", "items", "payments")
+
+
+class ParquetUnavailable(Exception):
+    """pyarrow is not installed"""
+
+
+def _schemas() -> Dict[str, "pa.Schema"]:
+    timestamp = pa.timestamp("us", tz="UTC")
+    return {
+        "orders": pa.schema([
+            ("id", pa.string()),
+            ("order_id", pa.string()),
+            ("created_at", timestamp),
+            ("date", pa.string()),
+            ("customer_name", pa.string()),
+            ("table_number", pa.string()),
+            ("status", pa.string()),
+            ("payment_status", pa.string()),
+            ("payment_method", pa.string()),
+            ("covers", pa.int32()),
+            ("item_count", pa.int32()),
+            ("total_amount", pa.float64()),
+            ("gst_amount", pa.float64()),
+            ("final_amount", pa.float64()),
+        ]),
+        "items": pa.schema([
+            ("order_id", pa.string()),
+            ("created_at", timestamp),
+            ("date", pa.string()),
+            ("menu_item_id", pa.string()),
+            ("menu_item_name", pa.string()),
+            ("quantity", pa.int32()),
+            ("price", pa.float64()),
+            ("amount", pa.float64()),
+        ]),
+        "payments": pa.schema([
+            ("order_id", pa.string()),
+            ("created_at", timestamp),
+            ("paid_at", timestamp),
+            ("date", pa.string()),
+            ("payment_method", pa.string()),
+            ("transaction_id", pa.string()),
+            ("amount", pa.float64()),
+        ]),
+    }
+
+
+def _str(value) -> Optional[str]:
+    value = getattr(value, "value", value)
+    return None if value is None else str(value)
+
+
+def order_rows(order: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Flatten one order document into rows for each table"""
+    created_at = parse_created_at(order.get("created_at"))
+    day = str(order.get("created_at", ""))[:10]
+    items = order.get("items", []) or []
+    final_amount = float(order.get("final_amount") or order.get("total_amount") or 0)
+
+    rows = {
+        "orders": [{
+            "id": _str(order.get("id")),
+            "order_id": _str(order.get("order_id")),
+            "created_at": created_at,
+            "date": day,
+            "customer_name": _str(order.get("customer_name")),
+            "table_number": _str(order.get("table_number")),
+            "status": _str(order.get("status")),
+            "payment_status": _str(order.get("payment_status")),
+            "payment_method": _str(order.get("payment_method")),
+            "covers": int(order.get("covers") or 1),
+            "item_count": sum(int(item.get("quantity", 0)) for item in items),
+            "total_amount": float(order.get("total_amount") or 0),
+            "gst_amount": float(order.get("gst_amount") or 0),
+            "final_amount": final_amount,
+        }],
+        "items": [{
+            "order_id": _str(order.get("order_id")),
+            "created_at": created_at,
+            "date": day,
+            "menu_item_id": _str(item.get("menu_item_id")),
+            "menu_item_name": _str(item.get("menu_item_name")),
+            "quantity": int(item.get("quantity", 0)),
+            "price": float(item.get("price", 0)),
+            "amount": int(item.get("quantity", 0)) * float(item.get("price", 0)),
+        } for item in items],
+        "payments": [],
+    }
+    if _str(order.get("payment_status")) == "paid":
+        rows["payments"].append({
+            "order_id": _str(order.get("order_id")),
+            "created_at": created_at,
+            "paid_at": parse_created_at(order.get("paid_at") or order.get("updated_at")),
+            "date": day,
+            "payment_method": _str(order.get("payment_method")),
+            "transaction_id": _str(order.get("transaction_id")),
+            "amount": final_amount,
+        })
+    return rows
+
+
+class ParquetExporter:
+    """Export a date range of orders to month-partitioned Parquet datasets"""
+
+    def __init__(self, order_store, directory):
+        self.order_store = order_store
+        self.directory = Path(directory)
+
+    async def export(self, start: date, end: date, batch_size: int = EXPORT_BATCH_SIZE) -> Dict[str, Any]:
+        if pa is None:
+            raise ParquetUnavailable("pyarrow is not installed - pip install pyarrow")
+
+        schemas = _schemas()
+        writers: Dict[tuple, "pq.ParquetWriter"] = {}
+        counts = {table: 0 for table in TABLES}
+        query = {"created_at": {"$gte": start.isoformat(), "$lt": (end + timedelta(days=1)).isoformat()}}
+
+        batch: List[Dict[str, Any]] = []
+        try:
+            async for order in self.order_store.find("orders", query, start=start.isoformat(), projection={"_id": 0}):
+                batch.append(order)
+                if len(batch) >= batch_size:
+                    await run_in_threadpool(self._write_batch, batch, schemas, writers, counts)
+                    batch = []
+            if batch:
+                await run_in_threadpool(self._write_batch, batch, schemas, writers, counts)
+        except BaseException:
+            await run_in_threadpool(self._discard, writers)
+            raise
+        files = await run_in_threadpool(self._commit, writers, start, end)
+
+        logger.info(f"📦 Exported {counts['orders']} orders ({start} to {end}) to {len(files)} Parquet files")
+        return {"start": start.isoformat(), "end": end.isoformat(), "rows": counts, "files": files}
+
+    def _day_path(self, table: str, day: str) -> Path:
+        return self.directory / table / f"month={day[:7]}" / f"day-{day}.parquet"
+
+    @staticmethod
+    def _temp_path(path: Path) -> Path:
+        # pyarrow skips dot-files when reading a dataset, so a half written
+        # export is never picked up by load_parquet
+        return path.with_name(f".{path.name}.tmp")
+
+    def _write_batch(self, orders, schemas, writers, counts):
+        """Convert a batch to columns and append it to each table's day writer"""
+        by_partition: Dict[tuple, List[Dict[str, Any]]] = {}
+        for order in orders:
+            day = str(order.get("created_at", ""))[:10]
+            for table, rows in order_rows(order).items():
+                if rows:
+                    by_partition.setdefault((table, day), []).extend(rows)
+
+        for (table, day), rows in by_partition.items():
+            writer = writers.get((table, day))
+            if writer is None:
+                path = self._temp_path(self._day_path(table, day))
+                path.parent.mkdir(parents=True, exist_ok=True)
+                writer = writers[(table, day)] = pq.ParquetWriter(path, schemas[table], compression="zstd")
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schemas[table]))
+            counts[table] += len(rows)
+
+    def _commit(self, writers, start: date, end: date) -> List[str]:
+        """Swap the new day files in and drop files of days that now have no rows"""
+        for (table, day), writer in writers.items():
+            writer.close()
+            path = self._day_path(table, day)
+            os.replace(self._temp_path(path), path)
+
+        day = start
+        while day <= end:
+            for table in TABLES:
+                if (table, day.isoformat()) not in writers:
+                    self._day_path(table, day.isoformat()).unlink(missing_ok=True)
+            day += timedelta(days=1)
+
+        return sorted(str(self._day_path(table, day)) for table, day in writers)
+
+    def _discard(self, writers):
+        for (table, day), writer in writers.items():
+            writer.close()
+            self._temp_path(self._day_path(table, day)).unlink(missing_ok=True)
+
+
+def load_parquet(directory, table: str = "orders", months: Optional[List[str]] = None):
+    """Load an exported table into a pandas DataFrame, optionally only some months ("YYYY-MM")"""
+    if pa is None:
+        raise ParquetUnavailable("pyarrow is not installed - pip install pyarrow")
+    if table not in TABLES:
+        raise ValueError(f"table must be one of {', '.join(TABLES)}")
+
+    filters = [("month", "in", months)] if months else None
+    dataset = pq.read_table(Path(directory) / table, filters=filters, partitioning="hive")
+    return dataset.to_pandas()
@@ -3,6 +3,8 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any
 import logging
 
+from utils.database import workload_collection
+
 logger = logging.getLogger(__name__)
 
 class PaymentMatcher:
@@ -84,7 +86,7 @@ class PaymentMatcher:
             if payer_vpa:
                 update_data["payer_vpa"] = payer_vpa
             
-            result = await self.db.orders.update_one(
+            result = await workload_collection(self.db, "orders", "payment").update_one(
                 {"_id": order_id},
                 {"$set": update_data}
             )
@@ -0,0 +1,419 @@
+# services/print_spooler.py
+"""
+Print spooler
+
+Print jobs are stored in the ``print_jobs`` collection and executed by one
+worker thread per printer, so slow printer drivers never block the event
+loop. Printers are addressed by a string:
+
+    ""  / "default"      Windows default printer (win32print)
+    "EPSON TM-T82"       named Windows printer (win32print)
+    "tcp://10.0.0.5:9100" raw TCP / ESC-POS network printer
+    "file:///tmp/spool"  file sink, one .prn file per job (testing on Linux)
+
+Each job records the spooler (``owner``) that runs it, and owners refresh
+``updated_at`` on their active jobs while they live. Jobs left behind by a
+dead process go stale and are taken over one at a time with a conditional
+update, so a job is never queued by two processes.
+"""
+import asyncio
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# win32print status flags
+PRINTER_STATUS_ERROR = 0x00000002
+PRINTER_STATUS_PAPER_OUT = 0x00000010
+PRINTER_STATUS_OFFLINE = 0x00000080
+
+ACTIVE_STATUSES = ("queued", "printing")
+
+
+class PrintError(Exception):
+    """Printer unavailable or job rejected"""
+
+    def __init__(self, message: str, action: Optional[str] = None):
+        super().__init__(message)
+        self.message = message
+        self.action = action
+
+
+# ==================== BACKENDS ====================
+class PrintBackend:
+    """Send raw bytes to one printer"""
+
+    def __init__(self, printer: str):
+        self.printer = printer
+
+    def send(self, data: bytes, job_name: str) -> int:
+        raise NotImplementedError
+
+    def status(self) -> Dict[str, Any]:
+        return {"ready": True, "message": "Ready"}
+
+
+class Win32PrintBackend(PrintBackend):
+    """Windows spooler via pywin32 (RAW datatype)"""
+
+    def _printer_name(self) -> str:
+        import win32print
+        if self.printer and self.printer != "default":
+            return self.printer
+        try:
+            return win32print.GetDefaultPrinter()
+        except Exception:
+            raise PrintError("No default printer set", "Set a default printer in Windows settings")
+
+    def status(self) -> Dict[str, Any]:
+        import win32print
+        name = self._printer_name()
+        try:
+            hprinter = win32print.OpenPrinter(name)
+        except Exception as e:
+            return {"ready": False, "printer": name, "message": "Cannot access printer", "details": str(e)}
+        try:
+            status = win32print.GetPrinter(hprinter, 2)["Status"]
+        finally:
+            win32print.ClosePrinter(hprinter)
+
+        if status & PRINTER_STATUS_OFFLINE:
+            return {"ready": False, "printer": name, "message": "Printer is offline",
+                    "action": "Turn ON printer and connect USB cable"}
+        if status & PRINTER_STATUS_PAPER_OUT:
+            return {"ready": False, "printer": name, "message": "Printer is out of paper",
+                    "action": "Load paper and try again"}
+        if status & PRINTER_STATUS_ERROR:
+            return {"ready": False, "printer": name, "message": "Printer has an error",
+                    "action": "Check printer display for error details"}
+        return {"ready": status == 0, "printer": name, "message": "Ready" if status == 0 else "Not Ready",
+                "status_code": status}
+
+    def send(self, data: bytes, job_name: str) -> int:
+        import win32print
+        state = self.status()
+        if not state["ready"] and state.get("message") != "Not Ready":
+            raise PrintError(state["message"], state.get("action"))
+
+        hprinter = win32print.OpenPrinter(state["printer"])
+        try:
+            win32print.StartDocPrinter(hprinter, 1, (job_name, None, "RAW"))
+            win32print.StartPagePrinter(hprinter)
+            bytes_written = win32print.WritePrinter(hprinter, data)
+            win32print.EndPagePrinter(hprinter)
+            win32print.EndDocPrinter(hprinter)
+            return bytes_written
+        finally:
+            win32print.ClosePrinter(hprinter)
+
+
+class RawTcpBackend(PrintBackend):
+    """Network printer listening on a raw socket (JetDirect / ESC-POS, port 9100)"""
+
+    def __init__(self, printer: str, timeout: float = 5.0):
+        super().__init__(printer)
+        parsed = urlparse(printer)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 9100
+        self.timeout = timeout
+
+    def status(self) -> Dict[str, Any]:
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                return {"ready": True, "printer": self.printer, "message": "Ready"}
+        except OSError as e:
+            return {"ready": False, "printer": self.printer, "message": "Printer not reachable",
+                    "details": str(e), "action": "Check the printer is ON and on the network"}
+
+    def send(self, data: bytes, job_name: str) -> int:
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+                sock.sendall(data)
+        except OSError as e:
+            raise PrintError(f"Printer not reachable: {e}", "Check the printer is ON and on the network")
+        return len(data)
+
+
+class FileSinkBackend(PrintBackend):
+    """Write each job to a .prn file - for development and testing without a printer"""
+
+    def __init__(self, printer: str):
+        super().__init__(printer)
+        self.directory = Path(urlparse(printer).path or "print_spool")
+
+    def status(self) -> Dict[str, Any]:
+        return {"ready": True, "printer": self.printer, "message": f"Writing jobs to {self.directory}"}
+
+    def send(self, data: bytes, job_name: str) -> int:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in job_name)
+        (self.directory / f"{safe_name}.prn").write_bytes(data)
+        return len(data)
+
+
+def create_backend(printer: str) -> PrintBackend:
+    """Pick a backend from the printer address"""
+    scheme = urlparse(printer).scheme if "://" in (printer or "") else ""
+    if scheme == "tcp":
+        return RawTcpBackend(printer)
+    if scheme == "file":
+        return FileSinkBackend(printer)
+    return Win32PrintBackend(printer or "default")
+
+
+def list_windows_printers() -> List[str]:
+    """Names of installed Windows printers (empty elsewhere)"""
+    try:
+        import win32print
+    except ImportError:
+        return []
+    return [printer[2] for printer in win32print.EnumPrinters(2)]
+
+
+# ==================== SPOOLER ====================
+class PrintSpooler:
+    """Persistent print queue with a worker thread per printer"""
+
+    def __init__(
+        self, db, max_attempts: int = 3, retry_delay: float = 2.0, registry=None, stale_after: float = 30.0
+    ):
+        self.db = db
+        self.registry = registry
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # An active job untouched this long belongs to a dead process
+        self.stale_after = stale_after
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._loop = None
+        self._queues: Dict[str, queue.Queue] = {}
+        self._workers: Dict[str, threading.Thread] = {}
+        self._dispatched = set()
+        self._lock = threading.Lock()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._resume_task: Optional[asyncio.Task] = None
+
+    async def start(self, resume: bool = True):
+        """Create indexes and (unless another worker owns that) resume jobs left over from the previous run"""
+        self._loop = asyncio.get_running_loop()
+        await self.db.print_jobs.create_index("id", unique=True)
+        await self.db.print_jobs.create_index("dedupe_key", unique=True, sparse=True)
+        await self.db.print_jobs.create_index([("status", 1), ("created_at", 1)])
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="print-spooler-heartbeat")
+        if resume:
+            await self.resume()
+
+    async def resume(self):
+        """
+        Start taking over jobs abandoned by dead processes (once per process)
+        Jobs of a process that just died go stale within ``stale_after``, so this keeps sweeping
+        """
+        if self._resume_task is None:
+            self._resume_task = asyncio.create_task(self._resume_stale(), name="print-spooler-resume")
+
+    async def _resume_stale(self):
+        while True:
+            try:
+                resumed = await self.claim_stale()
+                if resumed:
+                    logger.info(f"🖨️ Resumed {resumed} pending print jobs")
+            except Exception as e:
+                logger.error(f"Error resuming print jobs: {e}")
+            await asyncio.sleep(self.stale_after / 3)
+
+    async def claim_stale(self) -> int:
+        """Take over and queue every stale active job of another owner"""
+        claimed = 0
+        while True:
+            now = datetime.now(timezone.utc)
+            job = await self.db.print_jobs.find_one_and_update(
+                {
+                    "status": {"$in": list(ACTIVE_STATUSES)},
+                    "owner": {"$ne": self.owner},
+                    "updated_at": {"$lt": (now - timedelta(seconds=self.stale_after)).isoformat()},
+                },
+                {"$set": {"owner": self.owner, "updated_at": now.isoformat()}},
+                sort=[("created_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is None:
+                return claimed
+            if self._dispatch(job):
+                claimed += 1
+
+    async def _heartbeat(self):
+        """Keep this process's active jobs fresh so no other worker takes them over"""
+        while True:
+            await asyncio.sleep(self.stale_after / 3)
+            try:
+                await self.db.print_jobs.update_many(
+                    {"owner": self.owner, "status": {"$in": list(ACTIVE_STATUSES)}},
+                    {"$set": {"updated_at": datetime.now(timezone.utc).isoformat()}},
+                )
+            except Exception as e:
+                logger.warning(f"Print job heartbeat failed: {e}")
+
+    async def stop(self, timeout: float = 5.0):
+        """
+        Let workers finish the current job and exit
+        The joins run off the event loop, which the workers still need to save the job status
+        """
+        for task in (self._resume_task, self._heartbeat_task):
+            if task is not None:
+                task.cancel()
+        self._resume_task = self._heartbeat_task = None
+        with self._lock:
+            for q in self._queues.values():
+                q.put(None)
+            workers = list(self._workers.values())
+            self._queues.clear()
+            self._workers.clear()
+        for worker in workers:
+            await run_in_threadpool(worker.join, timeout)
+
+    async def submit(
+        self,
+        printer: str,
+        data: bytes,
+        invoice_no: Optional[str] = None,
+        job_type: str = "receipt",
+    ) -> Dict[str, Any]:
+        """Queue a job; a job already active for the same invoice is returned instead"""
+        now = datetime.now(timezone.utc).isoformat()
+        job = {
+            "id": str(uuid.uuid4()),
+            "printer": printer or "",
+            "job_type": job_type,
+            "invoice_no": invoice_no,
+            "owner": self.owner,
+            "data": data,
+            "status": "queued",
+            "attempts": 0,
+            "last_error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if invoice_no:
+            job["dedupe_key"] = f"{job_type}:{printer or ''}:{invoice_no}"
+
+        while True:
+            try:
+                await self.db.print_jobs.insert_one(job)
+                break
+            except DuplicateKeyError:
+                existing = await self.db.print_jobs.find_one({"dedupe_key": job["dedupe_key"]})
+                if existing:
+                    logger.info(f"🖨️ Duplicate print request for {invoice_no}, job {existing['id']} already {existing['status']}")
+                    return self._public(existing, duplicate=True)
+                # The other job finished between the insert and the lookup - try again
+
+        self._dispatch(job)
+        return self._public(job)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await self.db.print_jobs.find_one({"id": job_id})
+        return self._public(job) if job else None
+
+    async def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        query = {"status": status} if status else {}
+        jobs = await self.db.print_jobs.find(query, {"data": 0}).sort("created_at", -1).to_list(length=limit)
+        return [self._public(job) for job in jobs]
+
+    @staticmethod
+    def _public(job: Dict[str, Any], duplicate: bool = False) -> Dict[str, Any]:
+        public = {k: v for k, v in job.items() if k not in ("_id", "data", "dedupe_key")}
+        if duplicate:
+            public["duplicate"] = True
+        return public
+
+    # ==================== WORKERS ====================
+    def _dispatch(self, job: Dict[str, Any]) -> bool:
+        """Queue a job on its printer's worker; False if this process already has it"""
+        printer = job.get("printer", "")
+        with self._lock:
+            if job["id"] in self._dispatched:
+                return False
+            self._dispatched.add(job["id"])
+            q = self._queues.get(printer)
+            if q is None:
+                q = self._queues[printer] = queue.Queue()
+                worker = threading.Thread(
+                    target=self._worker, args=(printer, q), name=f"print-worker-{printer or 'default'}", daemon=True
+                )
+                self._workers[printer] = worker
+                worker.start()
+        q.put(job)
+        return True
+
+    def _worker(self, printer: str, q: queue.Queue):
+        backend = create_backend(printer)
+        while True:
+            job = q.get()
+            if job is None:
+                break
+            try:
+                self._run_job(backend, job)
+            finally:
+                with self._lock:
+                    self._dispatched.discard(job["id"])
+
+    def _run_job(self, backend: PrintBackend, job: Dict[str, Any]):
+        attempts = job.get("attempts", 0)
+        job_name = f"{job['job_type'].title()}-{job.get('invoice_no') or job['id'][:8]}"
+        while attempts < self.max_attempts:
+            attempts += 1
+            if self._update(job["id"], {"status": "printing", "attempts": attempts}) is False:
+                logger.warning(f"🖨️ Print job {job['id']} was taken over by another worker, skipping it")
+                return
+            try:
+                bytes_sent = backend.send(bytes(job["data"]), job_name)
+            except Exception as e:
+                message = e.message if isinstance(e, PrintError) else str(e)
+                if self.registry:
+                    self.registry.record_result(job["printer"], False, message)
+                logger.warning(f"🖨️ Print job {job['id']} attempt {attempts}/{self.max_attempts} failed: {message}")
+                if attempts >= self.max_attempts:
+                    self._update(
+                        job["id"],
+                        {"status": "failed", "last_error": message, "action": getattr(e, "action", None)},
+                        unset_dedupe=True,
+                    )
+                    return
+                self._update(job["id"], {"last_error": message})
+                time.sleep(self.retry_delay * attempts)
+                continue
+
+            if self.registry:
+                self.registry.record_result(job["printer"], True)
+            logger.info(f"🖨️ Printed {job_name} on {backend.printer or 'default'} ({bytes_sent} bytes)")
+            self._update(job["id"], {"status": "done", "bytes_sent": bytes_sent, "last_error": None}, unset_dedupe=True)
+            return
+
+    def _update(self, job_id: str, fields: Dict[str, Any], unset_dedupe: bool = False) -> Optional[bool]:
+        """
+        Persist job state from a worker thread through the event loop
+        Returns False if another owner holds the job, None if the database couldn't be reached
+        """
+        update = {"$set": {**fields, "updated_at": datetime.now(timezone.utc).isoformat()}}
+        if unset_dedupe:
+            update["$unset"] = {"dedupe_key": ""}
+        future = asyncio.run_coroutine_threadsafe(
+            self.db.print_jobs.update_one({"id": job_id, "owner": self.owner}, update), self._loop
+        )
+        try:
+            return future.result(timeout=10).matched_count > 0
+        except Exception as e:
+            logger.error(f"Error updating print job {job_id}: {e}")
+            return None
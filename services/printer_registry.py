@@ -0,0 +1,88 @@
+# services/printer_registry.py
+"""
+Printer registry
+
+Caches printer enumeration, status and capabilities for a few seconds so
+status checks and every print don't hit the Windows spooler (EnumPrinters /
+GetPrinter) or open a socket each time.
+"""
+import logging
+from typing import Any, Dict, List
+
+from services.print_spooler import PrintError, RawTcpBackend, create_backend, list_windows_printers
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Driver names of common 80mm receipt printers (ESC/POS command set)
+ESCPOS_DRIVER_HINTS = ("pos", "tm-", "thermal", "receipt", "rp-", "80mm", "xp-", "tvs", "epson tm")
+
+
+class PrinterRegistry:
+    """TTL-cached view of the printers this till can reach"""
+
+    def __init__(self, ttl: float = 30.0, escpos_mode: str = "auto"):
+        # "auto" detects from the driver name, "on"/"off" force ESC/POS or plain text
+        self.escpos_mode = escpos_mode
+        self._printers = TTLCache(ttl)
+        self._status = TTLCache(ttl)
+        self._capabilities = TTLCache(ttl * 20)
+
+    def printers(self, refresh: bool = False) -> List[str]:
+        """Installed Windows printers"""
+        printers = None if refresh else self._printers.get("all")
+        if printers is None:
+            printers = list_windows_printers()
+            self._printers.set("all", printers)
+        return printers
+
+    def status(self, printer: str, refresh: bool = False) -> Dict[str, Any]:
+        """Backend status for one printer address"""
+        state = None if refresh else self._status.get(printer)
+        if state is None:
+            try:
+                state = create_backend(printer).status()
+            except PrintError as e:
+                state = {"ready": False, "message": e.message, "action": e.action}
+            self._status.set(printer, state)
+        return state
+
+    def capabilities(self, printer: str) -> Dict[str, Any]:
+        """Whether the printer understands ESC/POS, and its paper width"""
+        caps = self._capabilities.get(printer)
+        if caps is None:
+            caps = {"escpos": self._detect_escpos(printer), "columns": 48}
+            self._capabilities.set(printer, caps)
+        return caps
+
+    def record_result(self, printer: str, ok: bool, message: str = "") -> None:
+        """Update cached status from a print attempt"""
+        if ok:
+            self._status.set(printer, {"ready": True, "printer": printer, "message": "Ready"})
+        else:
+            self._status.pop(printer)
+
+    def invalidate(self) -> None:
+        self._printers.clear()
+        self._status.clear()
+        self._capabilities.clear()
+
+    def _detect_escpos(self, printer: str) -> bool:
+        if self.escpos_mode in ("on", "off"):
+            return self.escpos_mode == "on"
+
+        backend = create_backend(printer)
+        if isinstance(backend, RawTcpBackend) or printer.startswith("file://"):
+            return True
+        try:
+            import win32print
+            name = backend._printer_name()
+            hprinter = win32print.OpenPrinter(name)
+            try:
+                driver = win32print.GetPrinter(hprinter, 2).get("pDriverName", "")
+            finally:
+                win32print.ClosePrinter(hprinter)
+        except Exception as e:
+            logger.debug(f"Cannot read printer driver for {printer or 'default'}: {e}")
+            return False
+        return any(hint in f"{name} {driver}".lower() for hint in ESCPOS_DRIVER_HINTS)
@@ -0,0 +1,151 @@
+# services/rate_limiter.py
+"""
+Token-bucket rate limiting for login, signup and the soundbox webhook
+
+Each (rule, key) pair - e.g. ("login_ip", "203.0.113.7") or
+("login_admin", "owner") - has a bucket of ``burst`` tokens refilled at
+``burst / period`` per second; a request takes one token or is rejected
+with 429 and a Retry-After header. Checks are O(1) on an in-memory dict
+(least recently used keys are dropped past ``max_keys``).
+
+With the "mongo" backend the buckets live in ``rate_limits`` and every
+check is one atomic pipeline update, so several workers or instances share
+the same limits; if Mongo can't be reached the in-memory bucket decides.
+
+    await rate_limiter.check("login_ip", client_ip(request))
+"""
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from pymongo import ReturnDocument
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rule(spec: str) -> Tuple[float, float]:
+    """ "10/60" -> (burst 10, refill 10/60 tokens per second)"""
+    burst, period = spec.split("/")
+    return float(burst), float(burst) / float(period)
+
+
+def client_ip(request: Request) -> str:
+    """Client address; behind trusted proxies, the X-Forwarded-For entry the nearest proxy added"""
+    if config.TRUST_PROXY_HEADERS:
+        hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(hops) >= config.TRUSTED_PROXY_HOPS > 0:
+            return hops[-config.TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """Named token-bucket rules with in-memory (optionally Mongo-shared) state"""
+
+    def __init__(self, rules: Dict[str, str], max_keys: int = 10000):
+        self.rules = {name: parse_rule(spec) for name, spec in rules.items()}
+        self.max_keys = max_keys
+        self.db = None
+        # (rule, key) -> [tokens, monotonic time of last refill]
+        self._buckets: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+        self._allowed: Dict[str, int] = defaultdict(int)
+        self._rejected: Dict[str, int] = defaultdict(int)
+        self._backend_errors = 0
+
+    def use_database(self, db):
+        """Share buckets through Mongo (RATE_LIMIT_BACKEND=mongo)"""
+        self.db = db
+
+    async def ensure_indexes(self):
+        if self.db is not None:
+            await self.db.rate_limits.create_index("expires_at", expireAfterSeconds=0)
+
+    def allow(self, rule: str, key: str) -> Tuple[bool, float]:
+        """Take a token from the in-memory bucket; (allowed, seconds until the next token)"""
+        burst, rate = self.rules[rule]
+        now = time.monotonic()
+        bucket = self._buckets.get((rule, key))
+        if bucket is None:
+            bucket = self._buckets[(rule, key)] = [burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end((rule, key))
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True, 0.0
+        return False, (1 - bucket[0]) / rate
+
+    async def _allow_shared(self, rule: str, key: str) -> Tuple[bool, float]:
+        burst, rate = self.rules[rule]
+        now = datetime.now(timezone.utc)
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        doc = await self.db.rate_limits.find_one_and_update(
+            {"_id": f"{rule}:{key}"},
+            [
+                {"$set": {
+                    "tokens": {"$min": [burst, {"$add": [{"$ifNull": ["$tokens", burst]}, {"$multiply": [elapsed, rate]}]}]},
+                    "updated_at": now,
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    # An idle bucket is full again after burst/rate seconds
+                    "expires_at": now + timedelta(seconds=burst / rate),
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc["allowed"]:
+            return True, 0.0
+        return False, (1 - doc["tokens"]) / rate
+
+    async def check(self, rule: str, key: Optional[str]):
+        """Consume one request for ``key`` under ``rule``; 429 when its bucket is empty"""
+        key = key or "unknown"
+        allowed, retry_after = None, 0.0
+        if self.db is not None:
+            try:
+                allowed, retry_after = await self._allow_shared(rule, key)
+            except Exception as e:
+                self._backend_errors += 1
+                logger.warning(f"Shared rate limit check failed, using local bucket: {e}")
+        if allowed is None:
+            allowed, retry_after = self.allow(rule, key)
+
+        if allowed:
+            self._allowed[rule] += 1
+            return
+        self._rejected[rule] += 1
+        logger.warning(f"🚫 Rate limit '{rule}' hit for {key}")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests. Please try again shortly.",
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": "mongo" if self.db is not None else "memory",
+            "tracked_keys": len(self._buckets),
+            "backend_errors": self._backend_errors,
+            "rules": {
+                name: {
+                    "burst": burst,
+                    "per_second": round(rate, 4),
+                    "allowed": self._allowed[name],
+                    "rejected": self._rejected[name],
+                }
+                for name, (burst, rate) in self.rules.items()
+            },
+        }
+
+
+rate_limiter = RateLimiter(config.RATE_LIMITS)
@@ -0,0 +1,329 @@
+# services/sales_analytics.py
+"""
+Sales analytics backed by hourly pre-aggregated buckets
+
+Every order write applies the difference between the order's old and new
+contribution to one ``sales_buckets`` document per restaurant-local hour.
+Range queries (a day, a week, twelve months) then group a few thousand
+small bucket documents instead of re-scanning orders.
+
+Item performance is computed inside MongoDB ($unwind/$group over
+``orders.items``) and materialised in ``item_performance_cache``.
+"""
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import pytz
+
+import config
+from utils.database import workload_collection
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = {"hour": "_id", "day": "date", "week": "week", "month": "month"}
+METRICS = (
+    "orders", "covers", "revenue", "subtotal", "gst", "paid_orders",
+    "payment_cash", "payment_online", "payment_unknown",
+)
+
+COUNT_METRICS = ("orders", "covers", "paid_orders")
+
+RESTAURANT_TZ = pytz.timezone(config.RESTAURANT_TIMEZONE)
+
+# Windows kept warm in item_performance_cache by the scheduler (days back from today)
+ITEM_REPORT_WINDOWS = (1, 7, 30)
+
+
+def _value(v):
+    return getattr(v, "value", v)
+
+
+def parse_created_at(value) -> Optional[datetime]:
+    """created_at as an aware datetime (stored as ISO string or datetime)"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def bucket_fields(created_at) -> Optional[Dict[str, Any]]:
+    """Bucket id and grouping fields for the restaurant-local hour of created_at"""
+    moment = parse_created_at(created_at)
+    if moment is None:
+        return None
+    local = moment.astimezone(RESTAURANT_TZ)
+    return {
+        "_id": local.strftime("%Y-%m-%dT%H"),
+        "date": local.strftime("%Y-%m-%d"),
+        "hour": local.hour,
+        "week": local.strftime("%G-W%V"),
+        "month": local.strftime("%Y-%m"),
+    }
+
+
+def local_date(created_at) -> Optional[str]:
+    """Restaurant-local date (YYYY-MM-DD) of created_at"""
+    moment = parse_created_at(created_at)
+    return moment.astimezone(RESTAURANT_TZ).strftime("%Y-%m-%d") if moment else None
+
+
+def _typed(metrics: Dict[str, float]) -> Dict[str, Any]:
+    """Counts back to ints after float accumulation"""
+    return {m: int(v) if m in COUNT_METRICS else round(v, 2) for m, v in metrics.items()}
+
+
+def local_range_match(start: date, end: date) -> Dict[str, Any]:
+    """created_at prefilter for a local date range (ISO strings with mixed offsets, widened by a day)"""
+    return {"created_at": {
+        "$gte": (start - timedelta(days=1)).isoformat(),
+        "$lt": (end + timedelta(days=2)).isoformat(),
+    }}
+
+
+def menu_class(quantity: float, price: float, avg_quantity: float, avg_price: float) -> str:
+    """Menu-engineering quadrant, using average selling price as the profitability axis"""
+    popular = quantity >= avg_quantity * 0.7
+    profitable = price >= avg_price
+    if popular and profitable:
+        return "star"
+    if popular:
+        return "plowhorse"
+    if profitable:
+        return "puzzle"
+    return "dog"
+
+
+def order_contribution(order: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """What one order adds to its bucket (cancelled orders add nothing)"""
+    if not order or _value(order.get("status")) == "cancelled":
+        return {}
+
+    revenue = float(order.get("final_amount") or order.get("total_amount") or 0)
+    contribution = {
+        "orders": 1,
+        "covers": int(order.get("covers") or 1),
+        "revenue": revenue,
+        "subtotal": float(order.get("total_amount") or 0),
+        "gst": float(order.get("gst_amount") or 0),
+    }
+    if _value(order.get("payment_status")) == "paid":
+        method = _value(order.get("payment_method"))
+        contribution["paid_orders"] = 1
+        contribution[f"payment_{method if method in ('cash', 'online') else 'unknown'}"] = revenue
+    return contribution
+
+
+class SalesAnalytics:
+    """Maintain and query hourly sales buckets"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def ensure_indexes(self):
+        await self.db.sales_buckets.create_index("date")
+
+    async def record_order_change(self, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+        """Apply an order insert/update/delete to the buckets"""
+        try:
+            deltas: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+            fields_by_bucket = {}
+            for order, sign in ((before, -1), (after, 1)):
+                if not order:
+                    continue
+                fields = bucket_fields(order.get("created_at"))
+                if fields is None:
+                    continue
+                fields_by_bucket[fields["_id"]] = fields
+                for metric, amount in order_contribution(order).items():
+                    deltas[fields["_id"]][metric] += sign * amount
+
+            for bucket_id, delta in deltas.items():
+                inc = {metric: amount for metric, amount in _typed(delta).items() if amount}
+                if not inc:
+                    continue
+                fields = fields_by_bucket[bucket_id]
+                await self.db.sales_buckets.update_one(
+                    {"_id": bucket_id},
+                    {
+                        "$inc": inc,
+                        "$setOnInsert": {k: v for k, v in fields.items() if k != "_id"},
+                    },
+                    upsert=True
+                )
+        except Exception as e:
+            # Analytics must never fail an order write; /api/analytics/rebuild repairs drift
+            logger.error(f"Error updating sales buckets: {str(e)}")
+
+    async def sales(self, start: date, end: date, granularity: str = "day") -> List[Dict[str, Any]]:
+        """Totals per hour/day/week/month between two local dates (inclusive)"""
+        group_field = GRANULARITIES[granularity]
+        pipeline = [
+            {"$match": {"date": {"$gte": start.isoformat(), "$lte": end.isoformat()}}},
+            {"$group": {"_id": f"${group_field}", **{m: {"$sum": f"${m}"} for m in METRICS}}},
+            {"$sort": {"_id": 1}},
+        ]
+        rows = []
+        async for row in workload_collection(self.db, "sales_buckets", "report").aggregate(pipeline):
+            orders = row.get("orders", 0)
+            rows.append({
+                "period": row["_id"],
+                "orders": orders,
+                "covers": row.get("covers", 0),
+                "revenue": round(row.get("revenue", 0), 2),
+                "subtotal": round(row.get("subtotal", 0), 2),
+                "gst_collected": round(row.get("gst", 0), 2),
+                "average_ticket": round(row.get("revenue", 0) / orders, 2) if orders else 0.0,
+                "paid_orders": row.get("paid_orders", 0),
+                "payment_split": {
+                    "cash": round(row.get("payment_cash", 0), 2),
+                    "online": round(row.get("payment_online", 0), 2),
+                    "unknown": round(row.get("payment_unknown", 0), 2),
+                },
+            })
+        return rows
+
+    async def rebuild(self, start: date, end: date, collections=("orders", "orders_archive")) -> int:
+        """Recompute buckets for a date range from the order documents"""
+        totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        fields_by_bucket = {}
+        # created_at is stored as ISO strings with mixed offsets; widen by a day and filter locally
+        query = local_range_match(start, end)
+        scanned = 0
+        for collection in collections:
+            async for order in self.db[collection].find(query):
+                fields = bucket_fields(order.get("created_at"))
+                if fields is None or not (start.isoformat() <= fields["date"] <= end.isoformat()):
+                    continue
+                scanned += 1
+                fields_by_bucket[fields["_id"]] = fields
+                for metric, amount in order_contribution(order).items():
+                    totals[fields["_id"]][metric] += amount
+
+        await self.db.sales_buckets.delete_many({"date": {"$gte": start.isoformat(), "$lte": end.isoformat()}})
+        if totals:
+            await self.db.sales_buckets.insert_many([
+                {**fields_by_bucket[bucket_id], **_typed(metrics)} for bucket_id, metrics in totals.items()
+            ])
+        logger.info(f"📊 Rebuilt {len(totals)} sales buckets from {scanned} orders ({start} to {end})")
+        return len(totals)
+
+    # ==================== ITEM PERFORMANCE ====================
+    async def item_performance(self, start: date, end: date) -> Dict[str, Any]:
+        """Quantity, revenue, attach rate and hour-of-day heat map per menu item"""
+        tz = config.RESTAURANT_TIMEZONE
+        pipeline = [
+            {"$match": {**local_range_match(start, end), "status": {"$ne": "cancelled"}}},
+            # Python isoformat() carries microseconds; keep seconds + UTC offset for $dateFromString
+            {"$addFields": {"_created": {"$dateFromString": {
+                "dateString": {"$concat": [
+                    {"$substrCP": ["$created_at", 0, 19]},
+                    {"$substrCP": ["$created_at", {"$subtract": [{"$strLenCP": "$created_at"}, 6]}, 6]},
+                ]},
+                "onError": None,
+                "onNull": None,
+            }}}},
+            {"$addFields": {
+                "_day": {"$dateToString": {"date": "$_created", "format": "%Y-%m-%d", "timezone": tz}},
+                "_hour": {"$hour": {"date": "$_created", "timezone": tz}},
+            }},
+            {"$match": {"_day": {"$gte": start.isoformat(), "$lte": end.isoformat()}}},
+            {"$facet": {
+                "orders": [{"$count": "count"}],
+                "items": [
+                    {"$unwind": "$items"},
+                    # One row per (order, item) so repeated lines count as one attach
+                    {"$group": {
+                        "_id": {"order": "$id", "item": "$items.menu_item_id", "hour": "$_hour"},
+                        "name": {"$last": "$items.menu_item_name"},
+                        "quantity": {"$sum": "$items.quantity"},
+                        "revenue": {"$sum": {"$multiply": ["$items.quantity", "$items.price"]}},
+                    }},
+                    {"$group": {
+                        "_id": {"item": "$_id.item", "hour": "$_id.hour"},
+                        "name": {"$last": "$name"},
+                        "orders": {"$sum": 1},
+                        "quantity": {"$sum": "$quantity"},
+                        "revenue": {"$sum": "$revenue"},
+                    }},
+                    {"$group": {
+                        "_id": "$_id.item",
+                        "name": {"$last": "$name"},
+                        "orders": {"$sum": "$orders"},
+                        "quantity": {"$sum": "$quantity"},
+                        "revenue": {"$sum": "$revenue"},
+                        "hours": {"$push": {"hour": "$_id.hour", "quantity": "$quantity"}},
+                    }},
+                    {"$sort": {"revenue": -1}},
+                ],
+            }},
+        ]
+        result = await workload_collection(self.db, "orders", "report").aggregate(pipeline).to_list(length=1)
+        facet = result[0] if result else {"orders": [], "items": []}
+        total_orders = facet["orders"][0]["count"] if facet["orders"] else 0
+        rows = facet["items"]
+
+        avg_quantity = sum(r["quantity"] for r in rows) / len(rows) if rows else 0
+        avg_price = sum(r["revenue"] / r["quantity"] for r in rows if r["quantity"]) / len(rows) if rows else 0
+        items = []
+        for row in rows:
+            heat_map = [0] * 24
+            for cell in row["hours"]:
+                if cell["hour"] is not None:
+                    heat_map[cell["hour"]] += cell["quantity"]
+            price = row["revenue"] / row["quantity"] if row["quantity"] else 0
+            items.append({
+                "menu_item_id": row["_id"],
+                "name": row["name"],
+                "quantity": row["quantity"],
+                "revenue": round(row["revenue"], 2),
+                "orders": row["orders"],
+                "attach_rate": round(row["orders"] / total_orders, 4) if total_orders else 0.0,
+                "average_price": round(price, 2),
+                "class": menu_class(row["quantity"], price, avg_quantity, avg_price),
+                "hour_heat_map": heat_map,
+            })
+
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "total_orders": total_orders,
+            "items": items,
+        }
+
+    async def cached_item_performance(self, start: date, end: date, max_age_minutes: float) -> Dict[str, Any]:
+        """Serve from item_performance_cache; recompute when missing or stale"""
+        cache_id = f"{start.isoformat()}:{end.isoformat()}"
+        cached = await self.db.item_performance_cache.find_one({"_id": cache_id})
+        if cached:
+            age = datetime.now(timezone.utc) - parse_created_at(cached["computed_at"])
+            if age <= timedelta(minutes=max_age_minutes):
+                return {**cached["report"], "computed_at": cached["computed_at"], "cached": True}
+        return await self.refresh_item_performance(start, end)
+
+    async def refresh_item_performance(self, start: date, end: date) -> Dict[str, Any]:
+        report = await self.item_performance(start, end)
+        computed_at = datetime.now(timezone.utc).isoformat()
+        await self.db.item_performance_cache.replace_one(
+            {"_id": f"{start.isoformat()}:{end.isoformat()}"},
+            {"report": report, "computed_at": computed_at},
+            upsert=True
+        )
+        return {**report, "computed_at": computed_at, "cached": False}
+
+    async def refresh_item_reports(self):
+        """Scheduler job: recompute the standard windows (today, last 7 and 30 days)"""
+        try:
+            today = datetime.now(RESTAURANT_TZ).date()
+            for days in ITEM_REPORT_WINDOWS:
+                await self.refresh_item_performance(today - timedelta(days=days - 1), today)
+            logger.info("📊 Item performance reports refreshed")
+        except Exception as e:
+            logger.error(f"Error refreshing item performance: {str(e)}")
@@ -0,0 +1,169 @@
+# services/xlsx_export.py
+"""
+Excel export of reports
+
+Builds a workbook (Summary, Orders, Items, Payments) with xlsxwriter in
+constant_memory mode: every row is flushed to disk as soon as the next row
+is started, so a multi-month workbook needs no more memory than one batch
+of orders. Orders are read from the tiered order store in batches and the
+workbook writes run in the threadpool, off the event loop.
+"""
+import logging
+import os
+import tempfile
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from starlette.concurrency import run_in_threadpool
+
+from services.parquet_export import order_rows
+from services.sales_analytics import RESTAURANT_TZ
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+
+SUMMARY_COLUMNS = ("Date", "Orders", "Cancelled", "Revenue", "GST", "Paid Orders", "Cash", "Online", "Unpaid")
+ORDER_COLUMNS = (
+    ("Order ID", "order_id"), ("Created", "created_at"), ("Date", "date"), ("Customer", "customer_name"),
+    ("Table", "table_number"), ("Status", "status"), ("Payment", "payment_status"),
+    ("Method", "payment_method"), ("Covers", "covers"), ("Items", "item_count"),
+    ("Subtotal", "total_amount"), ("GST", "gst_amount"), ("Total", "final_amount"),
+)
+ITEM_COLUMNS = (
+    ("Order ID", "order_id"), ("Date", "date"), ("Item ID", "menu_item_id"), ("Item", "menu_item_name"),
+    ("Qty", "quantity"), ("Price", "price"), ("Amount", "amount"),
+)
+PAYMENT_COLUMNS = (
+    ("Order ID", "order_id"), ("Date", "date"), ("Paid At", "paid_at"), ("Method", "payment_method"),
+    ("Transaction ID", "transaction_id"), ("Amount", "amount"),
+)
+MONEY_FIELDS = {"total_amount", "gst_amount", "final_amount", "price", "amount"}
+DATETIME_FIELDS = {"created_at", "paid_at"}
+
+
+class _WorkbookWriter:
+    """Row-by-row sheet writer (constant_memory requires rows in order per sheet)"""
+
+    def __init__(self, path: str):
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(path, {
+            "constant_memory": True,
+            "tmpdir": tempfile.gettempdir(),
+            "remove_timezone": True,
+        })
+        self.header = self.workbook.add_format({"bold": True, "bg_color": "#F2F2F2", "border": 1})
+        self.money = self.workbook.add_format({"num_format": "#,##0.00"})
+        self.datetime = self.workbook.add_format({"num_format": "dd/mm/yyyy hh:mm"})
+        # Summary is written last but created first so it is the first tab
+        self.summary = self.workbook.add_worksheet("Summary")
+        self.sheets = {}
+        self.next_row = {}
+        for name, columns in (("orders", ORDER_COLUMNS), ("items", ITEM_COLUMNS), ("payments", PAYMENT_COLUMNS)):
+            sheet = self.workbook.add_worksheet(name.title())
+            sheet.write_row(0, 0, [title for title, _ in columns], self.header)
+            sheet.freeze_panes(1, 0)
+            sheet.set_column(0, len(columns) - 1, 14)
+            self.sheets[name] = (sheet, columns)
+            self.next_row[name] = 1
+
+    def write_orders(self, orders: List[Dict[str, Any]]):
+        for order in orders:
+            for table, rows in order_rows(order).items():
+                sheet, columns = self.sheets[table]
+                for row in rows:
+                    row_number = self.next_row[table]
+                    for col, (_, field) in enumerate(columns):
+                        value = row.get(field)
+                        if value is None:
+                            continue
+                        if field in DATETIME_FIELDS:
+                            sheet.write_datetime(row_number, col, value.astimezone(RESTAURANT_TZ), self.datetime)
+                        elif field in MONEY_FIELDS:
+                            sheet.write_number(row_number, col, value, self.money)
+                        else:
+                            sheet.write(row_number, col, value)
+                    self.next_row[table] = row_number + 1
+
+    def close(self, summary: Dict[str, Dict[str, float]]):
+        sheet = self.summary
+        sheet.write_row(0, 0, SUMMARY_COLUMNS, self.header)
+        sheet.set_column(0, len(SUMMARY_COLUMNS) - 1, 14)
+        totals = defaultdict(float)
+        row_number = 1
+        for day in sorted(summary):
+            values = summary[day]
+            for key, value in values.items():
+                totals[key] += value
+            self._summary_row(row_number, day, values)
+            row_number += 1
+        self._summary_row(row_number, "Total", totals, bold=True)
+        self.workbook.close()
+
+    def _summary_row(self, row_number: int, label: str, values: Dict[str, float], bold: bool = False):
+        sheet = self.summary
+        sheet.write(row_number, 0, label, self.header if bold else None)
+        sheet.write_number(row_number, 1, values.get("orders", 0))
+        sheet.write_number(row_number, 2, values.get("cancelled", 0))
+        for col, key in ((3, "revenue"), (4, "gst")):
+            sheet.write_number(row_number, col, values.get(key, 0), self.money)
+        sheet.write_number(row_number, 5, values.get("paid_orders", 0))
+        for col, key in ((6, "cash"), (7, "online"), (8, "unpaid")):
+            sheet.write_number(row_number, col, values.get(key, 0), self.money)
+
+
+def _add_to_summary(summary: Dict[str, Dict[str, float]], order: Dict[str, Any]):
+    day = summary[str(order.get("created_at", ""))[:10]]
+    status = getattr(order.get("status"), "value", order.get("status"))
+    if status == "cancelled":
+        day["cancelled"] += 1
+        return
+    amount = float(order.get("final_amount") or order.get("total_amount") or 0)
+    day["orders"] += 1
+    day["revenue"] += amount
+    day["gst"] += float(order.get("gst_amount") or 0)
+    if getattr(order.get("payment_status"), "value", order.get("payment_status")) == "paid":
+        day["paid_orders"] += 1
+        method = getattr(order.get("payment_method"), "value", order.get("payment_method"))
+        day["online" if method == "online" else "cash"] += amount
+    else:
+        day["unpaid"] += amount
+
+
+class XlsxReportExporter:
+    """Stream a date range of orders into an .xlsx report"""
+
+    def __init__(self, order_store):
+        self.order_store = order_store
+
+    async def export(self, start: date, end: date, batch_size: int = EXPORT_BATCH_SIZE) -> str:
+        """Write the workbook to a temporary file and return its path (caller deletes it)"""
+        fd, path = tempfile.mkstemp(prefix=f"report_{start.isoformat()}_{end.isoformat()}_", suffix=".xlsx")
+        os.close(fd)
+
+        query = {"created_at": {"$gte": start.isoformat(), "$lt": (end + timedelta(days=1)).isoformat()}}
+        summary: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        count = 0
+        try:
+            writer = await run_in_threadpool(_WorkbookWriter, path)
+            batch: List[Dict[str, Any]] = []
+            cursor = self.order_store.find("orders", query, start=start.isoformat(), projection={"_id": 0})
+            async for order in cursor:
+                _add_to_summary(summary, order)
+                batch.append(order)
+                if len(batch) >= batch_size:
+                    await run_in_threadpool(writer.write_orders, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                await run_in_threadpool(writer.write_orders, batch)
+                count += len(batch)
+            await run_in_threadpool(writer.close, summary)
+        except Exception:
+            os.unlink(path)
+            raise
+
+        logger.info(f"📊 Excel report {start} to {end}: {count} orders")
+        return path
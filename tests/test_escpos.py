@@ -0,0 +1,55 @@
+"""Byte-level checks of the ESC/POS receipt and KOT builders"""
+import config
+from services import escpos
+from services.escpos import CUT_PARTIAL, DRAWER_KICK, INIT, EscPosBuilder, build_kot, build_receipt
+
+FEED_2 = b"\x1bd\x02"
+INVOICE = {
+    "invoiceNo": "INV-1",
+    "paidAt": "2026-01-02T10:11:12Z",
+    "items": [{"name": "Tea", "quantity": 2, "price": 10.0}],
+    "subtotal": 20.0,
+    "gst": 1.0,
+    "total": 21.0,
+}
+
+
+def test_builder_bytes():
+    data = EscPosBuilder().line("Hi").qr("AB", module_size=3).kick_drawer().cut().build()
+    assert data == (
+        b"\x1b@"                                   # init
+        b"Hi\n"
+        b"\x1d(k\x04\x001A2\x00"                   # QR model 2
+        b"\x1d(k\x03\x001C\x03"                    # module size 3
+        b"\x1d(k\x03\x001E1"                       # error correction M
+        b"\x1d(k\x05\x001P0AB"                     # store "AB"
+        b"\x1d(k\x03\x001Q0"                       # print
+        b"\x1bp\x00\x19\xfa"                       # drawer kick
+        b"\x1dVB\x03"                              # partial cut
+    )
+
+
+def test_cash_receipt_kicks_drawer_before_cut(monkeypatch):
+    monkeypatch.setattr(config, "CASH_DRAWER_KICK", True)
+    data = build_receipt({**INVOICE, "paymentMethod": "cash"})
+    assert data.startswith(INIT)
+    assert data.endswith(FEED_2 + DRAWER_KICK + CUT_PARTIAL)
+    assert data.count(DRAWER_KICK) == 1
+    assert b"\x1d(k" not in data  # paid bills carry no QR
+
+
+def test_unpaid_receipt_prints_upi_qr_without_kick(monkeypatch):
+    monkeypatch.setattr(config, "CASH_DRAWER_KICK", True)
+    uri = escpos.upi_payment_uri(21.0, "INV-1", "shop@upi").encode()
+    data = build_receipt(INVOICE, upi_vpa="shop@upi")
+    store_len = len(uri) + 3
+    assert b"\x1d(k" + bytes([store_len & 0xFF, store_len >> 8]) + b"1P0" + uri in data
+    assert DRAWER_KICK not in data
+    assert data.endswith(FEED_2 + CUT_PARTIAL)
+
+
+def test_kot_ends_with_cut():
+    data = build_kot("42", "grill", [{"name": "Paneer Tikka", "quantity": 1}], table_number="5")
+    assert data.startswith(INIT)
+    assert data.endswith(FEED_2 + CUT_PARTIAL)
+    assert DRAWER_KICK not in data
@@ -0,0 +1,54 @@
+"""Overlapping Parquet exports replace day files instead of adding parts"""
+import asyncio
+from datetime import date
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from services.parquet_export import ParquetExporter, load_parquet  # noqa: E402
+
+
+class FakeOrderStore:
+    def __init__(self, orders):
+        self.orders = orders
+
+    async def find(self, collection, query, start=None, projection=None):
+        bounds = query["created_at"]
+        for order in self.orders:
+            if bounds["$gte"] <= order["created_at"] < bounds["$lt"]:
+                yield dict(order)
+
+
+def _order(i, day):
+    return {
+        "id": f"o{i}",
+        "order_id": f"o{i}",
+        "created_at": f"2026-03-{day:02d}T10:00:00+05:30",
+        "items": [{"name": "Tea", "quantity": 1, "price": 10}],
+        "final_amount": 10,
+        "status": "paid",
+    }
+
+
+def test_overlapping_exports_do_not_duplicate(tmp_path):
+    store = FakeOrderStore([_order(i, 1 + i % 5) for i in range(20)])
+    exporter = ParquetExporter(store, tmp_path)
+
+    asyncio.run(exporter.export(date(2026, 3, 2), date(2026, 3, 2)))
+    asyncio.run(exporter.export(date(2026, 3, 1), date(2026, 3, 31)))
+
+    assert len(load_parquet(tmp_path, "orders")) == 20
+    assert len(load_parquet(tmp_path, "items")) == 20
+
+
+def test_reexport_drops_days_without_orders(tmp_path):
+    store = FakeOrderStore([_order(i, 1 + i % 5) for i in range(20)])
+    exporter = ParquetExporter(store, tmp_path)
+    asyncio.run(exporter.export(date(2026, 3, 1), date(2026, 3, 31)))
+
+    store.orders = [o for o in store.orders if not o["created_at"].startswith("2026-03-03")]
+    asyncio.run(exporter.export(date(2026, 3, 3), date(2026, 3, 3)))
+
+    assert len(load_parquet(tmp_path, "orders", ["2026-03"])) == 16
+    assert not (tmp_path / "orders" / "month=2026-03" / "day-2026-03-03.parquet").exists()
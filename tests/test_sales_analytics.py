@@ -0,0 +1,26 @@
+"""Restaurant-local day boundaries (RESTAURANT_TIMEZONE defaults to Asia/Kolkata)"""
+from datetime import date
+
+from services.sales_analytics import local_date, local_range_match
+
+
+def in_prefilter(created_at, day):
+    bounds = local_range_match(day, day)["created_at"]
+    return bounds["$gte"] <= created_at < bounds["$lt"]
+
+
+def test_late_evening_order_stays_in_its_own_day():
+    created_at = "2026-10-19T20:30:00+05:30"
+    assert local_date(created_at) == "2026-10-19"
+    assert in_prefilter(created_at, date(2026, 10, 19))
+
+
+def test_previous_evening_order_is_not_counted():
+    created_at = "2026-10-18T21:00:00+05:30"
+    assert local_date(created_at) == "2026-10-18"
+
+
+def test_utc_timestamps_use_the_local_date():
+    # 19:00 UTC is 00:30 IST the next day
+    assert local_date("2026-10-18T19:00:00+00:00") == "2026-10-19"
+    assert in_prefilter("2026-10-18T19:00:00+00:00", date(2026, 10, 19))
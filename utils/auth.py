@@ -1,13 +1,124 @@
 # utils/auth.py
-from passlib.context import CryptContext
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pymongo.errors import DuplicateKeyError
+from starlette.concurrency import run_in_threadpool
+
+import config
+
+logger = logging.getLogger(__name__)
+
+SIGNING_KEY_ID = "jwt"
+VERIFIED_CACHE_SIZE = 1024
+
+# Signing key, loaded once per process by load_signing_key()
+_signing_key: Optional[str] = None
+# token -> claims of recently verified access tokens
+_verified: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """bcrypt context, created on first signup/login"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str) -> str:
     """Hash a password for storing"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    """hash_password off the event loop (bcrypt takes ~0.1-0.3s)"""
+    return await run_in_threadpool(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password off the event loop"""
+    return await run_in_threadpool(verify_password, plain_password, hashed_password)
+
+
+# ==================== TOKENS ====================
+async def load_signing_key(db) -> str:
+    """JWT_SECRET, or the generated secret shared through the ``auth_keys`` collection"""
+    global _signing_key
+    if config.JWT_SECRET:
+        _signing_key = config.JWT_SECRET
+        return _signing_key
+    doc = await db.auth_keys.find_one({"_id": SIGNING_KEY_ID})
+    if doc is None:
+        try:
+            doc = {"_id": SIGNING_KEY_ID, "secret": secrets.token_urlsafe(48), "created_at": datetime.now(timezone.utc)}
+            await db.auth_keys.insert_one(doc)
+            logger.info("Generated JWT signing key")
+        except DuplicateKeyError:
+            doc = await db.auth_keys.find_one({"_id": SIGNING_KEY_ID})  # another worker was first
+    _signing_key = doc["secret"]
+    return _signing_key
+
+def _key() -> str:
+    if _signing_key is None:
+        raise HTTPException(status_code=503, detail="Authentication is not ready")
+    return _signing_key
+
+def create_token(admin_id: str, token_type: str, expires_in: timedelta) -> str:
+    from jose import jwt
+
+    now = datetime.now(timezone.utc)
+    claims = {"sub": admin_id, "type": token_type, "iat": now, "exp": now + expires_in}
+    return jwt.encode(claims, _key(), algorithm=config.JWT_ALGORITHM)
+
+def issue_tokens(admin_id: str) -> Dict[str, Any]:
+    """Access + refresh token pair returned by login and refresh"""
+    access_ttl = timedelta(minutes=config.ACCESS_TOKEN_MINUTES)
+    return {
+        "access_token": create_token(admin_id, "access", access_ttl),
+        "refresh_token": create_token(admin_id, "refresh", timedelta(days=config.REFRESH_TOKEN_DAYS)),
+        "token_type": "bearer",
+        "expires_in": int(access_ttl.total_seconds()),
+    }
+
+def decode_token(token: str, token_type: str = "access") -> Dict[str, Any]:
+    """Verified claims of a token; 401 if it is invalid, expired or of the wrong type"""
+    claims = _verified.get(token)
+    if claims is not None:
+        if claims["exp"] > time.time():
+            return claims
+        _verified.pop(token, None)
+
+    from jose import JWTError, jwt
+
+    try:
+        claims = jwt.decode(token, _key(), algorithms=[config.JWT_ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token", headers={"WWW-Authenticate": "Bearer"})
+    if claims.get("type") != token_type or not claims.get("sub"):
+        raise HTTPException(status_code=401, detail="Invalid token type", headers={"WWW-Authenticate": "Bearer"})
+
+    if token_type == "access":
+        # Refresh tokens are rare; cache only what every request presents
+        _verified[token] = claims
+        if len(_verified) > VERIFIED_CACHE_SIZE:
+            _verified.popitem(last=False)
+    return claims
+
+
+async def require_admin(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)) -> Optional[str]:
+    """Route dependency: admin id from the bearer token (None when auth is optional and no token is sent)"""
+    if credentials is None:
+        if config.AUTH_REQUIRED:
+            raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+        return None
+    return decode_token(credentials.credentials, "access")["sub"]
@@ -1,15 +1,23 @@
 # utils/database.py
-import subprocess
 import sys
+import threading
 import time
+from collections import Counter
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference, WriteConcern
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.read_concern import ReadConcern
 import logging
 
+import config
+from services.mongod_supervisor import MongodSupervisor
+
 logger = logging.getLogger(__name__)
 
 # Global variables
-mongodb_process = None
 mongo_client = None
 db = None
 
@@ -19,58 +27,229 @@ if getattr(sys, 'frozen', False):
 else:
     APP_DIR = Path(__file__).parent.parent
 
-MONGODB_BIN = APP_DIR / "mongodb" / "bin" / "mongod.exe"
-MONGODB_DATA = APP_DIR / "mongodb" / "data"
+# mongod lives next to the executable (frozen) or the project root
+mongod_supervisor = MongodSupervisor.for_app_dir(
+    Path(sys.executable).parent if getattr(sys, 'frozen', False) else APP_DIR
+)
 
 def start_mongodb():
-    """Start MongoDB server"""
-    global mongodb_process
-    
+    """Start MongoDB server and wait until it accepts connections"""
     print("Starting MongoDB...")
-    MONGODB_DATA.mkdir(parents=True, exist_ok=True)
-    
-    mongodb_process = subprocess.Popen(
-        [str(MONGODB_BIN), "--dbpath", str(MONGODB_DATA), "--port", "27017", "--bind_ip", "127.0.0.1"],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-    )
-    
-    # Wait for MongoDB to start
-    max_retries = 15
-    for i in range(max_retries):
-        time.sleep(1)
-        try:
-            import pymongo
-            client = pymongo.MongoClient("mongodb://localhost:27017/", serverSelectionTimeoutMS=1000)
-            client.server_info()
-            client.close()
-            print(f"MongoDB started successfully after {i+1} seconds")
-            return
-        except:
-            if i < max_retries - 1:
-                print(f"Waiting for MongoDB... ({i+1}/{max_retries})")
-            else:
-                print("WARNING: MongoDB may not be fully started yet")
+    if not mongod_supervisor.start():
+        print("WARNING: MongoDB may not be fully started yet")
 
 def stop_mongodb():
     """Stop MongoDB server"""
-    global mongodb_process
-    if mongodb_process:
-        mongodb_process.terminate()
-        mongodb_process.wait()
+    mongod_supervisor.stop()
+
+# ==================== CONNECTION POOL ====================
+class PoolMetrics(ConnectionPoolListener):
+    """Pool size and check-out wait times for every client created here"""
+
+    WAIT_BUCKETS_MS = (1, 5, 20, 100, 500, 2000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.open = 0
+            self.created = 0
+            self.closed = 0
+            self.cleared = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.wait_histogram = Counter()
+            self.failures = Counter()
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait = self._wait(event)
+        bucket = next((f"<={b}ms" for b in self.WAIT_BUCKETS_MS if wait * 1000 <= b), f">{self.WAIT_BUCKETS_MS[-1]}ms")
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.wait_histogram[bucket] += 1
+
+    def connection_check_out_failed(self, event):
+        self._wait(event)
+        with self._lock:
+            self.failures[str(event.reason)] += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def connection_created(self, event):
+        with self._lock:
+            self.created += 1
+            self.open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.closed += 1
+            self.open = max(0, self.open - 1)
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.cleared += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def _wait(self, event) -> float:
+        """Check-out wait in seconds (event duration on pymongo >= 4.7)"""
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            return duration
+        return time.perf_counter() - started if started else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "open_connections": self.open,
+                "connections_created": self.created,
+                "connections_closed": self.closed,
+                "pool_cleared": self.cleared,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_histogram": dict(self.wait_histogram),
+                "checkout_failures": dict(self.failures),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+def create_motor_client(uri: Optional[str] = None, profile: Optional[str] = None, **options) -> AsyncIOMotorClient:
+    """Motor client sized by a pool profile from config (desktop/cloud) plus overrides"""
+    profile = profile or config.DB_PROFILE
+    settings = {
+        **config.DB_POOL_PROFILES[profile],
+        **config.DB_POOL_OVERRIDES,
+        "retryWrites": True,
+        "retryReads": True,
+        **options,
+    }
+    logger.info(
+        f"MongoDB pool profile '{profile}': maxPoolSize={settings['maxPoolSize']}, "
+        f"minPoolSize={settings['minPoolSize']}, waitQueueTimeoutMS={settings['waitQueueTimeoutMS']}"
+    )
+    return AsyncIOMotorClient(uri or config.MONGODB_URI, event_listeners=[pool_metrics], **settings)
+
+
+# ==================== WORKLOADS ====================
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+def _w(value: str):
+    return int(value) if value.isdigit() else value
+
+
+# KOTs favour latency (the kitchen reprints on loss), payments favour durability,
+# reports can read from a secondary when the cloud build runs on a replica set
+WORKLOAD_OPTIONS = {
+    "kot": {"write_concern": WriteConcern(w=_w(config.DB_KOT_WRITE_CONCERN))},
+    "payment": {"write_concern": WriteConcern(w=_w(config.DB_PAYMENT_WRITE_CONCERN), wtimeout=10000)},
+    "report": {
+        "read_preference": READ_PREFERENCES[config.DB_REPORT_READ_PREFERENCE],
+        "read_concern": ReadConcern("local"),
+    },
+}
+
+
+def workload_collection(database, name: str, workload: str):
+    """Collection handle with the read/write concerns of a workload"""
+    return database.get_collection(name, **WORKLOAD_OPTIONS[workload])
+
+
+async def connect_database(uri: Optional[str] = None, profile: Optional[str] = None, **options):
+    """Create the shared client (one per process) and check the server answers"""
+    global mongo_client, db
+
+    mongo_client = create_motor_client(uri, profile, **options)
+    try:
+        await mongo_client.admin.command('ping')
+    except Exception as e:
+        logger.error(f"Failed to connect to MongoDB: {e}")
+        mongo_client.close()
+        mongo_client = None
+        raise
+    db = mongo_client.taste_paradise
+    logger.info("Connected to database successfully")
+    return db
+
+
+def close_database():
+    global mongo_client, db
+    if mongo_client:
+        mongo_client.close()
+    mongo_client = None
+    db = None
+
+
+def wrap_database(wrapper):
+    """Replace the shared handle with a wrapper around it (the demo sandbox overlay)"""
+    global db
+    db = wrapper(db)
+    return db
+
 
 async def get_database():
     """Get database instance"""
-    global mongo_client, db
-    
     if db is None:
-        mongo_client = AsyncIOMotorClient(
-            "mongodb://localhost:27017",
-            serverSelectionTimeoutMS=5000
-        )
-        await mongo_client.admin.command('ping')
-        db = mongo_client.taste_paradise
-        logger.info("Connected to database successfully")
-    
+        await connect_database()
     return db
+
+
+# ==================== DOCUMENT HELPERS ====================
+def prepare_for_mongo(data: Dict[str, Any]) -> Dict[str, Any]:
+    for k, v in data.items():
+        if isinstance(v, datetime):
+            data[k] = v.isoformat()
+        elif isinstance(v, list):
+            data[k] = [prepare_for_mongo(i) if isinstance(i, dict) else i for i in v]
+    return data
+
+def parse_from_mongo(data: Dict[str, Any]) -> Dict[str, Any]:
+    if '_id' in data:
+        del data['_id']
+    for k, v in data.items():
+        if isinstance(v, str) and k.endswith(('_at', 'completion')):
+            try:
+                data[k] = datetime.fromisoformat(v.replace('Z', '+00:00'))
+            except Exception:
+                pass
+        elif isinstance(v, list):
+            data[k] = [parse_from_mongo(i) if isinstance(i, dict) else i for i in v]
+    return data
@@ -0,0 +1,87 @@
+# utils/startup_timer.py
+"""
+Startup phase timing
+
+    with startup_timer.phase("mongodb"):
+        start_mongodb()
+    startup_timer.report()
+
+Phases are measured from process start (first import of this module) with
+perf_counter. In profile mode (``--profile`` or STARTUP_PROFILE=true) the
+whole startup also runs under cProfile and the stats are written to
+``startup.prof`` (open with ``python -m pstats startup.prof``).
+"""
+import cProfile
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_OUTPUT = "startup.prof"
+
+
+class StartupTimer:
+    """Record named startup phases and the time to first ready state"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float, float]] = []
+        self.profile = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+        self._profiler: Optional[cProfile.Profile] = None
+        self._ready_at: Optional[float] = None
+        self._last = self.started
+        if self.profile:
+            self.enable_profile()
+
+    def enable_profile(self):
+        """Start cProfile for the rest of startup (stopped by report())"""
+        self.profile = True
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, start, time.perf_counter())
+
+    def checkpoint(self, name: str):
+        """Record everything since the previous phase/checkpoint as one phase (e.g. module imports)"""
+        self._record(name, self._last, time.perf_counter())
+
+    def _record(self, name: str, start: float, end: float):
+        self.phases.append((name, start - self.started, end - start))
+        self._last = end
+        logger.debug(f"⏱️ {name}: {(end - start) * 1000:.0f} ms")
+
+    def mark_ready(self):
+        """Server accepts requests"""
+        if self._ready_at is None:
+            self._ready_at = time.perf_counter() - self.started
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def report(self):
+        """Log the phase table at INFO (the per-phase lines as they happen are DEBUG)"""
+        lines = [f"{name:<28} +{offset * 1000:7.0f} ms  {duration * 1000:7.0f} ms"
+                 for name, offset, duration in self.phases]
+        if self._ready_at is not None:
+            lines.append(f"{'ready for requests':<28} +{self._ready_at * 1000:7.0f} ms")
+        logger.info("⏱️ Startup phases:\n  " + "\n  ".join(lines))
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(PROFILE_OUTPUT)
+            logger.info(f"⏱️ Startup profile written to {PROFILE_OUTPUT}")
+            self._profiler = None
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,109 @@
+# utils/static_files.py
+"""
+Static file serving for the React build.
+
+Serves precompressed ``.br`` / ``.gz`` siblings when the client accepts them
+and marks content-hashed assets (``main.8ac44bf5.js``) as immutable.
+
+Generate the compressed files after ``npm run build`` with:
+
+    python -m utils.static_files frontend/build
+"""
+import gzip
+import logging
+import mimetypes
+import os
+import re
+import sys
+from pathlib import Path
+
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Preferred order: brotli compresses JS/CSS noticeably better than gzip
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# CRA output names look like main.8ac44bf5.js / 453.1c2e9a7d.chunk.css
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.(?:chunk\.)?(?:js|css|svg|png|jpg|woff2?|ttf)$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+COMPRESSIBLE_SUFFIXES = {".js", ".css", ".html", ".json", ".svg", ".map", ".txt"}
+
+
+def _accepted_encodings(scope) -> str:
+    for name, value in scope.get("headers", []):
+        if name == b"accept-encoding":
+            return value.decode("latin-1").lower()
+    return ""
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers precompressed siblings and caches hashed assets forever"""
+
+    async def get_response(self, path: str, scope):
+        response = None
+        accepted = _accepted_encodings(scope)
+
+        if accepted:
+            full_path, stat_result = await run_in_threadpool(self.lookup_path, path)
+            if stat_result is not None:
+                for encoding, suffix in ENCODINGS:
+                    if encoding not in accepted:
+                        continue
+                    compressed_path = full_path + suffix
+                    try:
+                        compressed_stat = os.stat(compressed_path)
+                    except OSError:
+                        continue
+                    # Ignore stale siblings left over from a previous build
+                    if compressed_stat.st_mtime < stat_result.st_mtime:
+                        continue
+                    response = self.file_response(compressed_path, compressed_stat, scope)
+                    media_type, _ = mimetypes.guess_type(full_path)
+                    response.headers["content-type"] = media_type or "application/octet-stream"
+                    response.headers["content-encoding"] = encoding
+                    break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            response.headers["vary"] = "Accept-Encoding"
+            if HASHED_NAME.search(path):
+                response.headers["cache-control"] = IMMUTABLE_CACHE
+        return response
+
+
+def precompress_directory(directory, min_size: int = 1024) -> int:
+    """Write .gz (and .br when brotli is installed) next to every compressible file"""
+    written = 0
+    for file_path in Path(directory).rglob("*"):
+        if not file_path.is_file() or file_path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        data = file_path.read_bytes()
+        if len(data) < min_size:
+            continue
+
+        file_path.with_name(file_path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9))
+        written += 1
+        if BROTLI_AVAILABLE:
+            file_path.with_name(file_path.name + ".br").write_bytes(brotli.compress(data, quality=11))
+            written += 1
+
+    return written
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "frontend/build"
+    count = precompress_directory(target)
+    print(f"✅ Wrote {count} precompressed files under {target}")
+    if not BROTLI_AVAILABLE:
+        print("⚠️  'brotli' module not installed. Only .gz files were generated.")
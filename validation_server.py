@@ -1,84 +1,235 @@
-from flask import Flask, request, jsonify
-import json
-from pathlib import Path
+"""
+TasteParadise License Validation Server
 
-app = Flask(__name__)
+    python validation_server.py
+    uvicorn validation_server:app --host 0.0.0.0 --port 5000 --workers 4
 
-def load_licenses():
-    """Load licenses from database"""
+Each worker keeps every license in memory and answers /api/validate
+without touching the disk:
+
+- first activation binds the key to a machine through the repository's
+  atomic activate(), so two workers can never bind it twice;
+- repeat validations are counted in memory and written to the
+  ``activations`` table in batches;
+- changed licenses (revocations, new keys) are picked up every few seconds;
+- successful responses are signed with an expiry so the app can cache them
+  offline (license_signing.verify_response); a signed response is reused
+  until half its lifetime is gone;
+- /api/revocations hands out revocations newer than the caller's last sync
+  (see license_revocations.py).
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from license_repository import LicenseRepository
+from license_revocations import key_fingerprint
+from license_signing import sign_response
+
+HOST = os.getenv("LICENSE_SERVER_HOST", "0.0.0.0")
+PORT = int(os.getenv("LICENSE_SERVER_PORT", 5000))
+WORKERS = int(os.getenv("LICENSE_SERVER_WORKERS", 1))
+# Lifetime of a signed validation response
+RESPONSE_TTL_HOURS = float(os.getenv("LICENSE_RESPONSE_TTL_HOURS", 24))
+# Seconds between reloading changed licenses / saving validation counts
+REFRESH_SECONDS = float(os.getenv("LICENSE_REFRESH_SECONDS", 5))
+FLUSH_SECONDS = float(os.getenv("LICENSE_FLUSH_SECONDS", 10))
+
+
+class ValidationRequest(BaseModel):
+    license_key: str
+    machine_id: str
+
+
+class LicenseIndex:
+    """All licenses by key, refreshed from the repository"""
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.records = {}
+        self.versions = {}
+        self.synced_at = ""
+
+    def load(self):
+        self.records = {lic['key']: lic for lic in self.repository.list()}
+        self.versions = dict.fromkeys(self.records, 0)
+        self.synced_at = ""
+        self.refresh()
+
+    def refresh(self):
+        """Apply licenses changed since the last refresh"""
+        for lic, updated_at in self.repository.changed_since(self.synced_at):
+            self.put(lic)
+            self.synced_at = max(self.synced_at, updated_at)
+
+    def put(self, lic):
+        self.records[lic['key']] = lic
+        self.versions[lic['key']] = self.versions.get(lic['key'], 0) + 1
+
+    def get(self, key):
+        return self.records.get(key)
+
+
+class ValidationLog:
+    """Validation sightings collected in memory and saved in batches"""
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.pending = {}
+
+    def add(self, key, machine_id):
+        now = datetime.now().isoformat()
+        entry = self.pending.get((key, machine_id))
+        if entry is None:
+            self.pending[(key, machine_id)] = [now, now, 1]
+        else:
+            entry[1] = now
+            entry[2] += 1
+
+    def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, {}
+        self.repository.record_validations(
+            (key, machine_id, first, last, count) for (key, machine_id), (first, last, count) in batch.items()
+        )
+
+
+repository = None
+index = None
+validation_log = None
+# (key, machine_id) -> (license version, monotonic reuse deadline, signed body)
+signed_responses = {}
+
+
+async def _background():
+    """Refresh the index and flush validation counts until shutdown"""
+    last_flush = time.monotonic()
+    while True:
+        await asyncio.sleep(REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(index.refresh)
+            if time.monotonic() - last_flush >= FLUSH_SECONDS:
+                await run_in_threadpool(validation_log.flush)
+                last_flush = time.monotonic()
+        except Exception as e:
+            print(f"⚠️  License store sync failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global repository, index, validation_log
+    repository = LicenseRepository()
+    index = LicenseIndex(repository)
+    index.load()
+    validation_log = ValidationLog(repository)
+    print(f"Loaded {len(index.records)} licenses (pid {os.getpid()})")
+    task = asyncio.create_task(_background())
     try:
-        with open('licenses_db.json', 'r') as f:
-            return json.load(f)
-    except:
-        return []
-
-def save_licenses(licenses):
-    """Save licenses to database"""
-    with open('licenses_db.json', 'w') as f:
-        json.dump(licenses, f, indent=2)
-
-@app.route('/api/validate', methods=['POST'])
-def validate_license():
+        yield
+    finally:
+        task.cancel()
+        validation_log.flush()
+        repository.close()
+
+
+app = FastAPI(title="TasteParadise License Validation", lifespan=lifespan)
+
+
+def _signed_validation(lic, machine_id):
+    cache_key = (lic['key'], machine_id)
+    version = index.versions.get(lic['key'])
+    cached = signed_responses.get(cache_key)
+    if cached and cached[0] == version and cached[1] > time.monotonic():
+        return cached[2]
+
+    now = datetime.now(timezone.utc)
+    body = sign_response({
+        'valid': True,
+        'license_key': lic['key'],
+        'machine_id': machine_id,
+        'customer': lic['customer'],
+        'plan': lic['plan'],
+        'expiry_date': lic['expiry_date'],
+        'issued_at': now.isoformat(),
+        'expires_at': (now + timedelta(hours=RESPONSE_TTL_HOURS)).isoformat(),
+    })
+    signed_responses[cache_key] = (version, time.monotonic() + RESPONSE_TTL_HOURS * 1800, body)
+    return body
+
+
+@app.post('/api/validate')
+async def validate_license(data: ValidationRequest):
     """Validate license key and machine ID"""
-    data = request.json
-    license_key = data.get('license_key')
-    machine_id = data.get('machine_id')
-    
-    print(f"Validation request: {license_key} from {machine_id}")
-    
-    licenses = load_licenses()
-    
+    license_key = data.license_key
+    machine_id = data.machine_id
+
     # Find license
-    license_record = None
-    for lic in licenses:
-        if lic['key'] == license_key:
-            license_record = lic
-            break
-    
+    license_record = index.get(license_key)
+
     if not license_record:
-        return jsonify({
+        return JSONResponse({
             'valid': False,
             'reason': 'License key not found'
-        }), 404
-    
+        }, status_code=404)
+
     # Check if revoked
     if license_record.get('revoked'):
-        return jsonify({
+        return JSONResponse({
             'valid': False,
             'reason': 'License has been revoked'
-        }), 403
-    
+        }, status_code=403)
+
     # Check if already activated on different machine
     if license_record.get('activated'):
         if license_record.get('machine_id') != machine_id:
-            return jsonify({
+            return JSONResponse({
                 'valid': False,
                 'reason': 'License already activated on another computer'
-            }), 403
+            }, status_code=403)
     else:
-        # First activation - bind to this machine
-        for lic in licenses:
-            if lic['key'] == license_key:
-                lic['activated'] = True
-                lic['machine_id'] = machine_id
-                lic['activation_date'] = datetime.now().isoformat()
-        save_licenses(licenses)
+        # First activation - bind to this machine (atomic across workers)
+        activation = await run_in_threadpool(repository.activate, license_key, machine_id)
+        if not activation['valid']:
+            return JSONResponse({
+                'valid': False,
+                'reason': 'License already activated on another computer'
+            }, status_code=403)
+        license_record = activation['license']
+        index.put(license_record)
         print(f"License {license_key} activated for machine {machine_id}")
-    
-    # Return success
-    return jsonify({
-        'valid': True,
-        'customer': license_record['customer'],
-        'plan': license_record['plan'],
-        'expiry_date': license_record['expiry_date']
+
+    validation_log.add(license_key, machine_id)
+    return _signed_validation(license_record, machine_id)
+
+
+@app.get('/api/revocations')
+async def revocations(since: str = ""):
+    """Signed fingerprints of licenses revoked after ``since`` (the app's last sync point)"""
+    rows = await run_in_threadpool(repository.revoked_since, since)
+    return sign_response({
+        'since': since,
+        'synced_until': rows[-1][1] if rows else since,
+        'added': [key_fingerprint(key) for key, _ in rows],
     })
 
-@app.route('/health')
-def health():
+
+@app.get('/health', response_class=PlainTextResponse)
+async def health():
     return "OK"
 
+
 if __name__ == '__main__':
-    from datetime import datetime
+    import uvicorn
+
     print("Starting TasteParadise License Validation Server...")
-    print("Running on http://0.0.0.0:5000")
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    print(f"Running on http://{HOST}:{PORT} ({WORKERS} worker{'s' if WORKERS != 1 else ''})")
+    uvicorn.run("validation_server:app", host=HOST, port=PORT, workers=WORKERS, log_level="warning")